@@ -11,6 +11,7 @@ from flask_cors import CORS
 
 from data_insight.config import settings
 from data_insight.api.error_handling import register_error_handlers
+from data_insight.api.utils.responses import ORJSONProvider
 from data_insight.services import init_services
 
 # 获取日志记录器
@@ -167,6 +168,9 @@ def create_app(config=None, register_routes=True):
     """
     app = Flask(__name__)
     
+    # jsonify等JSON操作使用统一的编解码器
+    app.json = ORJSONProvider(app)
+    
     # 允许跨域请求
     CORS(app)
     
@@ -189,6 +193,9 @@ def create_app(config=None, register_routes=True):
     # 注册路由
     if register_routes:
         register_blueprints(app)
+        
+        # 启动时完成路由规则排序，避免首个请求承担该开销
+        app.url_map.update()
     
     logger.info("Flask应用创建完成")
     
@@ -27,8 +27,9 @@ from data_insight.core.action_suggester import ActionSuggester
 from data_insight.core.text_generator import TextGenerator
 from data_insight.models.insight_model import MetricInsight
 from data_insight.api.middlewares.error_handlers import register_error_handlers
-from data_insight.api.middlewares.rate_limiter import RateLimiter
-from data_insight.api.utils.response_formatter import format_success_response, format_error_response, ApiJSONEncoder
+from data_insight.api.middlewares.rate_limiter import RateLimiter, configure_rate_limiter
+from data_insight.api.utils.response_formatter import format_success_response, format_error_response
+from data_insight.api.utils.responses import ORJSONProvider
 
 
 # 加载环境变量
@@ -47,8 +48,8 @@ def create_app(config=None):
     # 创建Flask应用
     app = Flask('data_insight_api')
     
-    # 配置JSON编码器，支持更多数据类型
-    app.json_encoder = ApiJSONEncoder
+    # 配置JSON编解码器，优先使用orjson，支持更多数据类型
+    app.json = ORJSONProvider(app)
     
     # 配置应用
     app.config.update(
@@ -73,6 +74,9 @@ def create_app(config=None):
     window = int(os.environ.get('API_RATE_WINDOW', '60'))
     app.rate_limiter = RateLimiter(limit=limit, window=window)
     
+    # 配置视图函数使用的rate_limit()速率限制器
+    configure_rate_limiter(app)
+    
     # 注册错误处理函数
     register_error_handlers(app)
     
@@ -173,13 +177,13 @@ def register_blueprints(app):
     from data_insight.api.routes.metric_api import bp as metric_bp
     from data_insight.api.routes.chart_api import bp as chart_bp
     from data_insight.api.routes.analysis_api import bp as analysis_bp
-    from data_insight.api.routes.prediction_api import bp as prediction_bp
     
     # 注册蓝图
     app.register_blueprint(metric_bp)
     app.register_blueprint(chart_bp)
     app.register_blueprint(analysis_bp)
-    app.register_blueprint(prediction_bp)
+    
+    # 预测分析接口只由FastAPI路由器(prediction_api.router)提供
 
 
 # 设置默认导出
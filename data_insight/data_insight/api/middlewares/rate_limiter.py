@@ -19,6 +19,8 @@ from werkzeug.exceptions import TooManyRequests
 
 from data_insight.api.utils.response_formatter import format_error_response
 
+logger = logging.getLogger('rate_limiter')
+
 
 class RateLimiter:
     """速率限制器基类"""
@@ -163,6 +165,25 @@ class PathRateLimiter(RateLimiter):
         return f"{request.remote_addr}:{request.path}"
 
 
+class ClientRateLimiter(RateLimiter):
+    """基于客户端地址的速率限制器，用于FastAPI请求"""
+    
+    def get_key(self, request) -> str:
+        """
+        获取请求的令牌或客户端地址
+        
+        参数:
+            request: 当前FastAPI请求对象
+            
+        返回:
+            str: 请求的令牌，如果没有则返回客户端地址
+        """
+        token = request.headers.get('X-API-Token')
+        if token:
+            return token
+        return request.client.host if request.client else 'unknown'
+
+
 class RateLimiterManager:
     """速率限制器管理器"""
     
@@ -248,8 +269,8 @@ def rate_limit(limiter_name: str = 'default') -> Callable:
                     # 如果请求超出速率限制，则返回429错误
                     response = jsonify(format_error_response(
                         message="API速率限制已达到，请稍后再试",
-                        code=429,
-                        details={
+                        status_code=429,
+                        error_detail={
                             "reset_time": reset_time,
                             "limit": limiter.limit,
                             "window": limiter.window
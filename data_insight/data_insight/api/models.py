@@ -6,7 +6,7 @@ API数据模型
 """
 
 from typing import Dict, Any, List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, StrictInt, validator
 from datetime import datetime
 
 
@@ -29,6 +29,10 @@ class ChartData(BaseModel):
 
 class MetricData(BaseModel):
     """指标数据模型"""
+    # 未声明的字段原样保留，传递给下游分析器
+    model_config = ConfigDict(extra="allow")
+    
+    metric_id: Optional[str] = Field(None, description="指标唯一标识")
     name: str = Field(..., description="指标名称")
     value: Union[float, int] = Field(..., description="当前值")
     previous_value: Optional[Union[float, int]] = Field(None, description="前期值")
@@ -37,9 +41,33 @@ class MetricData(BaseModel):
     time_period: Optional[str] = Field(None, description="时间周期")
     previous_time_period: Optional[str] = Field(None, description="前期时间周期")
     historical_values: Optional[List[Union[float, int]]] = Field(None, description="历史值列表")
+    target_value: Optional[Union[float, int]] = Field(None, description="目标值")
     description: Optional[str] = Field(None, description="指标描述")
 
 
+class MetricHistoryData(BaseModel):
+    """带历史值的指标数据模型"""
+    # 未声明的字段原样保留，传递给下游预测器
+    model_config = ConfigDict(extra="allow")
+    
+    name: str = Field(..., description="指标名称")
+    historical_values: List[Union[float, int]] = Field(..., min_items=1, description="历史值列表，至少需要一个值")
+    unit: Optional[str] = Field(None, description="单位")
+
+
+class MetricAnalysisRequest(BaseModel):
+    """指标分析请求模型"""
+    metric_data: MetricData = Field(..., description="要分析的指标数据")
+    context: Optional[Dict[str, Any]] = Field({}, description="附加上下文信息")
+
+
+class MetricPredictRequest(BaseModel):
+    """指标预测请求模型"""
+    metric_data: MetricHistoryData = Field(..., description="要预测的指标数据")
+    horizon: StrictInt = Field(7, ge=1, description="预测步长，必须是大于0的整数")
+    confidence_level: float = Field(0.95, gt=0, lt=1, description="置信水平，范围0-1（不含端点）")
+
+
 class ComparisonData(BaseModel):
     """比较数据模型"""
     charts: List[ChartData] = Field(..., min_items=2, description="要比较的图表列表，至少需要两个图表")
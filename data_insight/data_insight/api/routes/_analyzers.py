@@ -0,0 +1,89 @@
+"""
+分析器实例
+========
+
+为API路由提供进程内共享的分析器、文本生成器和服务实例。
+实例在首次使用时创建，之后所有路由共用同一个实例。
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from data_insight.core.metric_analyzer import MetricAnalyzer
+from data_insight.core.metric_comparison_analyzer import MetricComparisonAnalyzer
+from data_insight.core.predictor import Predictor
+from data_insight.core.text_generator import TextGenerator
+from data_insight.services.metric_service import MetricService
+
+if TYPE_CHECKING:
+    from data_insight.core.trend_analyzer import TrendAnalyzer
+
+
+@lru_cache(maxsize=1)
+def get_metric_analyzer() -> MetricAnalyzer:
+    """
+    获取指标分析器
+
+    返回:
+        MetricAnalyzer: 共享的指标分析器实例
+    """
+    return MetricAnalyzer()
+
+
+@lru_cache(maxsize=1)
+def get_comparison_analyzer() -> MetricComparisonAnalyzer:
+    """
+    获取指标对比分析器
+
+    返回:
+        MetricComparisonAnalyzer: 共享的指标对比分析器实例
+    """
+    return MetricComparisonAnalyzer()
+
+
+@lru_cache(maxsize=1)
+def get_predictor() -> Predictor:
+    """
+    获取预测分析器
+
+    返回:
+        Predictor: 共享的预测分析器实例
+    """
+    return Predictor()
+
+
+@lru_cache(maxsize=1)
+def get_text_generator() -> TextGenerator:
+    """
+    获取文本生成器
+
+    返回:
+        TextGenerator: 共享的文本生成器实例
+    """
+    return TextGenerator()
+
+
+@lru_cache(maxsize=1)
+def get_trend_analyzer() -> "TrendAnalyzer":
+    """
+    获取趋势分析器
+
+    趋势分析器模块在首次调用时才导入。
+
+    返回:
+        TrendAnalyzer: 共享的趋势分析器实例
+    """
+    from data_insight.core.trend_analyzer import TrendAnalyzer
+    
+    return TrendAnalyzer()
+
+
+@lru_cache(maxsize=1)
+def get_metric_service() -> MetricService:
+    """
+    获取指标服务
+
+    返回:
+        MetricService: 共享的指标服务实例
+    """
+    return MetricService()
@@ -14,7 +14,6 @@ from typing import Dict, Any, List, Optional
 
 from flask import Blueprint, request, jsonify
 from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.responses import JSONResponse
 
 from data_insight.core.reason_analyzer import ReasonAnalyzer
 from data_insight.core.attribution_analyzer import AttributionAnalyzer
@@ -24,12 +23,13 @@ from data_insight.models.insight_model import AnalysisResult
 from data_insight.api.utils.response_formatter import format_success_response, format_error_response
 from data_insight.api.middlewares.rate_limiter import rate_limit
 from data_insight.api.middlewares.auth import token_required
+from data_insight.api.utils.responses import ORJSONResponse
 
 # 创建Flask蓝图
 bp = Blueprint('analysis', __name__, url_prefix='/api/analysis')
 
 # 创建路由器
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.post('/reason')
@@ -127,7 +127,7 @@ async def analyze_reason(request: Request, auth: bool = Depends(token_required))
             "analysis_id": analysis_id
         }
         
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="原因分析完成"
         ))
@@ -223,7 +223,7 @@ async def analyze_attribution(request: Request, auth: bool = Depends(token_requi
             "attribution_id": attribution_id
         }
         
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="归因分析完成"
         ))
@@ -317,7 +317,7 @@ async def analyze_root_cause(request: Request, auth: bool = Depends(token_requir
             "root_cause_id": root_cause_id
         }
         
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="根因分析完成"
         ))
@@ -408,7 +408,7 @@ async def analyze_correlation(request: Request, auth: bool = Depends(token_requi
             "correlation_id": correlation_id
         }
         
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="相关性分析完成"
         ))
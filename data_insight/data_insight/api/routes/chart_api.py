@@ -6,17 +6,15 @@
 """
 
 from flask import Blueprint, request, jsonify
-import json
 from datetime import datetime
 import logging
 from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.responses import JSONResponse
 
 from data_insight.core.chart_analyzer import ChartAnalyzer
 from data_insight.core.chart_comparison_analyzer import ChartComparisonAnalyzer
-from data_insight.core.text_generator import TextGenerator
+from data_insight.api.routes._analyzers import get_text_generator
 from data_insight.api.middlewares.auth import token_required
 from data_insight.api.middlewares.rate_limiter import rate_limit
 from data_insight.api.utils.validator import validate_json_request, Validator
@@ -24,17 +22,18 @@ from data_insight.api.utils.response_formatter import (
     format_success_response, format_error_response
 )
 from data_insight.api.utils.async_task import run_async, task_manager
+from data_insight.api.utils.responses import ORJSONResponse
 
 # 创建Flask蓝图
 bp = Blueprint('chart', __name__, url_prefix='/api/chart')
 
 # 创建路由器
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # 初始化分析器和生成器
 chart_analyzer = ChartAnalyzer()
 comparison_analyzer = ChartComparisonAnalyzer()
-text_generator = TextGenerator()
+text_generator = get_text_generator()
 
 # 配置日志
 logger = logging.getLogger('chart_api')
@@ -128,7 +127,8 @@ async def analyze_chart(request: Request, auth: bool = Depends(token_required)):
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到图表分析请求: {json.dumps(data, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("接收到图表分析请求: %s", (await request.body()).decode('utf-8', 'replace'))
         
         # 分析图表
         analysis_result = chart_analyzer.analyze(data)
@@ -143,7 +143,7 @@ async def analyze_chart(request: Request, auth: bool = Depends(token_required)):
         }
         
         # 返回结果
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="图表分析成功"
         ))
@@ -171,7 +171,8 @@ async def analyze_chart_async(request: Request, auth: bool = Depends(token_requi
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到异步图表分析请求: {json.dumps(data, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("接收到异步图表分析请求: %s", (await request.body()).decode('utf-8', 'replace'))
         
         # 创建异步任务
         @run_async(timeout=60)  # 设置超时时间为60秒
@@ -192,7 +193,7 @@ async def analyze_chart_async(request: Request, auth: bool = Depends(token_requi
         task_result = analyze_chart_task(data)
         
         # 返回任务信息
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=task_result,
             message="图表分析任务已提交",
             status_code=202
@@ -221,7 +222,8 @@ async def compare_charts(request: Request, auth: bool = Depends(token_required))
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到图表对比请求: {json.dumps(data, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("接收到图表对比请求: %s", (await request.body()).decode('utf-8', 'replace'))
         
         # 分析图表对比
         analysis_result = comparison_analyzer.analyze(data)
@@ -236,7 +238,7 @@ async def compare_charts(request: Request, auth: bool = Depends(token_required))
         }
         
         # 返回结果
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="图表对比分析成功"
         ))
@@ -264,7 +266,8 @@ async def compare_charts_async(request: Request, auth: bool = Depends(token_requ
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到异步图表对比请求: {json.dumps(data, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("接收到异步图表对比请求: %s", (await request.body()).decode('utf-8', 'replace'))
         
         # 创建异步任务
         @run_async(timeout=120)  # 设置超时时间为120秒
@@ -285,7 +288,7 @@ async def compare_charts_async(request: Request, auth: bool = Depends(token_requ
         task_result = compare_charts_task(data)
         
         # 返回任务信息
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=task_result,
             message="图表对比分析任务已提交",
             status_code=202
@@ -308,8 +311,8 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
         task_id (str): 任务ID
     """
     try:
-        # 获取任务
-        task_info = task_manager.get_task_info(task_id)
+        # 一次获取任务信息和结果
+        task_info, result = task_manager.get_task_state(task_id)
         
         # 检查任务是否存在
         if not task_info:
@@ -323,10 +326,7 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
         
         # 根据状态返回不同的响应
         if status == "completed":
-            # 获取任务结果
-            result = task_manager.get_task_result(task_id)
-            
-            return JSONResponse(content=format_success_response(
+            return ORJSONResponse(content=format_success_response(
                 data=result,
                 message="任务完成"
             ))
@@ -347,7 +347,7 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
             )
             
         else:  # pending or running
-            return JSONResponse(content=format_success_response(
+            return ORJSONResponse(content=format_success_response(
                 data=task_info,
                 message=f"任务{task_info['status']}中",
                 status_code=202
@@ -401,7 +401,7 @@ async def cancel_task(request: Request, task_id: str, auth: bool = Depends(token
                 detail="取消任务失败"
             )
         
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             message="任务已取消"
         ))
     
@@ -11,9 +11,10 @@
 import os
 import io
 import uuid
-import json
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import secrets
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 import pandas as pd
@@ -24,9 +25,22 @@ from pydantic import BaseModel
 from data_insight.api.middlewares.auth import token_required
 from data_insight.api.middlewares.rate_limiter import rate_limit
 from data_insight.api.utils.response_formatter import format_success_response, format_error_response
+from data_insight.api.utils.json_utils import dumps as json_dumps
 from data_insight.utils.metrics import increment_request_count, record_request_duration
 from data_insight.utils.performance import time_it
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+try:
+    import xlsxwriter  # noqa: F401
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
 # 创建一个路由器
 router = APIRouter(prefix="/export", tags=["结果导出"])
 
@@ -53,6 +67,12 @@ EXPORT_FORMATS = {
     }
 }
 
+# Excel写入引擎，优先使用更快的xlsxwriter
+EXCEL_ENGINE = "xlsxwriter" if XLSXWRITER_AVAILABLE else "openpyxl"
+
+# JSON导出时超过该记录数则改为流式写入（约1MB）
+JSON_STREAM_MIN_RECORDS = 5000
+
 # 临时文件存储路径
 TEMP_DIR = os.environ.get("TEMP_EXPORT_DIR", "tmp/exports")
 
@@ -98,32 +118,35 @@ async def export_result(params: ExportParams, background_tasks: BackgroundTasks)
             detail=f"不支持的导出格式: {params.format}。支持的格式有: {', '.join(EXPORT_FORMATS.keys())}"
         )
         
-    # 创建唯一文件名
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    random_string = str(uuid.uuid4())[:8]
+    # 创建唯一文件名：128位随机串，下载接口只凭文件名访问，文件名必须不可猜测且跨进程不冲突
+    suffix = secrets.token_hex(16)
     extension = EXPORT_FORMATS[params.format]["extension"]
     
     if params.filename:
-        # 移除不安全字符并添加时间戳
+        # 移除不安全字符并添加唯一后缀
         safe_filename = "".join([c if c.isalnum() or c in "._- " else "_" for c in params.filename])
-        filename = f"{safe_filename}_{timestamp}.{extension}"
+        filename = f"{safe_filename}_{suffix}.{extension}"
     else:
         # 使用默认文件名格式
-        filename = f"data_insight_export_{timestamp}_{random_string}.{extension}"
+        filename = f"data_insight_export_{suffix}.{extension}"
     
     # 完整的文件路径
     filepath = os.path.join(TEMP_DIR, filename)
     
     try:
-        # 根据不同的格式导出数据
+        # 根据不同的格式导出数据，文件写入在线程池中执行，避免阻塞事件循环
+        loop = asyncio.get_running_loop()
         if params.format == "csv":
-            export_to_csv(params.data, filepath, params.column_config)
+            await loop.run_in_executor(None, export_to_csv, params.data, filepath, params.column_config)
         elif params.format == "excel":
-            export_to_excel(params.data, filepath, params.column_config)
+            await loop.run_in_executor(None, export_to_excel, params.data, filepath, params.column_config)
         elif params.format == "json":
-            export_to_json(params.data, filepath, params.include_metadata)
+            await loop.run_in_executor(None, export_to_json, params.data, filepath, params.include_metadata)
         elif params.format == "pdf":
-            export_to_pdf(params.data, filepath, params.page_title, params.page_orientation, params.column_config)
+            await loop.run_in_executor(
+                None, export_to_pdf, params.data, filepath,
+                params.page_title, params.page_orientation, params.column_config
+            )
         
         # 计算过期时间（24小时后）
         expires_at = (datetime.now() + timedelta(hours=24)).isoformat()
@@ -210,8 +233,18 @@ def export_to_csv(data: Dict[str, Any], filepath: str, column_config: Optional[D
         filepath: 导出文件路径
         column_config: 列配置
     """
+    frame = _get_direct_frame(data)
+    
+    # polars DataFrame且无列配置时，直接使用原生写入器
+    if POLARS_AVAILABLE and isinstance(frame, pl.DataFrame) and not column_config:
+        frame.write_csv(filepath, include_bom=True)
+        return
+    
     # 提取数据并转换为DataFrame
-    df = extract_data_to_dataframe(data, column_config)
+    if frame is not None:
+        df = _apply_column_config(_to_pandas(frame), column_config)
+    else:
+        df = extract_data_to_dataframe(data, column_config)
     
     # 导出为CSV
     df.to_csv(filepath, index=False, encoding="utf-8-sig")
@@ -226,11 +259,16 @@ def export_to_excel(data: Dict[str, Any], filepath: str, column_config: Optional
         filepath: 导出文件路径
         column_config: 列配置
     """
+    frame = _get_direct_frame(data)
+    
     # 提取数据并转换为DataFrame
-    df = extract_data_to_dataframe(data, column_config)
+    if frame is not None:
+        df = _apply_column_config(_to_pandas(frame), column_config)
+    else:
+        df = extract_data_to_dataframe(data, column_config)
     
     # 导出为Excel
-    with pd.ExcelWriter(filepath, engine="openpyxl") as writer:
+    with pd.ExcelWriter(filepath, engine=EXCEL_ENGINE) as writer:
         df.to_excel(writer, index=False, sheet_name="数据分析结果")
         
         # 如果有多个数据集，则创建多个工作表
@@ -256,9 +294,75 @@ def export_to_json(data: Dict[str, Any], filepath: str, include_metadata: bool =
     else:
         export_data = data
     
-    # 导出为JSON
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(export_data, f, ensure_ascii=False, indent=2)
+    # 查找需要流式写入的大列表
+    stream_key, records = _find_stream_records(export_data)
+    
+    # 小数据量一次性序列化，与流式写入相同使用紧凑格式
+    if records is None or len(records) < JSON_STREAM_MIN_RECORDS:
+        with open(filepath, "wb") as f:
+            f.write(json_dumps(export_data))
+        return
+    
+    # 大数据量逐条写入，峰值内存与数据量无关
+    with open(filepath, "wb") as f:
+        if stream_key is None:
+            _write_json_array(f, records)
+            return
+        
+        f.write(b"{")
+        for i, (key, value) in enumerate(export_data.items()):
+            if i:
+                f.write(b",")
+            f.write(json_dumps(str(key)))
+            f.write(b":")
+            if key == stream_key:
+                _write_json_array(f, value)
+            else:
+                f.write(json_dumps(value))
+        f.write(b"}")
+
+
+def _find_stream_records(export_data: Any) -> Tuple[Optional[str], Optional[List[Any]]]:
+    """
+    查找导出数据中最大的记录列表
+    
+    参数:
+        export_data: 要导出的数据
+        
+    返回:
+        Tuple[Optional[str], Optional[List[Any]]]: (所在键名, 记录列表)，
+            数据本身为列表时键名为None，未找到时均为None
+    """
+    if isinstance(export_data, list):
+        return None, export_data
+    
+    if not isinstance(export_data, dict):
+        return None, None
+    
+    candidates = [
+        (key, export_data[key]) for key in ("data", "results")
+        if isinstance(export_data.get(key), list)
+    ]
+    if not candidates:
+        return None, None
+    
+    return max(candidates, key=lambda item: len(item[1]))
+
+
+def _write_json_array(f, records: List[Any]) -> None:
+    """
+    将记录列表逐条写入JSON数组
+    
+    参数:
+        f: 以二进制模式打开的文件对象
+        records: 记录列表
+    """
+    f.write(b"[")
+    for i, record in enumerate(records):
+        if i:
+            f.write(b",")
+        f.write(json_dumps(record))
+    f.write(b"]")
 
 
 def export_to_pdf(data: Dict[str, Any], filepath: str, page_title: Optional[str] = None, 
@@ -319,8 +423,8 @@ def export_to_pdf(data: Dict[str, Any], filepath: str, page_title: Optional[str]
         
         elements.append(Spacer(1, 12))
         
-        # 提取数据并转换为DataFrame
-        df = extract_data_to_dataframe(data, column_config)
+        # 直接从原始记录构建表格数据，避免DataFrame往返转换
+        table_data = build_table_rows(data, column_config)
         
         # 如果数据中包含图表，添加图表
         if "charts" in data and isinstance(data["charts"], list):
@@ -368,10 +472,7 @@ def export_to_pdf(data: Dict[str, Any], filepath: str, page_title: Optional[str]
                         logger.warning(f"生成图表失败: {str(e)}")
         
         # 如果数据中包含表格，添加表格
-        if not df.empty:
-            # 将DataFrame转换为表格数据
-            table_data = [df.columns.tolist()] + df.values.tolist()
-            
+        if table_data:
             # 创建表格
             table = Table(table_data)
             
@@ -425,6 +526,101 @@ def export_to_pdf(data: Dict[str, Any], filepath: str, page_title: Optional[str]
         raise RuntimeError(f"PDF导出需要额外的依赖库: {str(e)}")
 
 
+def _locate_records(data: Dict[str, Any]) -> List[Any]:
+    """
+    从数据中定位表格记录列表
+    
+    查找顺序与extract_data_to_dataframe保持一致：data、results、items。
+    
+    参数:
+        data: 要提取的数据
+        
+    返回:
+        List[Any]: 记录列表，未找到时返回空列表
+    """
+    # 如果数据本身是列表，直接使用
+    if isinstance(data, list):
+        return data
+    
+    for key in ("data", "results"):
+        if key in data and isinstance(data[key], (list, dict)):
+            value = data[key]
+            if isinstance(value, list):
+                return value
+            
+            # 尝试找到其中的列表
+            for sub_value in value.values():
+                if isinstance(sub_value, list) and len(sub_value) > 0:
+                    return sub_value
+            
+            # 如果没有找到列表，将字典作为单条记录
+            return [value]
+    
+    if "items" in data and isinstance(data["items"], list):
+        return data["items"]
+    
+    return []
+
+
+def build_table_rows(data: Dict[str, Any], column_config: Optional[Dict[str, Dict[str, Any]]] = None) -> List[List[Any]]:
+    """
+    从数据中提取表格行（首行为表头），不经过DataFrame
+    
+    参数:
+        data: 要提取的数据
+        column_config: 列配置
+        
+    返回:
+        List[List[Any]]: 表格行列表，没有数据时返回空列表
+    """
+    # 上游直接传入的DataFrame
+    frame = _get_direct_frame(data)
+    if frame is not None:
+        df = _apply_column_config(_to_pandas(frame), column_config)
+        if df.empty:
+            return []
+        return [df.columns.tolist()] + df.values.tolist()
+    
+    records = _locate_records(data)
+    if not records:
+        return []
+    
+    # 非字典记录（列表或标量）仍交给DataFrame处理
+    if not all(isinstance(record, dict) for record in records):
+        df = extract_data_to_dataframe(data, column_config)
+        if df.empty:
+            return []
+        return [df.columns.tolist()] + df.values.tolist()
+    
+    # 按出现顺序收集所有列
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    headers = list(columns)
+    
+    # 应用列配置
+    if column_config:
+        # 只保留配置中指定的列
+        if "include_columns" in column_config:
+            include_columns = [col for col in column_config["include_columns"] if col in columns]
+            columns = include_columns
+            headers = list(include_columns)
+        
+        # 重命名列
+        if "rename_columns" in column_config:
+            rename_map = column_config["rename_columns"]
+            headers = [rename_map.get(col, col) for col in columns]
+        
+        # 排序列（按重命名后的列名）
+        if "column_order" in column_config:
+            column_order = column_config["column_order"]
+            positions = {header: i for i, header in enumerate(headers)}
+            order = [positions[col] for col in column_order if col in positions]
+            order += [i for i, header in enumerate(headers) if header not in column_order]
+            columns = [columns[i] for i in order]
+            headers = [headers[i] for i in order]
+    
+    return [headers] + [[record.get(col, "") for col in columns] for record in records]
+
+
 def extract_data_to_dataframe(data: Dict[str, Any], column_config: Optional[Dict[str, Dict[str, Any]]] = None) -> pd.DataFrame:
     """
     从数据中提取表格数据并转换为DataFrame
@@ -472,6 +668,53 @@ def extract_data_to_dataframe(data: Dict[str, Any], column_config: Optional[Dict
     else:
         df = pd.DataFrame()
     
+    return _apply_column_config(df, column_config)
+
+
+def _get_direct_frame(data: Dict[str, Any]) -> Optional[Any]:
+    """
+    获取上游直接传入的DataFrame（pandas或polars）
+    
+    参数:
+        data: 要导出的数据
+        
+    返回:
+        Optional[Any]: DataFrame对象，不是DataFrame时返回None
+    """
+    frame = data.get("data") if isinstance(data, dict) else None
+    if isinstance(frame, pd.DataFrame):
+        return frame
+    if POLARS_AVAILABLE and isinstance(frame, pl.DataFrame):
+        return frame
+    return None
+
+
+def _to_pandas(frame: Any) -> pd.DataFrame:
+    """
+    将DataFrame转换为pandas DataFrame，pandas对象原样返回
+    
+    参数:
+        frame: pandas或polars DataFrame
+        
+    返回:
+        pd.DataFrame: pandas DataFrame
+    """
+    if isinstance(frame, pd.DataFrame):
+        return frame
+    return frame.to_pandas()
+
+
+def _apply_column_config(df: pd.DataFrame, column_config: Optional[Dict[str, Dict[str, Any]]] = None) -> pd.DataFrame:
+    """
+    对DataFrame应用列配置
+    
+    参数:
+        df: 要处理的DataFrame
+        column_config: 列配置
+        
+    返回:
+        pd.DataFrame: 处理后的DataFrame
+    """
     # 应用列配置
     if column_config and not df.empty:
         # 只保留配置中指定的列
@@ -502,8 +745,6 @@ async def cleanup_export_file(filepath: str, delay_hours: int = 24) -> None:
         filepath: 文件路径
         delay_hours: 延迟时间（小时）
     """
-    import asyncio
-    
     # 延迟指定时间
     await asyncio.sleep(delay_hours * 3600)
     
@@ -10,8 +10,7 @@
 
 import time
 import platform
-import psutil
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
@@ -20,6 +19,12 @@ from data_insight.services.async_task_service import get_async_task_service
 
 router = APIRouter(prefix="/health", tags=["健康检查"])
 
+# 就绪性检查结果缓存时间（秒），探针频率再高也只按该间隔访问缓存系统
+READINESS_CACHE_TTL = 3.0
+
+# 就绪性检查结果缓存: (检查时间, 是否就绪)
+_readiness_cache: Tuple[float, Optional[bool]] = (0.0, None)
+
 @router.get("/", summary="系统健康状态检查", 
             description="检查系统各组件的健康状态，包括API服务、缓存系统和异步任务服务")
 async def health_check() -> Dict[str, Any]:
@@ -64,6 +69,8 @@ async def liveness_check() -> Dict[str, str]:
     """
     提供容器健康检查的活跃性检查端点。
     
+    该端点不执行任何I/O，也不访问缓存或系统资源。
+    
     返回:
         Dict[str, str]: 包含状态信息的字典。
     """
@@ -75,18 +82,29 @@ async def readiness_check() -> Dict[str, str]:
     """
     提供容器健康检查的就绪性检查端点。
     
+    检查结果缓存READINESS_CACHE_TTL秒。
+    
     返回:
         Dict[str, str]: 包含状态信息的字典。
     """
-    # 检查缓存系统状态
-    cache_status = check_cache_status()
+    global _readiness_cache
     
-    # 检查异步任务服务状态
-    task_service_status = check_task_service_status()
+    checked_at, is_ready = _readiness_cache
+    now = time.monotonic()
+    
+    if is_ready is None or now - checked_at >= READINESS_CACHE_TTL:
+        # 检查缓存系统状态
+        cache_status = check_cache_status()
+        
+        # 检查异步任务服务状态
+        task_service_status = check_task_service_status()
+        
+        is_ready = (cache_status.get("status") == "healthy" and
+                    task_service_status.get("status") == "healthy")
+        _readiness_cache = (now, is_ready)
     
     # 检查结果
-    if (cache_status.get("status") == "healthy" and 
-        task_service_status.get("status") == "healthy"):
+    if is_ready:
         return {"status": "ready"}
     else:
         raise HTTPException(
@@ -175,6 +193,8 @@ def check_system_status() -> Dict[str, Any]:
         Dict[str, Any]: 包含系统资源状态信息的字典。
     """
     try:
+        import psutil
+        
         # CPU使用率
         cpu_percent = psutil.cpu_percent(interval=0.1)
         
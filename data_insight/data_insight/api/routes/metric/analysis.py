@@ -5,16 +5,36 @@
 提供指标分析相关的API端点。
 """
 
-from flask import request, jsonify
-from data_insight.services import MetricService
+from pydantic import ValidationError
+from data_insight.api.routes._analyzers import get_metric_service
 from data_insight.api.routes.metric import bp
-from data_insight.api.validation import validate_request_json
+from data_insight.api.models import MetricAnalysisRequest, MetricPredictRequest
+from data_insight.api.validation import validate_request_json, load_request_json
 from data_insight.api.error_handling import handle_exceptions, APIError
+from data_insight.api.utils.responses import json_response
 
-# 创建服务实例
-metric_service = MetricService()
+# 共享的服务实例
+metric_service = get_metric_service()
 
-@bp.route('/analyze', methods=['POST'])
+def _parse_request(model, data):
+    """按请求模型校验请求数据
+    
+    Args:
+        model: pydantic请求模型类
+        data (dict): 请求JSON数据
+        
+    Returns:
+        BaseModel: 校验通过的模型实例
+        
+    Raises:
+        APIError: 数据不符合模型定义时抛出400错误
+    """
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        raise APIError('请求数据验证失败', 400, e.errors())
+
+@bp.route('/analyze', methods=['POST'], strict_slashes=False)
 @validate_request_json(['metric_data'])
 @handle_exceptions
 def analyze_metric():
@@ -74,22 +94,20 @@ def analyze_metric():
       500:
         description: 服务器错误
     """
-    data = request.json
-    metric_data = data.get('metric_data')
-    context = data.get('context', {})
+    data = load_request_json()
     
-    try:
-        # 验证指标数据
-        metric_service.validate_metric_data(metric_data)
-    except ValueError as e:
-        raise APIError(str(e), 400)
+    # 按请求模型验证数据，下游使用校验并转换后的数据（如"12"转换为12.0）
+    params = _parse_request(MetricAnalysisRequest, data)
+    
+    metric_data = params.metric_data.model_dump(exclude_none=True)
+    context = params.context or {}
     
     # 分析指标
     result = metric_service.analyze_metric(metric_data, context)
     
-    return jsonify(result)
+    return json_response(result)
 
-@bp.route('/predict', methods=['POST'])
+@bp.route('/predict', methods=['POST'], strict_slashes=False)
 @validate_request_json(['metric_data'])
 @handle_exceptions
 def predict_metric():
@@ -142,34 +160,21 @@ def predict_metric():
       500:
         description: 服务器错误
     """
-    data = request.json
-    metric_data = data.get('metric_data')
-    horizon = data.get('horizon', 7)
-    confidence_level = data.get('confidence_level', 0.95)
+    data = load_request_json()
     
-    try:
-        # 验证指标数据
-        metric_service.validate_metric_data(metric_data)
-        
-        # 验证必须包含历史值
-        if 'historical_values' not in metric_data or not metric_data['historical_values']:
-            raise ValueError("预测必须提供历史值数据")
-        
-        # 验证预测参数
-        if not isinstance(horizon, int) or horizon < 1:
-            raise ValueError("预测步长必须是大于0的整数")
-        
-        if not isinstance(confidence_level, (int, float)) or not 0 < confidence_level < 1:
-            raise ValueError("置信水平必须是0到1之间的小数")
-    except ValueError as e:
-        raise APIError(str(e), 400)
+    # 按请求模型验证数据（包括历史值、预测步长和置信水平）
+    params = _parse_request(MetricPredictRequest, data)
     
     # 执行预测
-    result = metric_service.predict_metric(metric_data, horizon, confidence_level)
+    result = metric_service.predict_metric(
+        params.metric_data.model_dump(exclude_none=True),
+        params.horizon,
+        params.confidence_level
+    )
     
-    return jsonify(result)
+    return json_response(result)
 
-@bp.route('/clear-cache', methods=['POST'])
+@bp.route('/clear-cache', methods=['POST'], strict_slashes=False)
 @handle_exceptions
 def clear_analysis_cache():
     """清除指标分析缓存
@@ -185,7 +190,7 @@ def clear_analysis_cache():
         description: 服务器错误
     """
     metric_service.invalidate_cache()
-    return jsonify({
+    return json_response({
         'status': 'success',
         'message': '指标分析缓存已清除'
     }) 
\ No newline at end of file
@@ -5,16 +5,79 @@
 提供指标对比相关的API端点。
 """
 
-from flask import request, jsonify
-from data_insight.services import MetricService
+import queue
+from contextlib import contextmanager
+
+import numpy as np
+from data_insight.api.routes._analyzers import get_metric_service
 from data_insight.api.routes.metric import bp
-from data_insight.api.validation import validate_request_json
+from data_insight.api.validation import validate_request_json, load_request_json
 from data_insight.api.error_handling import handle_exceptions, APIError
+from data_insight.api.utils.responses import json_response
+
+# 共享的服务实例
+metric_service = get_metric_service()
+
+# 支持的对比类型
+_COMPARISON_TYPES = ('general', 'correlation', 'trend', 'performance')
+_VALID_COMPARISON_TYPES = frozenset(_COMPARISON_TYPES)
+_VALID_COMPARISON_TYPES_STR = ", ".join(_COMPARISON_TYPES)
+
+# 相关性矩阵缓冲区池: 复用固定大小的float64缓冲区，避免高频请求下反复分配大数组
+_MATRIX_BUFFER_SIZE = 1 << 16
+_MATRIX_POOL_SIZE = 8
+_matrix_pool = queue.LifoQueue(maxsize=_MATRIX_POOL_SIZE)
+
+@contextmanager
+def _pooled_matrix(rows):
+    """将多个等长一维数组复制到池化缓冲区中的二维矩阵
+    
+    Args:
+        rows: 等长的一维float64数组列表
+        
+    Yields:
+        np.ndarray: 形状为(len(rows), 行长度)的矩阵，仅在上下文内有效
+    """
+    shape = (len(rows), rows[0].size)
+    size = shape[0] * shape[1]
+    
+    # 超出缓冲区大小的矩阵直接分配，不进入缓冲区池
+    if size > _MATRIX_BUFFER_SIZE:
+        yield np.vstack(rows)
+        return
+    
+    try:
+        buffer = _matrix_pool.get_nowait()
+    except queue.Empty:
+        buffer = np.empty(_MATRIX_BUFFER_SIZE, dtype=np.float64)
+    
+    try:
+        yield np.stack(rows, out=buffer[:size].reshape(shape))
+    finally:
+        try:
+            _matrix_pool.put_nowait(buffer)
+        except queue.Full:
+            pass
 
-# 创建服务实例
-metric_service = MetricService()
+def _to_float_array(values):
+    """将历史值列表转换为float64数组
+    
+    Args:
+        values: 历史值
+        
+    Returns:
+        np.ndarray: 一维float64数组，值不是纯数值列表时返回None
+    """
+    if not isinstance(values, list):
+        return None
+    
+    array = np.asarray(values)
+    if array.ndim != 1 or array.dtype.kind not in 'biuf':
+        return None
+    
+    return array.astype(np.float64, copy=False)
 
-@bp.route('/compare', methods=['POST'])
+@bp.route('/compare', methods=['POST'], strict_slashes=False)
 @validate_request_json(['metrics'])
 @handle_exceptions
 def compare_metrics():
@@ -85,7 +148,7 @@ def compare_metrics():
       500:
         description: 服务器错误
     """
-    data = request.json
+    data = load_request_json()
     metrics = data.get('metrics', [])
     comparison_type = data.get('comparison_type', 'general')
     context = data.get('context', {})
@@ -94,38 +157,32 @@ def compare_metrics():
     if len(metrics) < 2:
         raise APIError('对比至少需要2个指标', 400)
     
-    # 验证每个指标
-    for metric in metrics:
-        try:
-            metric_service.validate_metric_data(metric)
-        except ValueError as e:
-            raise APIError(f'指标数据格式无效: {metric.get("metric_id", "未知")}, {str(e)}', 400)
+    # 一次性验证所有指标
+    try:
+        metric_service.validate_metrics_batch(metrics)
+    except ValueError as e:
+        raise APIError(str(e), 400, getattr(e, 'errors', None))
     
     # 验证对比类型
-    valid_comparison_types = ['general', 'correlation', 'trend', 'performance']
-    if comparison_type not in valid_comparison_types:
-        raise APIError(f'不支持的对比类型: {comparison_type}, 有效类型: {", ".join(valid_comparison_types)}', 400)
+    if comparison_type not in _VALID_COMPARISON_TYPES:
+        raise APIError(f'不支持的对比类型: {comparison_type}, 有效类型: {_VALID_COMPARISON_TYPES_STR}', 400)
     
     # 添加对比类型到上下文
     context['comparison_type'] = comparison_type
     
-    # 准备对比数据
-    metrics_data = {
-        'metrics': metrics
-    }
-    
     # 进行指标对比
-    result = metric_service.compare_metrics(metrics_data, context)
+    result = metric_service.compare_metrics_list(metrics, context)
     
-    return jsonify(result)
+    return json_response(result)
 
-@bp.route('/correlation', methods=['POST'])
+@bp.route('/correlation', methods=['POST'], strict_slashes=False)
 @validate_request_json(['metrics'])
 @handle_exceptions
 def analyze_correlation():
     """分析多个指标之间相关性的API端点
     
-    接受包含多个指标数据的JSON请求，返回相关性分析结果
+    接受包含多个指标数据的JSON请求，返回相关性分析结果。
+    历史值长度不同时，按各指标最近的共同窗口对齐后计算，响应结构与长度一致时相同。
     ---
     tags:
       - 指标对比
@@ -171,7 +228,7 @@ def analyze_correlation():
       500:
         description: 服务器错误
     """
-    data = request.json
+    data = load_request_json()
     metrics = data.get('metrics', [])
     context = data.get('context', {})
     
@@ -179,26 +236,31 @@ def analyze_correlation():
     if len(metrics) < 2:
         raise APIError('相关性分析至少需要2个指标', 400)
     
-    # 验证每个指标
+    # 确保每个指标都有足够的历史值，数组转换和检查都在NumPy中完成
+    checked_metrics = []
     for metric in metrics:
-        # 确保有历史值
-        if 'historical_values' not in metric or not isinstance(metric['historical_values'], list) or len(metric['historical_values']) < 3:
+        values = _to_float_array(metric.get('historical_values'))
+        if values is None or values.size < 3 or not np.isfinite(values).all():
             raise APIError(f'指标 {metric.get("name", "未知")} 缺少足够的历史数据进行相关性分析，至少需要3个数据点', 400)
-        
-        try:
-            metric_service.validate_metric_data(metric)
-        except ValueError as e:
-            raise APIError(f'指标数据格式无效: {metric.get("metric_id", "未知")}, {str(e)}', 400)
+        checked_metrics.append({**metric, 'historical_values': values})
+    
+    # 一次性验证所有指标
+    try:
+        metric_service.validate_metrics_batch(checked_metrics)
+    except ValueError as e:
+        raise APIError(str(e), 400, getattr(e, 'errors', None))
     
     # 设置对比类型为相关性分析
     context['comparison_type'] = 'correlation'
     
-    # 准备对比数据
-    metrics_data = {
-        'metrics': metrics
-    }
-    
-    # 进行指标相关性分析
-    result = metric_service.compare_metrics(metrics_data, context)
+    # 以二维矩阵一次计算全部相关系数，长度不同的历史值按最近的共同窗口对齐
+    window = min(m['historical_values'].size for m in checked_metrics)
+    with _pooled_matrix([m['historical_values'][-window:] for m in checked_metrics]) as matrix:
+        result = metric_service.compare_metrics_matrix(
+            matrix,
+            [m.get('metric_id', i) for i, m in enumerate(metrics)],
+            context,
+            names=[m.get('name', str(m.get('metric_id', i))) for i, m in enumerate(metrics)]
+        )
     
-    return jsonify(result) 
\ No newline at end of file
+    return json_response(result)
@@ -5,40 +5,45 @@
 提供指标分析和指标对比相关的API端点。
 """
 
-from flask import Blueprint, request, jsonify
-import json
-from datetime import datetime
+from flask import Blueprint, request
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Callable, Dict, Any
 
+from cachetools import TTLCache
 from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.responses import JSONResponse
 
-from data_insight.core.metric_analyzer import MetricAnalyzer
-from data_insight.core.metric_comparison_analyzer import MetricComparisonAnalyzer
-from data_insight.core.text_generator import TextGenerator
+from data_insight.api.routes._analyzers import (
+    get_metric_analyzer, get_comparison_analyzer, get_text_generator
+)
 from data_insight.api.middlewares.auth import token_required
 from data_insight.api.middlewares.rate_limiter import rate_limit
 from data_insight.api.utils.validator import validate_json_request, Validator
 from data_insight.api.utils.response_formatter import (
     format_success_response, format_error_response
 )
-from data_insight.api.utils.async_task import run_async, task_manager
+from data_insight.api.utils.async_task import submit_process_task, task_manager
+from data_insight.api.utils.json_utils import dumps as json_dumps
+from data_insight.api.utils.responses import ORJSONResponse, json_response
+from data_insight.api.utils.json_route import ORJSONRoute
+from data_insight.api.validation import load_request_json
 
 # 创建Flask蓝图
 bp = Blueprint('metric', __name__, url_prefix='/api/metric')
 
 # 创建路由器
-router = APIRouter()
-
-# 初始化分析器和生成器
-metric_analyzer = MetricAnalyzer()
-comparison_analyzer = MetricComparisonAnalyzer()
-text_generator = TextGenerator()
+router = APIRouter(default_response_class=ORJSONResponse, route_class=ORJSONRoute)
 
 # 配置日志
 logger = logging.getLogger('metric_api')
 
+# 同步分析结果缓存: (分析函数名, 请求摘要) -> 结果，仪表盘轮询的相同请求直接复用
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_TTL = 30
+_result_cache: TTLCache = TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+_result_cache_lock = threading.Lock()
+
 
 # 指标分析验证模式
 metric_schema = {
@@ -107,6 +112,82 @@ comparison_schema = {
 }
 
 
+def _do_analyze(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    分析单个指标并生成文本解读
+    
+    Flask蓝图和FastAPI路由共用的分析实现。
+    
+    参数:
+        data (Dict[str, Any]): 指标数据
+        
+    返回:
+        Dict[str, Any]: 包含分析结果和文本解读的字典
+    """
+    # 分析指标
+    analysis_result = get_metric_analyzer().analyze(data)
+    
+    # 生成文本解读
+    text_insight = get_text_generator().generate_metric_insight(analysis_result)
+    
+    return {
+        "analysis": analysis_result,
+        "insight": text_insight
+    }
+
+
+def _do_compare(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    对比多个指标并生成文本解读
+    
+    Flask蓝图和FastAPI路由共用的对比实现。
+    
+    参数:
+        data (Dict[str, Any]): 多个指标数据
+        
+    返回:
+        Dict[str, Any]: 包含对比分析结果和文本解读的字典
+    """
+    # 分析指标对比
+    analysis_result = get_comparison_analyzer().analyze(data)
+    
+    # 生成对比解读文本
+    text_insight = get_text_generator().generate_metric_comparison_insight(analysis_result)
+    
+    return {
+        "analysis": analysis_result,
+        "insight": text_insight
+    }
+
+
+def _cached_call(func: Callable[[Dict[str, Any]], Dict[str, Any]], data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    调用分析函数，相同请求在缓存有效期内直接返回缓存结果
+    
+    缓存键由按键排序的规范化JSON计算BLAKE2摘要得到，字段顺序不同的相同请求命中同一缓存。
+    
+    参数:
+        func (Callable): 分析函数，如_do_analyze或_do_compare
+        data (Dict[str, Any]): 请求数据
+        
+    返回:
+        Dict[str, Any]: 分析结果
+    """
+    key = (func.__name__, hashlib.blake2b(json_dumps(data, sort_keys=True), digest_size=16).digest())
+    
+    with _result_cache_lock:
+        cached = _result_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    result = func(data)
+    
+    with _result_cache_lock:
+        _result_cache[key] = result
+    
+    return result
+
+
 @router.post('/analyze')
 @rate_limit
 @validate_json_request
@@ -122,22 +203,14 @@ async def analyze_metric(request: Request, auth: bool = Depends(token_required))
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到指标分析请求: {json.dumps(data, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("接收到指标分析请求: %s", (await request.body()).decode('utf-8', 'replace'))
         
         # 分析指标
-        analysis_result = metric_analyzer.analyze(data)
-        
-        # 生成文本解读
-        text_insight = text_generator.generate_metric_insight(analysis_result)
-        
-        # 构建响应
-        response_data = {
-            "analysis": analysis_result,
-            "insight": text_insight
-        }
+        response_data = _cached_call(_do_analyze, data)
         
         # 返回结果
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="指标分析成功"
         ))
@@ -165,28 +238,14 @@ async def analyze_metric_async(request: Request, auth: bool = Depends(token_requ
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到异步指标分析请求: {json.dumps(data, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("接收到异步指标分析请求: %s", (await request.body()).decode('utf-8', 'replace'))
         
-        # 创建异步任务
-        @run_async(timeout=60)  # 设置超时时间为60秒
-        def analyze_metric_task(data):
-            # 分析指标
-            analysis_result = metric_analyzer.analyze(data)
-            
-            # 生成文本解读
-            text_insight = text_generator.generate_metric_insight(analysis_result)
-            
-            # 构建响应
-            return {
-                "analysis": analysis_result,
-                "insight": text_insight
-            }
-        
-        # 启动异步任务
-        task_result = analyze_metric_task(data)
+        # 在进程池中启动异步任务，超时时间为60秒
+        task_result = submit_process_task(_do_analyze, data, timeout=60)
         
         # 返回任务信息
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=task_result,
             message="指标分析任务已提交",
             status_code=202
@@ -215,22 +274,14 @@ async def compare_metrics(request: Request, auth: bool = Depends(token_required)
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到指标对比请求: {json.dumps(data, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("接收到指标对比请求: %s", (await request.body()).decode('utf-8', 'replace'))
         
         # 分析指标对比
-        analysis_result = comparison_analyzer.analyze(data)
-        
-        # 生成对比解读文本
-        text_insight = text_generator.generate_metric_comparison_insight(analysis_result)
-        
-        # 构建响应
-        response_data = {
-            "analysis": analysis_result,
-            "insight": text_insight
-        }
+        response_data = _cached_call(_do_compare, data)
         
         # 返回结果
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="指标对比分析成功"
         ))
@@ -258,28 +309,14 @@ async def compare_metrics_async(request: Request, auth: bool = Depends(token_req
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到异步指标对比请求: {json.dumps(data, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("接收到异步指标对比请求: %s", (await request.body()).decode('utf-8', 'replace'))
         
-        # 创建异步任务
-        @run_async(timeout=120)  # 设置超时时间为120秒
-        def compare_metrics_task(data):
-            # 分析指标对比
-            analysis_result = comparison_analyzer.analyze(data)
-            
-            # 生成对比解读文本
-            text_insight = text_generator.generate_metric_comparison_insight(analysis_result)
-            
-            # 构建响应
-            return {
-                "analysis": analysis_result,
-                "insight": text_insight
-            }
-        
-        # 启动异步任务
-        task_result = compare_metrics_task(data)
+        # 在进程池中启动异步任务，超时时间为120秒
+        task_result = submit_process_task(_do_compare, data, timeout=120)
         
         # 返回任务信息
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=task_result,
             message="指标对比分析任务已提交",
             status_code=202
@@ -302,8 +339,8 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
         task_id (str): 任务ID
     """
     try:
-        # 获取任务
-        task_info = task_manager.get_task_info(task_id)
+        # 一次获取任务信息和结果
+        task_info, result = task_manager.get_task_state(task_id)
         
         # 检查任务是否存在
         if not task_info:
@@ -317,10 +354,7 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
         
         # 根据状态返回不同的响应
         if status == "completed":
-            # 获取任务结果
-            result = task_manager.get_task_result(task_id)
-            
-            return JSONResponse(content=format_success_response(
+            return ORJSONResponse(content=format_success_response(
                 data=result,
                 message="任务完成"
             ))
@@ -341,7 +375,7 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
             )
             
         else:  # pending or running
-            return JSONResponse(content=format_success_response(
+            return ORJSONResponse(content=format_success_response(
                 data=task_info,
                 message=f"任务{task_info['status']}中",
                 status_code=202
@@ -395,7 +429,7 @@ async def cancel_task(request: Request, task_id: str, auth: bool = Depends(token
                 detail="取消任务失败"
             )
         
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             message="任务已取消"
         ))
     
@@ -406,4 +440,70 @@ async def cancel_task(request: Request, task_id: str, auth: bool = Depends(token
         logger.error(f"取消任务异常: {str(e)}", exc_info=True)
         
         # 返回错误响应
-        raise HTTPException(status_code=500, detail=f"取消任务失败: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"取消任务失败: {str(e)}") 
+
+
+@bp.route('/analyze', methods=['POST'], strict_slashes=False)
+@token_required
+@rate_limit()
+@validate_json_request
+@Validator.validate_request(metric_schema)
+def analyze_metric_view():
+    """
+    分析单个指标数据（Flask）
+    
+    请求体应为JSON格式，包含指标数据。
+    """
+    data = load_request_json()
+    
+    # 记录请求，直接使用已缓存的原始请求体
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("接收到指标分析请求: %s", request.get_data(cache=True).decode('utf-8', 'replace'))
+    
+    try:
+        response_data = _cached_call(_do_analyze, data)
+    except Exception as e:
+        logger.error(f"指标分析异常: {str(e)}", exc_info=True)
+        return json_response(format_error_response(
+            message=f"指标分析失败: {str(e)}",
+            status_code=500,
+            error_type="AnalysisError"
+        ), 500)
+    
+    return json_response(format_success_response(
+        data=response_data,
+        message="指标分析成功"
+    ))
+
+
+@bp.route('/compare', methods=['POST'], strict_slashes=False)
+@token_required
+@rate_limit()
+@validate_json_request
+@Validator.validate_request(comparison_schema)
+def compare_metrics_view():
+    """
+    比较多个指标数据（Flask）
+    
+    请求体应为JSON格式，包含多个指标数据。
+    """
+    data = load_request_json()
+    
+    # 记录请求，直接使用已缓存的原始请求体
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("接收到指标对比请求: %s", request.get_data(cache=True).decode('utf-8', 'replace'))
+    
+    try:
+        response_data = _cached_call(_do_compare, data)
+    except Exception as e:
+        logger.error(f"指标对比分析异常: {str(e)}", exc_info=True)
+        return json_response(format_error_response(
+            message=f"指标对比分析失败: {str(e)}",
+            status_code=500,
+            error_type="ComparisonError"
+        ), 500)
+    
+    return json_response(format_success_response(
+        data=response_data,
+        message="指标对比分析成功"
+    ))
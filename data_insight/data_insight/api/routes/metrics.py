@@ -8,53 +8,60 @@
 提供系统监控指标的导出接口，支持Prometheus格式。
 """
 
-from fastapi import APIRouter, Request, Response
+from fastapi import APIRouter, Response
+from fastapi.responses import StreamingResponse
+from data_insight.api.utils.responses import ORJSONResponse
 from data_insight.utils.metrics import get_metrics_registry
 
-router = APIRouter(prefix="/metrics", tags=["监控指标"])
+# Prometheus文本格式的内容类型
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(prefix="/metrics", tags=["监控指标"], default_response_class=ORJSONResponse)
 
 @router.get("/", summary="获取Prometheus格式的监控指标", 
             description="获取所有系统和应用监控指标，使用Prometheus格式")
-async def prometheus_metrics(request: Request) -> Response:
+async def prometheus_metrics() -> Response:
     """
     获取Prometheus格式的监控指标。
     
+    指标按块流式输出，格式化与发送交替进行。
+    
     返回:
         Response: 包含Prometheus格式监控指标的响应
     """
     registry = get_metrics_registry()
-    metrics_data = registry.get_prometheus_metrics()
     
-    return Response(
-        content=metrics_data,
-        media_type="text/plain"
+    return StreamingResponse(
+        registry.iter_prometheus_bytes(),
+        media_type=PROMETHEUS_CONTENT_TYPE
     )
 
 @router.get("/json", summary="获取JSON格式的监控指标", 
-            description="获取所有系统和应用监控指标，使用JSON格式")
-async def json_metrics(request: Request) -> dict:
+            description="获取所有系统和应用监控指标，使用JSON格式",
+            response_class=ORJSONResponse)
+async def json_metrics() -> Response:
     """
     获取JSON格式的监控指标。
     
     返回:
-        dict: 包含所有监控指标的字典
+        Response: 包含所有监控指标的JSON响应
     """
     registry = get_metrics_registry()
-    return registry.get_all_metrics()
+    return ORJSONResponse(content=registry.get_all_metrics())
 
 @router.post("/reset", summary="重置所有监控指标", 
              description="重置所有监控指标为初始值")
-async def reset_metrics(request: Request) -> dict:
+async def reset_metrics() -> Response:
     """
     重置所有监控指标为初始值。
     
     返回:
-        dict: 操作结果
+        Response: 操作结果
     """
     registry = get_metrics_registry()
     registry.reset()
     
-    return {
+    return ORJSONResponse(content={
         "success": True,
         "message": "所有监控指标已重置"
-    } 
\ No newline at end of file
+    }) 
\ No newline at end of file
@@ -5,36 +5,66 @@
 提供时间序列预测和异常预测相关的API端点。
 """
 
-import json
 from datetime import datetime
+from functools import partial, wraps
 import logging
+import os
 from typing import Dict, Any, List, Optional
 
-from flask import Blueprint, request, jsonify
-from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.responses import JSONResponse
+import numpy as np
+from fastapi import APIRouter, Request, Response, HTTPException, Depends
 
-from data_insight.core.predictor import Predictor
+from data_insight.api.routes._analyzers import get_predictor
+from data_insight.core.predictor import ForecastResult
 from data_insight.api.middlewares.auth import token_required
-from data_insight.api.middlewares.rate_limiter import rate_limit
-from data_insight.api.utils.validator import validate_json_request, Validator
+from data_insight.api.middlewares.rate_limiter import ClientRateLimiter
+from data_insight.api.utils.validator import Validator, ValidationError
 from data_insight.api.utils.response_formatter import (
-    format_success_response, format_error_response
+    format_success_response, format_error_response, format_validation_error
 )
 from data_insight.api.utils.async_task import run_async, task_manager
-
-# 创建Flask蓝图
-bp = Blueprint('prediction', __name__, url_prefix='/api/prediction')
+from data_insight.api.utils.json_utils import dumps
+from data_insight.api.utils.responses import ORJSONResponse
+from data_insight.api.utils.json_route import ORJSONRoute
 
 # 创建路由器
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse, route_class=ORJSONRoute)
 
-# 初始化预测器
-predictor = Predictor()
+# 共享的预测器实例
+predictor = get_predictor()
 
 # 配置日志
 logger = logging.getLogger('prediction_api')
 
+# 按路由预先绑定上下文的日志适配器，日志记录的route字段供结构化日志采集使用
+forecast_log = logging.LoggerAdapter(logger, {"route": "forecast"})
+forecast_async_log = logging.LoggerAdapter(logger, {"route": "forecast_async"})
+anomaly_log = logging.LoggerAdapter(logger, {"route": "anomaly"})
+task_log = logging.LoggerAdapter(logger, {"route": "task"})
+
+# 预测接口的速率限制器
+rate_limiter = ClientRateLimiter(
+    limit=int(os.environ.get('DEFAULT_RATE_LIMIT', 100)),
+    window=int(os.environ.get('DEFAULT_RATE_WINDOW', 3600))
+)
+
+# 异常预测快速路径允许的最大趋势斜率t统计量，超过时说明存在趋势，需要拟合预测模型
+FAST_PATH_MAX_TREND_T = 2.0
+
+# 预先构造的错误响应: 415响应体不含可变字段，直接编码为字节；其余只有消息和详情随请求变化
+_UNSUPPORTED_MEDIA_TYPE_BODY = dumps({
+    "success": False,
+    "message": "请求必须是JSON格式",
+    "error_code": "INVALID_CONTENT_TYPE",
+    "status_code": 415
+})
+_rate_limited_error = partial(
+    format_error_response,
+    message="API速率限制已达到，请稍后再试",
+    status_code=429
+)
+_invalid_json_error = partial(format_error_response, status_code=400, error_type="InvalidJSONError")
+
 
 # 预测分析验证模式
 prediction_schema = {
@@ -92,10 +122,154 @@ anomaly_prediction_schema = {
 }
 
 
+def prediction_route(schema: Dict[str, Dict[str, Any]]):
+    """
+    预测接口装饰器
+    
+    将速率限制、JSON格式检查和请求数据验证合并为一层包装，验证模式在装饰时编译。
+    API令牌仍由处理函数的token_required依赖项验证。
+    
+    参数:
+        schema (Dict[str, Dict[str, Any]]): 验证模式
+        
+    返回:
+        callable: 装饰器
+    """
+    validate = Validator.compile(schema)
+    
+    def decorator(f):
+        @wraps(f)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs["request"]
+            
+            # 检查速率限制
+            allowed, remaining, reset_time = rate_limiter.is_allowed(request)
+            rate_limit_headers = {
+                "X-RateLimit-Limit": str(rate_limiter.limit),
+                "X-RateLimit-Remaining": str(remaining),
+                "X-RateLimit-Reset": str(reset_time)
+            }
+            if not allowed:
+                return ORJSONResponse(content=_rate_limited_error(
+                    error_detail={
+                        "reset_time": reset_time,
+                        "limit": rate_limiter.limit,
+                        "window": rate_limiter.window
+                    }
+                ), status_code=429, headers=rate_limit_headers)
+            
+            # 检查请求是否为JSON格式
+            if not request.headers.get("content-type", "").startswith("application/json"):
+                return Response(content=_UNSUPPORTED_MEDIA_TYPE_BODY, status_code=415,
+                                media_type="application/json", headers=rate_limit_headers)
+            
+            # 验证请求数据
+            try:
+                data = await request.json()
+                if not isinstance(data, dict):
+                    raise ValueError("请求体必须是JSON对象")
+                validate(data)
+            except ValidationError as e:
+                return ORJSONResponse(content=format_validation_error(
+                    errors=e.errors,
+                    status_code=422
+                ), status_code=422, headers=rate_limit_headers)
+            except ValueError as e:
+                return ORJSONResponse(content=_invalid_json_error(
+                    message=f"无效的JSON数据: {str(e)}"
+                ), status_code=400, headers=rate_limit_headers)
+            
+            response = await f(*args, **kwargs)
+            response.headers.update(rate_limit_headers)
+            return response
+        
+        return wrapper
+    
+    return decorator
+
+
+def _has_trend(history: np.ndarray) -> bool:
+    """
+    检查历史值是否存在显著的线性趋势
+    
+    对历史值做最小二乘直线拟合，斜率的t统计量不小于FAST_PATH_MAX_TREND_T时视为存在趋势。
+    少于3个点时无法检验，按存在趋势处理。
+    
+    参数:
+        history (np.ndarray): 历史值数组
+        
+    返回:
+        bool: 是否存在显著趋势
+    """
+    n = history.size
+    if n < 3:
+        return True
+    
+    x = np.arange(n, dtype=np.float64)
+    x -= x.mean()
+    sxx = float(x @ x)
+    y = history - history.mean()
+    slope = float(x @ y) / sxx
+    residuals = y - slope * x
+    stderr = (float(residuals @ residuals) / (n - 2) / sxx) ** 0.5
+    return abs(slope) >= FAST_PATH_MAX_TREND_T * stderr and slope != 0
+
+
+def _fast_forecast(values: np.ndarray, threshold: float,
+                   lookback_periods: int) -> Optional[ForecastResult]:
+    """
+    异常预测的快速路径
+    
+    以最后一个值之前的lookback_periods个点计算均值和标准差，最后一个值的
+    z分数小于threshold的一半时视为明显正常，直接以均值作为预期值、
+    均值±threshold倍标准差作为预期范围，不再拟合预测模型。回看窗口少于2个点
+    或标准差为0时无法估计波动范围，不使用快速路径。
+    
+    预测模型带有加性趋势项，历史值存在显著线性趋势时（斜率的t统计量不小于
+    FAST_PATH_MAX_TREND_T）窗口均值不能代表预测值，同样不使用快速路径。
+    
+    参数:
+        values (np.ndarray): 历史值数组，最后一个值为待检测值
+        threshold (float): 异常阈值
+        lookback_periods (int): 回看周期数
+        
+    返回:
+        Optional[ForecastResult]: 明显正常时返回近似预测结果，否则返回None
+    """
+    tail = values[-lookback_periods - 1:-1]
+    if tail.size < 2 or _has_trend(values[:-1]):
+        return None
+    
+    mean = float(tail.mean())
+    std = float(tail.std())
+    if std == 0 or abs(float(values[-1]) - mean) / std >= threshold * 0.5:
+        return None
+    
+    margin = threshold * std
+    return ForecastResult(
+        pred=np.array([mean]),
+        lower=np.array([mean - margin]),
+        upper=np.array([mean + margin]),
+        periods=["T+1"]
+    )
+
+
+@run_async(timeout=60)  # 设置超时时间为60秒
+def _forecast_task(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    异步预测任务
+    
+    参数:
+        data (Dict[str, Any]): 预测请求数据
+        
+    返回:
+        Dict[str, Any]: 预测结果
+    """
+    return predictor.analyze(data)
+
+
 @router.post('/forecast')
-@rate_limit
-@validate_json_request
-@Validator.validate_request(prediction_schema)
+@prediction_route(prediction_schema)
 async def forecast(request: Request, auth: bool = Depends(token_required)):
     """
     预测未来值
@@ -107,29 +281,28 @@ async def forecast(request: Request, auth: bool = Depends(token_required)):
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到预测请求: {json.dumps(data, ensure_ascii=False)}")
+        if forecast_log.isEnabledFor(logging.INFO):
+            forecast_log.info("接收到预测请求: %d个历史值", len(data.get("values", ())))
         
         # 预测
         prediction_result = predictor.analyze(data)
         
         # 返回结果
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=prediction_result,
             message="预测分析成功"
         ))
     
     except Exception as e:
         # 记录错误
-        logger.error(f"预测分析异常: {str(e)}", exc_info=True)
+        forecast_log.error("预测分析异常: %s", e, exc_info=True)
         
         # 返回错误响应
         raise HTTPException(status_code=500, detail=f"预测分析失败: {str(e)}")
 
 
 @router.post('/forecast-async')
-@rate_limit
-@validate_json_request
-@Validator.validate_request(prediction_schema)
+@prediction_route(prediction_schema)
 async def forecast_async(request: Request, auth: bool = Depends(token_required)):
     """
     异步预测未来值
@@ -141,19 +314,14 @@ async def forecast_async(request: Request, auth: bool = Depends(token_required))
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到异步预测请求: {json.dumps(data, ensure_ascii=False)}")
-        
-        # 创建异步任务
-        @run_async(timeout=60)  # 设置超时时间为60秒
-        def forecast_task(data):
-            # 预测分析
-            return predictor.analyze(data)
+        if forecast_async_log.isEnabledFor(logging.INFO):
+            forecast_async_log.info("接收到异步预测请求: %d个历史值", len(data.get("values", ())))
         
         # 启动异步任务
-        task_result = forecast_task(data)
+        task_result = _forecast_task(data)
         
         # 返回任务信息
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=task_result,
             message="预测分析任务已提交",
             status_code=202
@@ -161,16 +329,14 @@ async def forecast_async(request: Request, auth: bool = Depends(token_required))
     
     except Exception as e:
         # 记录错误
-        logger.error(f"提交预测分析任务异常: {str(e)}", exc_info=True)
+        forecast_async_log.error("提交预测分析任务异常: %s", e, exc_info=True)
         
         # 返回错误响应
         raise HTTPException(status_code=500, detail=f"提交预测分析任务失败: {str(e)}")
 
 
 @router.post('/anomaly')
-@rate_limit
-@validate_json_request
-@Validator.validate_request(anomaly_prediction_schema)
+@prediction_route(anomaly_prediction_schema)
 async def predict_anomaly(request: Request, auth: bool = Depends(token_required)):
     """
     预测异常可能性
@@ -182,10 +348,11 @@ async def predict_anomaly(request: Request, auth: bool = Depends(token_required)
         data = await request.json()
         
         # 记录请求
-        logger.info(f"接收到异常预测请求: {json.dumps(data, ensure_ascii=False)}")
+        if anomaly_log.isEnabledFor(logging.INFO):
+            anomaly_log.info("接收到异常预测请求: %d个历史值", len(data.get("values", ())))
         
-        # 获取历史值
-        values = data["values"]
+        # 获取历史值，转换为数组后切片不再复制数据
+        values = np.asarray(data["values"], dtype=np.float64)
         threshold = data.get("threshold", 1.5)
         lookback_periods = data.get("lookback_periods", 3)
         
@@ -196,38 +363,38 @@ async def predict_anomaly(request: Request, auth: bool = Depends(token_required)
                 detail=f"历史数据点不足，至少需要 {lookback_periods + 1} 个数据点"
             )
         
-        # 为异常预测准备数据
-        forecast_data = {
-            "values": values[:-1],  # 除最后一个点外的所有点
-            "target_periods": 1
-        }
+        last_value = float(values[-1])
         
-        # 执行预测
-        prediction_result = predictor.analyze(forecast_data)
+        # 快速路径: 最后一个值明显落在近期波动范围内时，跳过时间序列模型拟合
+        forecast_result = _fast_forecast(values, threshold, lookback_periods)
+        if forecast_result is None:
+            # 以除最后一个点外的所有点预测下一个值
+            forecast_result = predictor.forecast(values[:-1], periods=1)
         
         # 增加异常检测结果
-        last_value = values[-1]
-        predicted_value = prediction_result["预测结果"]["预测值"][0]
-        confidence_intervals = prediction_result["预测结果"]["置信区间"][0]
-        
-        lower_bound = confidence_intervals["下限"]
-        upper_bound = confidence_intervals["上限"]
+        predicted_value = float(forecast_result.pred[0])
+        lower_bound = float(forecast_result.lower[0])
+        upper_bound = float(forecast_result.upper[0])
         
         # 判断是否异常
         is_anomaly = last_value < lower_bound or last_value > upper_bound
-        anomaly_degree = 0
         
+        # 计算异常程度: 超出区间的距离与预期值到区间边界距离之比，边界与预期值重合时为1
+        anomaly_degree = 0.0
         if is_anomaly:
             if last_value < lower_bound:
-                anomaly_degree = (lower_bound - last_value) / (predicted_value - lower_bound) if predicted_value != lower_bound else 1.0
+                denominator = predicted_value - lower_bound
+                anomaly_degree = (lower_bound - last_value) / denominator if denominator != 0 else 1.0
             else:
-                anomaly_degree = (last_value - upper_bound) / (upper_bound - predicted_value) if upper_bound != predicted_value else 1.0
+                denominator = upper_bound - predicted_value
+                anomaly_degree = (last_value - upper_bound) / denominator if denominator != 0 else 1.0
+        anomaly_degree = min(max(anomaly_degree, 0.0), 5.0)  # 限制在0-5之间
         
         # 构建结果
         anomaly_result = {
             "异常检测": {
                 "是否异常": is_anomaly,
-                "异常程度": min(max(anomaly_degree, 0), 5),  # 限制在0-5之间
+                "异常程度": anomaly_degree,
                 "当前值": last_value,
                 "预期值": predicted_value,
                 "预期范围": {
@@ -235,18 +402,18 @@ async def predict_anomaly(request: Request, auth: bool = Depends(token_required)
                     "上限": upper_bound
                 }
             },
-            "预测结果": prediction_result["预测结果"]
+            "预测结果": forecast_result.to_cn_dict()
         }
         
         # 返回结果
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=anomaly_result,
             message="异常预测分析成功"
         ))
     
     except Exception as e:
         # 记录错误
-        logger.error(f"异常预测分析异常: {str(e)}", exc_info=True)
+        anomaly_log.error("异常预测分析异常: %s", e, exc_info=True)
         
         # 返回错误响应
         raise HTTPException(status_code=500, detail=f"异常预测分析失败: {str(e)}")
@@ -261,8 +428,8 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
         task_id (str): 任务ID
     """
     try:
-        # 获取任务
-        task_info = task_manager.get_task_info(task_id)
+        # 一次获取任务信息和结果
+        task_info, result = task_manager.get_task_state(task_id)
         
         # 检查任务是否存在
         if not task_info:
@@ -276,10 +443,7 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
         
         # 根据状态返回不同的响应
         if status == "completed":
-            # 获取任务结果
-            result = task_manager.get_task_result(task_id)
-            
-            return JSONResponse(content=format_success_response(
+            return ORJSONResponse(content=format_success_response(
                 data=result,
                 message="预测分析完成"
             ))
@@ -300,7 +464,7 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
             )
             
         else:  # pending or running
-            return JSONResponse(content=format_success_response(
+            return ORJSONResponse(content=format_success_response(
                 data=task_info,
                 message=f"预测分析任务{task_info['status']}中",
                 status_code=202
@@ -310,7 +474,7 @@ async def get_task_result(request: Request, task_id: str, auth: bool = Depends(t
         raise
     except Exception as e:
         # 记录错误
-        logger.error(f"获取预测分析任务结果异常: {str(e)}", exc_info=True)
+        task_log.error("获取预测分析任务结果异常: %s", e, exc_info=True)
         
         # 返回错误响应
         raise HTTPException(status_code=500, detail=f"获取预测分析任务结果失败: {str(e)}") 
\ No newline at end of file
@@ -9,10 +9,11 @@
 """
 
 import logging
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, Request, Depends, HTTPException, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from data_insight.api.middlewares.auth import token_required
 from data_insight.api.middlewares.rate_limiter import rate_limit
@@ -27,12 +28,55 @@ router = APIRouter(tags=["智能建议"])
 # 创建日志记录器
 logger = logging.getLogger(__name__)
 
+# 按路由预先绑定上下文的日志适配器
+suggestion_log = logging.LoggerAdapter(logger, {"route": "suggestion"})
+sample_log = logging.LoggerAdapter(logger, {"route": "suggestion_sample"})
+
 # 创建建议生成器实例
 suggestion_generator = SuggestionGenerator()
 
 
+@lru_cache(maxsize=128)
+def _get_generator(min_confidence: float, max_suggestions: int, priority_threshold: float) -> SuggestionGenerator:
+    """
+    获取指定配置的建议生成器
+    
+    建议生成器除这三个配置外不保存请求状态，相同配置的请求共用同一个实例。
+    
+    参数:
+        min_confidence (float): 建议的最小置信度阈值
+        max_suggestions (int): 每个维度最多生成的建议数量
+        priority_threshold (float): 高优先级建议的阈值
+        
+    返回:
+        SuggestionGenerator: 建议生成器实例
+    """
+    return SuggestionGenerator(
+        min_confidence=min_confidence,
+        max_suggestions=max_suggestions,
+        priority_threshold=priority_threshold
+    )
+
+
+def _high_priority_ratio(suggestion_results: Dict[str, Any]) -> float:
+    """
+    计算高优先级建议的比例
+    
+    参数:
+        suggestion_results (Dict[str, Any]): 建议生成结果
+        
+    返回:
+        float: 高优先级建议占全部建议的比例，没有建议时为0
+    """
+    total = suggestion_results["建议数量"]
+    return suggestion_results["高优先级建议数"] / total if total else 0
+
+
 class SuggestionRequest(BaseModel):
     """智能建议请求模型"""
+    # 请求模型只读，未声明的字段直接忽略
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     metric_analysis: Dict[str, Any]
     chart_analysis: Optional[Dict[str, Any]] = None
     attribution_analysis: Optional[Dict[str, Any]] = None
@@ -43,6 +87,84 @@ class SuggestionRequest(BaseModel):
     priority_threshold: Optional[float] = 0.7
 
 
+# 示例分析数据
+SAMPLE_DATA = {
+    "metric_analysis": {
+        "基本信息": {
+            "指标名称": "销售额",
+            "当前值": 12000,
+            "上一期值": 10000,
+            "单位": "元"
+        },
+        "变化分析": {
+            "变化量": 2000,
+            "变化率": 0.2,
+            "变化类别": "显著上升",
+            "变化方向": "上升"
+        },
+        "异常分析": {
+            "是否异常": False,
+            "异常程度": 0.0,
+            "异常类型": ""
+        }
+    },
+    "chart_analysis": {
+        "基本信息": {
+            "图表标题": "月度销售趋势",
+            "图表类型": "line"
+        },
+        "趋势分析": {
+            "趋势类型": "上升",
+            "趋势强度": 0.65
+        },
+        "异常点分析": [
+            {
+                "位置": 3,
+                "异常程度": 1.2,
+                "异常描述": "轻微异常"
+            }
+        ]
+    },
+    "root_cause_analysis": {
+        "目标指标": "销售额",
+        "根因列表": [
+            {
+                "根因描述": "促销活动效果显著",
+                "根因类型": "营销活动",
+                "影响程度": 0.75
+            },
+            {
+                "根因描述": "市场需求增加",
+                "根因类型": "市场因素",
+                "影响程度": 0.45
+            }
+        ]
+    }
+}
+
+
+@lru_cache(maxsize=1)
+def _sample_response_body() -> Dict[str, Any]:
+    """
+    生成示例建议的响应数据
+    
+    示例数据是常量，建议只在首次请求时生成一次，之后的请求直接复用。
+    
+    返回:
+        Dict[str, Any]: 示例建议响应数据
+    """
+    suggestion_results = suggestion_generator.analyze(SAMPLE_DATA)
+    
+    return {
+        "suggestions": suggestion_results["建议列表"],
+        "overall_effect": suggestion_results["总体效果"],
+        "suggestion_count": suggestion_results["建议数量"],
+        "high_priority_count": suggestion_results["高优先级建议数"],
+        "high_priority_ratio": _high_priority_ratio(suggestion_results),
+        "sample_data": SAMPLE_DATA
+    }
+
+
 @router.post("", summary="生成智能建议",
            description="基于多维度分析结果生成智能行动建议")
 @rate_limit
@@ -62,11 +184,11 @@ async def generate_suggestions(request: SuggestionRequest) -> Dict[str, Any]:
     increment_request_count("/suggestion", "POST", 200)
     
     try:
-        # 创建自定义建议生成器（使用请求参数覆盖默认配置）
-        custom_generator = SuggestionGenerator(
-            min_confidence=request.min_confidence,
-            max_suggestions=request.max_suggestions,
-            priority_threshold=request.priority_threshold
+        # 获取自定义建议生成器（使用请求参数覆盖默认配置）
+        custom_generator = _get_generator(
+            request.min_confidence,
+            request.max_suggestions,
+            request.priority_threshold
         )
         
         # 准备分析数据
@@ -91,7 +213,7 @@ async def generate_suggestions(request: SuggestionRequest) -> Dict[str, Any]:
         suggestion_results = custom_generator.analyze(analysis_data)
         
         # 计算高优先级建议的比例
-        high_priority_ratio = len([s for s in suggestion_results["建议列表"] if s["优先级"] == "高"]) / len(suggestion_results["建议列表"]) if suggestion_results["建议列表"] else 0
+        high_priority_ratio = _high_priority_ratio(suggestion_results)
         
         # 格式化响应
         return format_success_response(
@@ -107,7 +229,7 @@ async def generate_suggestions(request: SuggestionRequest) -> Dict[str, Any]:
         )
         
     except ValueError as e:
-        logger.error(f"建议生成失败: {str(e)}", exc_info=True)
+        suggestion_log.error("建议生成失败: %s", e, exc_info=True)
         return format_error_response(
             message="建议生成失败",
             status_code=400,
@@ -116,7 +238,7 @@ async def generate_suggestions(request: SuggestionRequest) -> Dict[str, Any]:
         )
     
     except Exception as e:
-        logger.error(f"建议生成失败: {str(e)}", exc_info=True)
+        suggestion_log.error("建议生成失败: %s", e, exc_info=True)
         return format_error_response(
             message="建议生成失败",
             status_code=500,
@@ -139,83 +261,15 @@ async def get_sample_suggestions() -> Dict[str, Any]:
     increment_request_count("/suggestion/sample", "GET", 200)
     
     try:
-        # 创建示例分析数据
-        sample_data = {
-            "metric_analysis": {
-                "基本信息": {
-                    "指标名称": "销售额",
-                    "当前值": 12000,
-                    "上一期值": 10000,
-                    "单位": "元"
-                },
-                "变化分析": {
-                    "变化量": 2000,
-                    "变化率": 0.2,
-                    "变化类别": "显著上升",
-                    "变化方向": "上升"
-                },
-                "异常分析": {
-                    "是否异常": False,
-                    "异常程度": 0.0,
-                    "异常类型": ""
-                }
-            },
-            "chart_analysis": {
-                "基本信息": {
-                    "图表标题": "月度销售趋势",
-                    "图表类型": "line"
-                },
-                "趋势分析": {
-                    "趋势类型": "上升",
-                    "趋势强度": 0.65
-                },
-                "异常点分析": [
-                    {
-                        "位置": 3,
-                        "异常程度": 1.2,
-                        "异常描述": "轻微异常"
-                    }
-                ]
-            },
-            "root_cause_analysis": {
-                "目标指标": "销售额",
-                "根因列表": [
-                    {
-                        "根因描述": "促销活动效果显著",
-                        "根因类型": "营销活动",
-                        "影响程度": 0.75
-                    },
-                    {
-                        "根因描述": "市场需求增加",
-                        "根因类型": "市场因素",
-                        "影响程度": 0.45
-                    }
-                ]
-            }
-        }
-        
-        # 生成建议
-        suggestion_results = suggestion_generator.analyze(sample_data)
-        
-        # 计算高优先级建议的比例
-        high_priority_ratio = len([s for s in suggestion_results["建议列表"] if s["优先级"] == "高"]) / len(suggestion_results["建议列表"]) if suggestion_results["建议列表"] else 0
-        
         # 格式化响应
         return format_success_response(
-            data={
-                "suggestions": suggestion_results["建议列表"],
-                "overall_effect": suggestion_results["总体效果"],
-                "suggestion_count": suggestion_results["建议数量"],
-                "high_priority_count": suggestion_results["高优先级建议数"],
-                "high_priority_ratio": high_priority_ratio,
-                "sample_data": sample_data
-            },
+            data=_sample_response_body(),
             message="示例建议生成成功",
             status_code=200
         )
         
     except Exception as e:
-        logger.error(f"示例建议生成失败: {str(e)}", exc_info=True)
+        sample_log.error("示例建议生成失败: %s", e, exc_info=True)
         return format_error_response(
             message="示例建议生成失败",
             status_code=500,
@@ -8,73 +8,270 @@
 提供时间序列数据趋势分析相关的 API 路由，包括趋势检测、季节性分析和拐点检测等功能。
 """
 
+import asyncio
+import hashlib
+import itertools
 import json
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import operator
+import os
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
+from cachetools import LRUCache
 from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 
-from data_insight.core.trend_analyzer import TrendAnalyzer
+from data_insight.api.routes._analyzers import get_trend_analyzer
 from data_insight.models.insight_model import TrendResult
 from data_insight.api.utils.response_formatter import format_success_response, format_error_response
-from data_insight.api.middlewares.rate_limiter import rate_limit
 from data_insight.api.middlewares.auth import token_required
-from data_insight.api.utils.request_validator import validate_request_data
+from data_insight.api.utils.request_validator import build_validator
+from data_insight.api.utils.async_task import get_process_pool
+from data_insight.api.utils.json_utils import dumps
+from data_insight.api.utils.responses import ORJSONResponse, JSON_MIMETYPE
 
 # 创建路由器
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
+# 请求体大小和单个序列数据点数上限，在解析JSON和执行分析之前检查
+MAX_BODY_BYTES = int(os.environ.get('TREND_MAX_BODY_BYTES', 4 * 1024 * 1024))
+MAX_POINTS = int(os.environ.get('TREND_MAX_POINTS', 100000))
 
-def _calculate_trend_similarity(trend_results: List[TrendResult]) -> float:
+# 请求字段验证函数和支持的趋势分析方法
+_validate_analyze_request = build_validator({
+    "metric_name": {"required": True},
+    "values": {"required": True},
+    "timestamps": {"required": True},
+})
+_validate_metric = build_validator({
+    "name": {"required": True},
+    "values": {"required": True},
+    "timestamps": {"required": True},
+})
+_TREND_METHODS = frozenset(("auto", "linear", "exponential", "lowess"))
+
+# 单指标趋势结果缓存: (指标名, 分析参数, 值和时间戳摘要) -> TrendResult，重复查询同一指标时直接复用
+TREND_CACHE_SIZE = 1024
+_trend_cache: LRUCache = LRUCache(maxsize=TREND_CACHE_SIZE)
+_trend_cache_lock = threading.Lock()
+
+# 趋势模式名称到中文描述的映射，波动类模式统一描述为"波动"，未列出的模式为"平稳"
+_PATTERN_NAMES = {
+    "LINEAR_INCREASE": "线性增长",
+    "LINEAR_DECREASE": "线性下降",
+    "FLUCTUATING": "波动",
+    "FLUCTUATING_INCREASE": "波动",
+    "FLUCTUATING_DECREASE": "波动"
+}
+
+# 拐点响应字段，属性由attrgetter一次取出
+_INFLECTION_KEYS = ("date", "index", "value", "type", "strength")
+_get_inflection_fields = operator.attrgetter(*_INFLECTION_KEYS)
+
+# 拐点数量达到该值时流式输出响应，拐点按批编码
+INFLECTION_STREAM_MIN = 1000
+INFLECTION_STREAM_BATCH = 1000
+
+# 分析ID的时间部分按秒缓存为(秒, 格式化字符串)，序号保证同一秒内ID唯一
+_analysis_id_second = (0, "")
+_analysis_id_counter = itertools.count()
+
+
+def _make_analysis_id(prefix: str) -> str:
+    """
+    生成分析ID
+    
+    同一秒内只格式化一次时间，格式为"{prefix}-YYYYmmdd-HHMMSS-{序号}"。
+    
+    参数:
+        prefix (str): ID前缀
+        
+    返回:
+        str: 分析ID
+    """
+    global _analysis_id_second
+    
+    second = int(time.time())
+    cached_second, formatted = _analysis_id_second
+    if second != cached_second:
+        formatted = time.strftime('%Y%m%d-%H%M%S', time.localtime(second))
+        _analysis_id_second = (second, formatted)
+    
+    return f"{prefix}-{formatted}-{next(_analysis_id_counter)}"
+
+
+def _analyze_metric_group(metric_names: List[str], values_list: List[List[float]],
+                          timestamps: List[str], trend_method: str, seasonality: bool,
+                          detect_inflections: bool) -> List[TrendResult]:
+    """
+    分析共享同一组时间戳的多个指标的趋势
+    
+    模块级函数，可序列化后在进程池中执行，每个工作进程复用各自的共享分析器。
+    
+    参数:
+        metric_names (List[str]): 指标名称列表
+        values_list (List[List[float]]): 各指标的值列表
+        timestamps (List[str]): 共享的时间戳列表
+        trend_method (str): 趋势分析方法
+        seasonality (bool): 是否分析季节性
+        detect_inflections (bool): 是否检测拐点
+        
+    返回:
+        List[TrendResult]: 与metric_names顺序一致的趋势分析结果列表
+    """
+    return get_trend_analyzer().analyze_batch(
+        metric_names=metric_names,
+        values_list=values_list,
+        timestamps=timestamps,
+        trend_method=trend_method,
+        seasonality=seasonality,
+        detect_inflections=detect_inflections
+    )
+
+
+def _trend_cache_key(metric_name: str, values: List[float], timestamps: List[str],
+                     trend_method: str, seasonality: bool, detect_inflections: bool) -> tuple:
+    """
+    计算单指标趋势结果的缓存键
+    
+    参数:
+        metric_name (str): 指标名称
+        values (List[float]): 指标值列表
+        timestamps (List[str]): 时间戳列表
+        trend_method (str): 趋势分析方法
+        seasonality (bool): 是否分析季节性
+        detect_inflections (bool): 是否检测拐点
+        
+    返回:
+        tuple: 缓存键
+    """
+    digest = hashlib.blake2b(dumps([values, timestamps]), digest_size=16).digest()
+    return (metric_name, trend_method, seasonality, detect_inflections, digest)
+
+
+def _check_content_length(request: Request) -> None:
+    """
+    在解析JSON之前检查请求体大小
+    
+    参数:
+        request (Request): 请求对象
+        
+    异常:
+        HTTPException: 请求体超过MAX_BODY_BYTES时返回413
+    """
+    try:
+        content_length = int(request.headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="无效的Content-Length")
+    
+    if content_length > MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail=f"请求体过大，最大允许{MAX_BODY_BYTES}字节")
+
+
+def _iter_analysis_json(envelope: Dict[str, Any], inflections: Sequence[Any]) -> Iterator[bytes]:
+    """
+    分块生成趋势分析响应的JSON字节串
+    
+    拐点列表追加到envelope["data"]的末尾，每批INFLECTION_STREAM_BATCH个拐点
+    在编码前才构造字典，编码和发送交替进行。
+    
+    参数:
+        envelope (Dict[str, Any]): 格式化后的响应，data中不含拐点
+        inflections (Sequence[Any]): 拐点对象列表
+        
+    返回:
+        Iterator[bytes]: JSON字节块
+    """
+    yield b'{'
+    for i, (key, value) in enumerate(envelope.items()):
+        yield (b',' if i else b'') + dumps(key) + b':'
+        if key != "data":
+            yield dumps(value)
+            continue
+        
+        # 去掉data对象的右括号，接着输出拐点数组
+        yield dumps(value)[:-1] + (b',' if value else b'') + b'"inflections":['
+        for start in range(0, len(inflections), INFLECTION_STREAM_BATCH):
+            batch = dumps([
+                dict(zip(_INFLECTION_KEYS, _get_inflection_fields(inflection)))
+                for inflection in inflections[start:start + INFLECTION_STREAM_BATCH]
+            ])
+            yield (b',' if start else b'') + batch[1:-1]
+        yield b']}'
+    yield b'}'
+
+
+def _count_trend_matches(trend_results: List[TrendResult]) -> Tuple[int, int]:
+    """
+    统计与第一个趋势方向相同和模式相同的趋势数量
+    
+    一次遍历得到的计数同时用于相似度计算和差异、摘要描述，
+    计数等于趋势数量即表示全部一致。
+    
+    参数:
+        trend_results (List[TrendResult]): 趋势分析结果列表
+        
+    返回:
+        Tuple[int, int]: (方向匹配数, 模式匹配数)
+    """
+    if not trend_results:
+        return 0, 0
+    
+    # 获取第一个趋势的方向和模式
+    first_trend = trend_results[0].trend
+    first_direction = first_trend.direction
+    first_pattern = first_trend.pattern
+    
+    direction_matches = pattern_matches = 0
+    for r in trend_results:
+        trend = r.trend
+        direction_matches += trend.direction == first_direction
+        pattern_matches += trend.pattern == first_pattern
+    
+    return direction_matches, pattern_matches
+
+
+def _calculate_trend_similarity(trend_results: List[TrendResult], matches: Tuple[int, int]) -> float:
     """计算趋势相似度"""
     # 简化版：比较方向和模式的相似度
     if not trend_results or len(trend_results) < 2:
         return 0.0
     
-    # 获取第一个趋势的方向和模式
-    first_direction = trend_results[0].trend.direction
-    first_pattern = trend_results[0].trend.pattern
-    
-    # 计算方向和模式匹配的比例
-    direction_matches = sum(1 for r in trend_results if r.trend.direction == first_direction)
-    pattern_matches = sum(1 for r in trend_results if r.trend.pattern == first_pattern)
-    
     # 计算总体相似度
-    similarity = 0.5 * (direction_matches / len(trend_results)) + 0.5 * (pattern_matches / len(trend_results))
-    
-    return similarity
+    direction_matches, pattern_matches = matches
+    return 0.5 * (direction_matches + pattern_matches) / len(trend_results)
 
 
-def _generate_trend_differences(trend_results: List[TrendResult]) -> List[str]:
+def _generate_trend_differences(trend_results: List[TrendResult], metric_names: List[str],
+                                same_pattern: bool) -> List[str]:
     """生成趋势差异点描述"""
     differences = []
     
     # 比较斜率
-    slopes = [r.trend.slope for r in trend_results]
-    metric_names = [r.trend.metric_name for r in trend_results]
-    
-    slope_description = "、".join([f"{name}增长率为{slope}/月" for name, slope in zip(metric_names, slopes)])
+    slope_description = "、".join(
+        "%s增长率为%s/月" % (name, r.trend.slope) for name, r in zip(metric_names, trend_results)
+    )
     differences.append(slope_description)
     
     # 比较模式
     patterns = [r.trend.pattern for r in trend_results]
-    if all(p == patterns[0] for p in patterns):
-        pattern_name = "线性增长" if "LINEAR_INCREASE" in str(patterns[0]) else \
-                        "线性下降" if "LINEAR_DECREASE" in str(patterns[0]) else \
-                        "波动" if "FLUCTUATING" in str(patterns[0]) else \
-                        "平稳"
+    if same_pattern:
+        pattern_name = _PATTERN_NAMES.get(getattr(patterns[0], "name", patterns[0]), "平稳")
         differences.append(f"所有指标均呈{pattern_name}趋势")
     else:
-        pattern_description = "、".join([f"{name}呈{pattern}趋势" for name, pattern in zip(metric_names, patterns)])
+        pattern_description = "、".join(
+            "%s呈%s趋势" % (name, pattern) for name, pattern in zip(metric_names, patterns)
+        )
         differences.append(f"指标趋势模式不同: {pattern_description}")
     
     return differences
 
 
-def _generate_comparison_summary(trend_results: List[TrendResult], similarity: float) -> str:
+def _generate_comparison_summary(trend_results: List[TrendResult], metric_names: List[str],
+                                 similarity: float, same_direction: bool) -> str:
     """生成趋势对比摘要"""
-    metric_names = [r.trend.metric_name for r in trend_results]
     metric_list = "、".join(metric_names)
     
     if similarity > 0.8:
@@ -85,11 +282,11 @@ def _generate_comparison_summary(trend_results: List[TrendResult], similarity: f
         similarity_desc = "差异较大"
     
     # 获取趋势方向
-    directions = [r.trend.direction for r in trend_results]
-    if all(d == directions[0] for d in directions):
-        if directions[0] == "上升":
+    if same_direction:
+        direction = trend_results[0].trend.direction
+        if direction == "上升":
             direction_desc = "均呈现上升趋势"
-        elif directions[0] == "下降":
+        elif direction == "下降":
             direction_desc = "均呈现下降趋势"
         else:
             direction_desc = "均呈现平稳趋势"
@@ -101,7 +298,6 @@ def _generate_comparison_summary(trend_results: List[TrendResult], similarity: f
 
 
 @router.post('/analyze')
-@rate_limit
 async def analyze_trend(request: Request, auth: bool = Depends(token_required)):
     """
     趋势分析 API
@@ -119,6 +315,8 @@ async def analyze_trend(request: Request, auth: bool = Depends(token_required)):
         "detect_inflections": true
     }
     """
+    _check_content_length(request)
+    
     try:
         # 获取请求数据
         data = await request.json()
@@ -126,8 +324,7 @@ async def analyze_trend(request: Request, auth: bool = Depends(token_required)):
             raise HTTPException(status_code=400, detail="请求体不能为空")
         
         # 验证请求数据
-        required_fields = ["metric_name", "values", "timestamps"]
-        validate_request_data(data, required_fields)
+        _validate_analyze_request(data)
         
         # 验证数据长度
         if len(data["values"]) != len(data["timestamps"]):
@@ -136,71 +333,100 @@ async def analyze_trend(request: Request, auth: bool = Depends(token_required)):
         if len(data["values"]) < 3:
             raise HTTPException(status_code=400, detail="趋势分析至少需要3个数据点")
         
-        # 创建分析器实例
-        analyzer = TrendAnalyzer()
+        if len(data["values"]) > MAX_POINTS:
+            raise HTTPException(status_code=413, detail=f"趋势分析最多支持{MAX_POINTS}个数据点")
+        
+        # 共享的分析器实例
+        analyzer = get_trend_analyzer()
         
         # 设置趋势分析方法
         trend_method = data.get("trend_method", "auto")
-        if trend_method not in ["auto", "linear", "exponential", "lowess"]:
+        if trend_method not in _TREND_METHODS:
             trend_method = "auto"
         
-        # 执行分析
-        result = analyzer.analyze(
-            metric_name=data["metric_name"],
-            values=data["values"],
-            timestamps=data["timestamps"],
-            trend_method=trend_method,
-            seasonality=data.get("seasonality", True),
-            detect_inflections=data.get("detect_inflections", True)
-        )
+        seasonality = data.get("seasonality", True)
+        detect_inflections = data.get("detect_inflections", True)
+        cache_key = _trend_cache_key(data["metric_name"], data["values"], data["timestamps"],
+                                     trend_method, seasonality, detect_inflections)
+        
+        with _trend_cache_lock:
+            result = _trend_cache.get(cache_key)
+        
+        # 缓存未命中时执行分析
+        if result is None:
+            result = analyzer.analyze(
+                metric_name=data["metric_name"],
+                values=data["values"],
+                timestamps=data["timestamps"],
+                trend_method=trend_method,
+                seasonality=seasonality,
+                detect_inflections=detect_inflections
+            )
+            with _trend_cache_lock:
+                _trend_cache[cache_key] = result
         
         # 生成分析ID
-        analysis_id = f"tr-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        analysis_id = _make_analysis_id("tr")
         
         # 格式化响应
+        trend_data = {
+            "metric_name": result.trend.metric_name,
+            "direction": result.trend.direction,
+            "slope": result.trend.slope,
+            "significance": result.trend.significance,
+            "r_squared": result.trend.r_squared,
+            "pattern": str(result.trend.pattern),
+            "method": result.trend.method,
+            "has_seasonality": result.trend.has_seasonality,
+            "seasonality_strength": result.trend.seasonality_strength,
+            "seasonality_pattern": result.trend.seasonality_pattern
+        }
+        
+        # 拐点较多时流式输出，避免一次性构造和编码整个响应
+        if len(result.inflections) >= INFLECTION_STREAM_MIN:
+            envelope = format_success_response(
+                data={
+                    "trend": trend_data,
+                    "summary": result.summary,
+                    "analysis_id": analysis_id
+                },
+                message="趋势分析完成"
+            )
+            return StreamingResponse(
+                _iter_analysis_json(envelope, result.inflections),
+                media_type=JSON_MIMETYPE
+            )
+        
         response_data = {
-            "trend": {
-                "metric_name": result.trend.metric_name,
-                "direction": result.trend.direction,
-                "slope": result.trend.slope,
-                "significance": result.trend.significance,
-                "r_squared": result.trend.r_squared,
-                "pattern": str(result.trend.pattern),
-                "method": result.trend.method,
-                "has_seasonality": result.trend.has_seasonality,
-                "seasonality_strength": result.trend.seasonality_strength,
-                "seasonality_pattern": result.trend.seasonality_pattern
-            },
+            "trend": trend_data,
             "inflections": [
-                {
-                    "date": inflection.date,
-                    "index": inflection.index,
-                    "value": inflection.value,
-                    "type": inflection.type,
-                    "strength": inflection.strength
-                } for inflection in result.inflections
+                dict(zip(_INFLECTION_KEYS, _get_inflection_fields(inflection)))
+                for inflection in result.inflections
             ],
             "summary": result.summary,
             "analysis_id": analysis_id
         }
         
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="趋势分析完成"
         ))
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"分析过程中发生错误: {str(e)}")
 
 
 @router.post('/compare')
-@rate_limit
 async def compare_trends(request: Request, auth: bool = Depends(token_required)):
     """
     趋势对比 API
     
     对比多个指标的趋势特征，分析它们之间的相似性和差异性
     """
+    _check_content_length(request)
+    
     try:
         # 获取请求数据
         data = await request.json()
@@ -214,41 +440,86 @@ async def compare_trends(request: Request, auth: bool = Depends(token_required))
         if len(data["metrics"]) < 2:
             raise HTTPException(status_code=400, detail="至少需要两个指标进行对比")
         
-        # 创建分析器实例
-        analyzer = TrendAnalyzer()
-        
-        # 分析每个指标的趋势
-        trend_results = []
-        for metric in data["metrics"]:
-            # 验证指标数据
-            required_fields = ["name", "values", "timestamps"]
-            validate_request_data(metric, required_fields)
-            
-            if len(metric["values"]) != len(metric["timestamps"]):
-                raise HTTPException(status_code=400, detail=f"指标 {metric['name']} 的值列表与时间戳列表长度不一致")
-            
-            if len(metric["values"]) < 3:
-                raise HTTPException(status_code=400, detail=f"指标 {metric['name']} 至少需要3个数据点")
-            
-            # 分析趋势
-            result = analyzer.analyze(
-                metric_name=metric["name"],
-                values=metric["values"],
-                timestamps=metric["timestamps"],
-                trend_method=data.get("trend_method", "auto"),
-                seasonality=data.get("seasonality", True),
-                detect_inflections=data.get("detect_inflections", True)
-            )
-            trend_results.append(result)
+        # 先验证全部指标数据，再并行分析
+        metrics = data["metrics"]
+        for metric in metrics:
+            _validate_metric(metric)
+        
+        # 一次性检查所有指标的序列长度，出错时报告第一个不符合要求的指标
+        count = len(metrics)
+        value_lengths = np.fromiter((len(m["values"]) for m in metrics), dtype=np.int64, count=count)
+        timestamp_lengths = np.fromiter((len(m["timestamps"]) for m in metrics), dtype=np.int64, count=count)
+        
+        mismatched = np.flatnonzero(value_lengths != timestamp_lengths)
+        if mismatched.size:
+            name = metrics[mismatched[0]]['name']
+            raise HTTPException(status_code=400, detail=f"指标 {name} 的值列表与时间戳列表长度不一致")
+        
+        too_short = np.flatnonzero(value_lengths < 3)
+        if too_short.size:
+            name = metrics[too_short[0]]['name']
+            raise HTTPException(status_code=400, detail=f"指标 {name} 至少需要3个数据点")
+        
+        too_long = np.flatnonzero(value_lengths > MAX_POINTS)
+        if too_long.size:
+            name = metrics[too_long[0]]['name']
+            raise HTTPException(status_code=413, detail=f"指标 {name} 最多支持{MAX_POINTS}个数据点")
+        
+        trend_method = data.get("trend_method", "auto")
+        seasonality = data.get("seasonality", True)
+        detect_inflections = data.get("detect_inflections", True)
+        
+        # 先从缓存取已分析过的指标
+        cache_keys = [
+            _trend_cache_key(m["name"], m["values"], m["timestamps"],
+                             trend_method, seasonality, detect_inflections)
+            for m in metrics
+        ]
+        with _trend_cache_lock:
+            trend_results = [_trend_cache.get(key) for key in cache_keys]
+        
+        # 未命中的指标按时间戳分组，同组指标共用一次时间戳解析；各组相互独立，分发到进程池并行计算
+        groups: Dict[tuple, List[int]] = {}
+        for i, metric in enumerate(metrics):
+            if trend_results[i] is None:
+                groups.setdefault(tuple(metric["timestamps"]), []).append(i)
+        
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        group_results = await asyncio.gather(*(
+            loop.run_in_executor(
+                pool, _analyze_metric_group,
+                [metrics[i]["name"] for i in indices],
+                [metrics[i]["values"] for i in indices],
+                metrics[indices[0]]["timestamps"],
+                trend_method, seasonality, detect_inflections
+            ) for indices in groups.values()
+        ))
+        
+        # 按请求中的指标顺序还原结果并写入缓存
+        with _trend_cache_lock:
+            for indices, results in zip(groups.values(), group_results):
+                for i, result in zip(indices, results):
+                    trend_results[i] = result
+                    _trend_cache[cache_keys[i]] = result
         
         # 计算趋势相似度
-        similarity = _calculate_trend_similarity(trend_results)
+        matches = _count_trend_matches(trend_results)
+        direction_matches, pattern_matches = matches
+        similarity = _calculate_trend_similarity(trend_results, matches)
+        
+        # 差异点描述和对比摘要共用指标名称列表
+        metric_names = [r.trend.metric_name for r in trend_results]
         
         # 生成差异点描述
-        differences = _generate_trend_differences(trend_results)
+        differences = _generate_trend_differences(
+            trend_results, metric_names, pattern_matches == len(trend_results)
+        )
         
         # 生成对比摘要
-        summary = _generate_comparison_summary(trend_results, similarity)
+        summary = _generate_comparison_summary(
+            trend_results, metric_names, similarity, direction_matches == len(trend_results)
+        )
         
         # 格式化响应
         response_data = {
@@ -264,13 +535,15 @@ async def compare_trends(request: Request, auth: bool = Depends(token_required))
             "similarity": similarity,
             "differences": differences,
             "summary": summary,
-            "analysis_id": f"tc-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+            "analysis_id": _make_analysis_id("tc")
         }
         
-        return JSONResponse(content=format_success_response(
+        return ORJSONResponse(content=format_success_response(
             data=response_data,
             message="趋势对比分析完成"
         ))
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"对比分析过程中发生错误: {str(e)}") 
\ No newline at end of file
@@ -5,23 +5,93 @@
 提供异步处理大数据量请求的功能。
 """
 
-import uuid
+import os
+import heapq
+import hmac
+import base64
+import struct
+import hashlib
+import secrets
+import itertools
 import time
 import threading
 import logging
-import traceback
 from typing import Dict, Any, Callable, List, Optional, Tuple
 from functools import wraps
+from collections import deque
 from enum import Enum
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger('async_task')
 
+# 计算密集型任务使用的进程池，首次使用时创建
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    获取共享的进程池
+    
+    进程数与CPU核数一致，用于执行不受GIL限制的计算密集型任务。
+    
+    返回:
+        ProcessPoolExecutor: 进程池
+    """
+    global _process_pool
+    
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """关闭共享的进程池，取消尚未开始执行的任务，不等待正在执行的任务"""
+    global _process_pool
+    
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class TaskTimeoutError(Exception):
+    """任务函数执行超时，任务状态记为超时而不是失败"""
+
+
+def _run_in_process_pool(func: Callable, *args, _deadline: Optional[float] = None, **kwargs) -> Any:
+    """
+    在进程池中执行函数并等待结果
+    
+    调用线程在等待期间一直占用任务线程池的一个线程，因此进程任务同样受
+    任务线程池大小和执行名额的限制。到达截止时间时取消子进程任务：尚未开始的
+    任务不再执行，已在子进程中运行的任务无法中断，其结果被丢弃，等待的线程随即释放。
+    
+    参数:
+        func (Callable): 要执行的函数，必须是可序列化的模块级函数
+        *args: 位置参数
+        _deadline (float, optional): 截止时间，单调时钟读数，默认一直等待
+        **kwargs: 关键字参数
+        
+    返回:
+        Any: 函数执行结果
+        
+    异常:
+        TaskTimeoutError: 到达截止时间仍未得到结果时
+    """
+    future = get_process_pool().submit(func, *args, **kwargs)
+    timeout = None if _deadline is None else max(_deadline - time.monotonic(), 0)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise TaskTimeoutError("进程任务执行超时")
+
 
 class TaskStatus(Enum):
     """任务状态枚举"""
@@ -34,9 +104,25 @@ class TaskStatus(Enum):
 
 
 class Task:
-    """异步任务类，表示一个异步处理的任务"""
+    """
+    异步任务类，表示一个异步处理的任务
+    
+    读取任务状态不加锁。_execute先写入result或error，最后写入status，读取方先读取status，
+    看到已完成或失败状态时，对应的结果和错误信息一定已经可用。
+    状态转换在_STATUS_LOCK中检查并写入：只有待处理的任务才会开始执行，
+    已取消或已超时的任务不会再被改写为已完成或失败。
+    """
+    
+    # 状态转换锁，所有任务共享，锁内只做状态检查和赋值
+    _STATUS_LOCK = threading.Lock()
     
-    def __init__(self, task_id: str, func: Callable, args: Tuple, kwargs: Dict[str, Any], timeout: int = 300):
+    __slots__ = (
+        'task_id', 'func', 'args', 'kwargs', 'status', 'result', 'error',
+        'start_time', 'end_time', '_mono_start', '_mono_end', 'timeout', 'future', 'on_finish'
+    )
+    
+    def __init__(self, task_id: str, func: Callable, args: Tuple, kwargs: Dict[str, Any], timeout: int = 300,
+                 on_finish: Optional[Callable[['Task'], None]] = None):
         """
         初始化任务
         
@@ -46,6 +132,7 @@ class Task:
             args (Tuple): 位置参数
             kwargs (Dict[str, Any]): 关键字参数
             timeout (int, optional): 超时时间（秒），默认5分钟
+            on_finish (Callable[[Task], None], optional): 任务执行结束后的回调
         """
         self.task_id = task_id
         self.func = func
@@ -56,40 +143,74 @@ class Task:
         self.error = None
         self.start_time = None
         self.end_time = None
+        # 单调时钟读数，用于超时和耗时计算，不受系统时间调整影响
+        self._mono_start = None
+        self._mono_end = None
         self.timeout = timeout
-        self.thread = None
+        self.future = None
+        self.on_finish = on_finish
     
-    def run(self):
-        """执行任务"""
-        # 更新状态和开始时间
-        self.status = TaskStatus.RUNNING
-        self.start_time = datetime.now()
+    def run(self, executor: ThreadPoolExecutor):
+        """
+        提交任务到线程池
         
-        # 创建线程执行任务
-        self.thread = threading.Thread(target=self._execute)
-        self.thread.daemon = True
-        self.thread.start()
+        参数:
+            executor (ThreadPoolExecutor): 执行任务的线程池
+        """
+        # 记录提交时间，超时从提交时开始计算
+        self._mono_start = time.monotonic()
+        self.start_time = datetime.now()
+        self.future = executor.submit(self._execute)
     
     def _execute(self):
-        """实际执行函数的内部方法"""
+        """
+        实际执行函数的内部方法
+        
+        任务在排队期间已被取消或超时时不再执行函数。线程池已开始调用_execute时
+        future无法取消，cancel和check_timeout不会调用_finish，因此这里总是调用_finish。
+        """
         try:
-            # 执行函数
-            self.result = self.func(*self.args, **self.kwargs)
-            self.status = TaskStatus.COMPLETED
-        except Exception as e:
-            # 捕获异常
-            self.error = str(e)
-            self.status = TaskStatus.FAILED
-            logger.error(f"Task {self.task_id} failed: {e}")
-            logger.error(traceback.format_exc())
-        finally:
-            # 更新结束时间
-            self.end_time = datetime.now()
+            with self._STATUS_LOCK:
+                if self.status != TaskStatus.PENDING:
+                    return
+                self.status = TaskStatus.RUNNING
             
-            # 清理引用，避免内存泄漏
-            self.func = None
-            self.args = None
-            self.kwargs = None
+            try:
+                result = self.func(*self.args, **self.kwargs)
+            except TaskTimeoutError:
+                with self._STATUS_LOCK:
+                    if self.status == TaskStatus.RUNNING:
+                        self.error = f"任务执行超时，超过{self.timeout}秒"
+                        self.status = TaskStatus.TIMEOUT
+            except Exception as e:
+                logger.exception("Task %s failed: %s", self.task_id, e)
+                # 错误信息先于状态写入，执行期间已被取消或超时的任务保持原状态
+                with self._STATUS_LOCK:
+                    if self.status == TaskStatus.RUNNING:
+                        self.error = str(e)
+                        self.status = TaskStatus.FAILED
+            else:
+                # 结果先于状态写入，执行期间已被取消或超时的任务丢弃结果
+                with self._STATUS_LOCK:
+                    if self.status == TaskStatus.RUNNING:
+                        self.result = result
+                        self.status = TaskStatus.COMPLETED
+        finally:
+            self._finish()
+    
+    def _finish(self):
+        """记录结束时间，释放函数和参数的引用并通知回调"""
+        # 更新结束时间
+        self._mono_end = time.monotonic()
+        self.end_time = datetime.now()
+        
+        # 清理引用，避免内存泄漏
+        self.func = None
+        self.args = None
+        self.kwargs = None
+        
+        if self.on_finish is not None:
+            self.on_finish(self)
     
     def cancel(self):
         """
@@ -98,15 +219,18 @@ class Task:
         返回:
             bool: 是否成功取消
         """
-        if self.status == TaskStatus.PENDING:
-            self.status = TaskStatus.CANCELED
-            return True
-        elif self.status == TaskStatus.RUNNING:
+        with self._STATUS_LOCK:
+            status = self.status
+            if status not in (TaskStatus.PENDING, TaskStatus.RUNNING):
+                return False
             # 正在运行的任务无法真正取消，只能标记为取消
-            self.status = TaskStatus.CANCELED
             # 注意：我们不应该强制终止线程，这可能导致资源泄漏
-            return True
-        return False
+            self.status = TaskStatus.CANCELED
+        
+        # 尚未开始执行的任务从线程池队列中移除
+        if status == TaskStatus.PENDING and self.future is not None and self.future.cancel():
+            self._finish()
+        return True
     
     def check_timeout(self):
         """
@@ -115,13 +239,19 @@ class Task:
         返回:
             bool: 是否超时
         """
-        if self.status == TaskStatus.RUNNING and self.start_time:
-            elapsed = datetime.now() - self.start_time
-            if elapsed.total_seconds() > self.timeout:
-                self.status = TaskStatus.TIMEOUT
-                self.error = f"任务执行超时，超过{self.timeout}秒"
-                return True
-        return False
+        if self._mono_start is None or time.monotonic() - self._mono_start <= self.timeout:
+            return False
+        
+        with self._STATUS_LOCK:
+            if self.status not in (TaskStatus.PENDING, TaskStatus.RUNNING):
+                return False
+            self.error = f"任务执行超时，超过{self.timeout}秒"
+            self.status = TaskStatus.TIMEOUT
+        
+        # 排队超时的任务不再执行
+        if self.future is not None and self.future.cancel():
+            self._finish()
+        return True
     
     def get_info(self):
         """
@@ -132,11 +262,11 @@ class Task:
         """
         # 计算运行时间
         duration = None
-        if self.start_time:
-            if self.end_time:
-                duration = (self.end_time - self.start_time).total_seconds()
+        if self._mono_start is not None:
+            if self._mono_end is not None:
+                duration = self._mono_end - self._mono_start
             else:
-                duration = (datetime.now() - self.start_time).total_seconds()
+                duration = time.monotonic() - self._mono_start
         
         return {
             "task_id": self.task_id,
@@ -151,63 +281,170 @@ class Task:
 class TaskManager:
     """任务管理器，管理所有异步任务"""
     
-    def __init__(self, max_tasks=100, cleanup_interval=300):
+    # 任务ID中的签名长度（字节）
+    ID_TAG_SIZE = 8
+    
+    # 任务结束后的保留时间（秒）
+    RETENTION = 24 * 60 * 60
+    
+    def __init__(self, max_tasks=100, cleanup_interval=300, max_workers=None, max_queued=None,
+                 admission_timeout=0.05):
         """
         初始化任务管理器
         
+        任务保存在固定长度的槽位数组中，任务ID由槽位序号、创建序号和HMAC签名编码而成，
+        查询任务时验证签名后直接按序号读取槽位，不需要字典查找和加锁。
+        超时检查和过期清理按截止时间由最小堆驱动，没有到期任务时清理线程不会被唤醒。
+        任务在共享的线程池中执行，并发数量受线程池大小限制。
+        正在执行和排队等待的任务总数不超过max_workers + max_queued，
+        达到上限时新任务最多等待admission_timeout秒，仍无空位则拒绝，避免过载时积压。
+        
         参数:
             max_tasks (int, optional): 最大任务数量，默认100
-            cleanup_interval (int, optional): 清理间隔（秒），默认5分钟
+            cleanup_interval (int, optional): 兼容旧接口保留，清理不再按固定间隔执行
+            max_workers (int, optional): 执行任务的线程数，默认为CPU核数的2倍
+            max_queued (int, optional): 最多排队等待执行的任务数，默认与max_workers相同
+            admission_timeout (float, optional): 达到上限时新任务的最长等待时间（秒），默认0.05
         """
-        self.tasks = {}
         self.max_tasks = max_tasks
         self.cleanup_interval = cleanup_interval
-        self.lock = threading.Lock()
+        self.max_workers = max_workers or (os.cpu_count() or 1) * 2
+        self.max_queued = self.max_workers if max_queued is None else max_queued
+        self.admission_timeout = admission_timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task")
+        
+        # 正在执行和排队的任务名额，任务结束时释放
+        self._admission = threading.BoundedSemaphore(self.max_workers + self.max_queued)
+        
+        # 任务槽位和空闲槽位序号，空闲序号用完即达到任务数量上限
+        self._slots = [None] * max_tasks
+        self._free_slots = deque(range(max_tasks))
+        
+        # 任务ID签名密钥和创建序号，序号保证同一槽位先后的任务ID不同
+        self._id_key = secrets.token_bytes(32)
+        self._id_counter = itertools.count()
+        
+        # 截止时间最小堆: (超时时间, 任务ID) 和 (保留到期时间, 任务ID)
+        self._timeout_heap = []
+        self._retention_heap = []
+        self._schedule = threading.Condition()
         
         # 启动清理线程
         self.cleanup_thread = threading.Thread(target=self._cleanup_tasks, daemon=True)
         self.cleanup_thread.start()
     
-    def _cleanup_tasks(self):
-        """清理已完成的任务"""
-        while True:
-            time.sleep(self.cleanup_interval)
-            logger.info("开始任务清理")
+    def _sign(self, payload):
+        """
+        计算任务ID的签名
+        
+        参数:
+            payload (bytes): 槽位序号和创建序号
             
-            with self.lock:
-                # 获取所有任务ID
-                task_ids = list(self.tasks.keys())
+        返回:
+            bytes: 截断后的HMAC签名
+        """
+        return hmac.new(self._id_key, payload, hashlib.sha256).digest()[:self.ID_TAG_SIZE]
+    
+    def _encode_task_id(self, index):
+        """
+        生成指向槽位的任务ID
+        
+        参数:
+            index (int): 槽位序号
+            
+        返回:
+            str: 任务ID
+        """
+        payload = struct.pack("<IQ", index, next(self._id_counter))
+        return base64.urlsafe_b64encode(payload + self._sign(payload)).rstrip(b"=").decode("ascii")
+    
+    def _decode_task_id(self, task_id):
+        """
+        验证任务ID的签名并解析槽位序号
+        
+        参数:
+            task_id (str): 任务ID
+            
+        返回:
+            int or None: 槽位序号，任务ID无效时返回None
+        """
+        try:
+            raw = base64.urlsafe_b64decode(task_id + "=" * (-len(task_id) % 4))
+        except (ValueError, TypeError):
+            return None
+        
+        if len(raw) != 12 + self.ID_TAG_SIZE:
+            return None
+        
+        payload, tag = raw[:12], raw[12:]
+        if not hmac.compare_digest(tag, self._sign(payload)):
+            return None
+        
+        index = struct.unpack_from("<I", payload)[0]
+        return index if index < len(self._slots) else None
+    
+    def _schedule_deadline(self, heap, deadline, task_id):
+        """
+        登记截止时间并唤醒清理线程
+        
+        参数:
+            heap (list): 超时堆或保留堆
+            deadline (float): 截止时间，单调时钟读数
+            task_id (str): 任务ID
+        """
+        with self._schedule:
+            heapq.heappush(heap, (deadline, task_id))
+            self._schedule.notify()
+    
+    def _task_finished(self, task):
+        """
+        任务执行结束回调，释放执行名额并登记任务的保留到期时间
+        
+        参数:
+            task (Task): 已结束的任务
+        """
+        self._admission.release()
+        self._schedule_deadline(self._retention_heap, task._mono_end + self.RETENTION, task.task_id)
+    
+    def _remove_task(self, task_id):
+        """
+        删除任务并释放任务名额
+        
+        参数:
+            task_id (str): 任务ID
+        """
+        index = self._decode_task_id(task_id)
+        if index is None:
+            return
+        
+        task = self._slots[index]
+        if task is not None and task.task_id == task_id:
+            self._slots[index] = None
+            self._free_slots.append(index)
+            logger.info("清理任务 %s", task_id)
+    
+    def _cleanup_tasks(self):
+        """按截止时间检查超时任务并清理过期任务"""
+        with self._schedule:
+            while True:
+                now = time.monotonic()
                 
-                # 检查超时的任务
-                for task_id in task_ids:
-                    task = self.tasks.get(task_id)
+                # 检查到达超时时间的任务
+                while self._timeout_heap and self._timeout_heap[0][0] < now:
+                    _, task_id = heapq.heappop(self._timeout_heap)
+                    task = self.get_task(task_id)
                     if task:
                         task.check_timeout()
                 
-                # 清理已完成、失败、超时或取消的任务
-                completed_statuses = [
-                    TaskStatus.COMPLETED, 
-                    TaskStatus.FAILED,
-                    TaskStatus.TIMEOUT,
-                    TaskStatus.CANCELED
-                ]
-                
-                # 计算任务完成时间超过一天的任务
-                one_day_ago = datetime.now() - timedelta(days=1)
+                # 清理结束时间超过保留时间的任务
+                while self._retention_heap and self._retention_heap[0][0] < now:
+                    _, task_id = heapq.heappop(self._retention_heap)
+                    self._remove_task(task_id)
                 
-                for task_id in task_ids:
-                    task = self.tasks.get(task_id)
-                    if task and (
-                        # 任务已经结束且结束时间超过一天
-                        (task.status in completed_statuses and task.end_time and task.end_time < one_day_ago) or
-                        # 或者任务创建时间超过一天且从未启动
-                        (task.status == TaskStatus.PENDING and task.start_time is None and 
-                         task.end_time is None and task.thread is None)
-                    ):
-                        logger.info(f"清理任务 {task_id}")
-                        del self.tasks[task_id]
-            
-            logger.info(f"任务清理完成。剩余{len(self.tasks)}个任务")
+                # 等待到最近的截止时间，或有新的截止时间登记
+                deadlines = [heap[0][0] for heap in (self._timeout_heap, self._retention_heap) if heap]
+                wait = max(min(deadlines) - now, 0.001) if deadlines else None
+                self._schedule.wait(timeout=wait)
     
     def create_task(self, func, *args, **kwargs):
         """
@@ -222,27 +459,62 @@ class TaskManager:
             str: 任务ID
         
         异常:
-            RuntimeError: 当任务数量超过限制时
+            RuntimeError: 当任务数量超过限制或执行队列已满时
         """
-        with self.lock:
-            # 检查任务数量是否超过限制
-            if len(self.tasks) >= self.max_tasks:
-                raise RuntimeError(f"任务数量过多。最大允许数量: {self.max_tasks}")
-            
-            # 生成任务ID
-            task_id = str(uuid.uuid4())
-            
-            # 从kwargs中提取timeout参数，如果有的话
-            timeout = kwargs.pop('_timeout', 300)
-            
-            # 创建任务
-            task = Task(task_id, func, args, kwargs, timeout)
-            self.tasks[task_id] = task
-            
-            # 启动任务
-            task.run()
+        # 预占空闲槽位，deque的popleft和append本身是线程安全的
+        try:
+            index = self._free_slots.popleft()
+        except IndexError:
+            raise RuntimeError(f"任务数量过多。最大允许数量: {self.max_tasks}")
+        
+        # 获取执行名额，执行队列已满时短暂等待后拒绝
+        if not self._admission.acquire(timeout=self.admission_timeout):
+            self._free_slots.append(index)
+            raise RuntimeError(f"执行队列已满。最大排队数量: {self.max_queued}")
+        
+        # 生成指向槽位的任务ID
+        task_id = self._encode_task_id(index)
+        
+        # 从kwargs中提取timeout参数，如果有的话
+        timeout = kwargs.pop('_timeout', 300)
+        
+        # 创建任务并放入槽位
+        task = Task(task_id, func, args, kwargs, timeout, on_finish=self._task_finished)
+        self._slots[index] = task
+        
+        # 提交任务并登记超时时间，提交失败（如线程池已关闭）时归还槽位和执行名额
+        try:
+            task.run(self._executor)
+        except Exception:
+            self._slots[index] = None
+            self._free_slots.append(index)
+            self._admission.release()
+            raise
+        self._schedule_deadline(self._timeout_heap, task._mono_start + timeout, task_id)
+        
+        return task_id
+    
+    def create_process_task(self, func, *args, **kwargs):
+        """
+        创建在进程池中执行的新任务
+        
+        任务的状态管理与create_task相同，函数本身在共享进程池中执行。
+        等待子进程结果时占用一个任务线程，进程任务同样受线程池大小和执行名额限制。
+        任务超时时取消子进程任务并释放等待的线程。
+        
+        参数:
+            func (Callable): 要执行的函数，必须是可序列化的模块级函数
+            *args: 位置参数
+            **kwargs: 关键字参数
             
-            return task_id
+        返回:
+            str: 任务ID
+        
+        异常:
+            RuntimeError: 当任务数量超过限制或执行队列已满时
+        """
+        deadline = time.monotonic() + kwargs.get('_timeout', 300)
+        return self.create_task(_run_in_process_pool, func, *args, _deadline=deadline, **kwargs)
     
     def get_task(self, task_id):
         """
@@ -254,7 +526,13 @@ class TaskManager:
         返回:
             Task or None: 任务实例，如果不存在则返回None
         """
-        return self.tasks.get(task_id)
+        index = self._decode_task_id(task_id)
+        if index is None:
+            return None
+        
+        # 槽位可能已被后创建的任务复用，核对任务ID
+        task = self._slots[index]
+        return task if task is not None and task.task_id == task_id else None
     
     def get_task_info(self, task_id):
         """
@@ -283,17 +561,38 @@ class TaskManager:
         if not task:
             return False, None, "任务不存在"
         
-        # 检查任务状态
-        if task.status == TaskStatus.COMPLETED:
+        # 检查任务状态，状态只读取一次，结果在状态之后读取
+        status = task.status
+        if status == TaskStatus.COMPLETED:
             return True, task.result, None
-        elif task.status == TaskStatus.FAILED:
+        elif status == TaskStatus.FAILED:
             return True, None, task.error
-        elif task.status == TaskStatus.TIMEOUT:
+        elif status == TaskStatus.TIMEOUT:
             return True, None, "任务执行超时"
-        elif task.status == TaskStatus.CANCELED:
+        elif status == TaskStatus.CANCELED:
             return True, None, "任务已取消"
         else:
-            return False, None, f"任务仍在处理中，当前状态: {task.status.value}"
+            return False, None, f"任务仍在处理中，当前状态: {status.value}"
+    
+    def get_task_state(self, task_id):
+        """
+        一次获取任务信息和任务结果
+        
+        参数:
+            task_id (str): 任务ID
+            
+        返回:
+            Tuple[Optional[Dict[str, Any]], Any]: 元组(任务信息, 任务结果)，
+                任务不存在时为(None, None)，任务未完成时任务结果为None
+        """
+        task = self.get_task(task_id)
+        if not task:
+            return None, None
+        
+        # 任务结果先于完成状态写入，信息中状态为已完成时结果一定可用
+        info = task.get_info()
+        result = task.result if info["status"] == TaskStatus.COMPLETED.value else None
+        return info, result
     
     def cancel_task(self, task_id):
         """
@@ -318,8 +617,12 @@ class TaskManager:
         返回:
             List[Dict[str, Any]]: 所有任务的信息列表
         """
-        with self.lock:
-            return [task.get_info() for task in self.tasks.values()]
+        # 复制槽位列表后格式化任务信息，不阻塞创建和清理任务
+        return [task.get_info() for task in list(self._slots) if task is not None]
+    
+    def shutdown(self):
+        """关闭任务线程池，不等待正在执行的任务"""
+        self._executor.shutdown(wait=False)
 
 
 # 创建全局任务管理器实例
@@ -356,4 +659,28 @@ def run_async(timeout=300):
         
         return wrapper
     
-    return decorator 
\ No newline at end of file
+    return decorator 
+
+
+def submit_process_task(func, *args, timeout=300, **kwargs):
+    """
+    提交在进程池中执行的异步任务
+    
+    与run_async不同，func必须是模块级函数，以便传递给子进程。
+    
+    参数:
+        func (Callable): 要执行的函数
+        *args: 位置参数
+        timeout (int, optional): 超时时间（秒），默认5分钟
+        **kwargs: 关键字参数
+        
+    返回:
+        Dict[str, Any]: 任务提交信息
+    """
+    task_id = task_manager.create_process_task(func, *args, _timeout=timeout, **kwargs)
+    
+    return {
+        "task_id": task_id,
+        "status": "accepted",
+        "message": "任务已接受并异步处理中"
+    }
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+验证函数代码生成
+============
+
+为请求验证工具提供共用的源码生成器，验证规则在编译时展开为直线式代码。
+"""
+
+from typing import Dict, Any, Callable, List, Optional
+
+
+class CodeBuilder:
+    """
+    验证函数源码生成器
+
+    按验证模式只生成实际需要的检查语句。常量、错误信息、正则表达式和嵌套验证函数
+    一律通过命名空间传入生成的函数，不拼接进源码，因此不需要转义。
+    """
+
+    def __init__(self, namespace: Optional[Dict[str, Any]] = None):
+        """
+        初始化源码生成器
+
+        参数:
+            namespace (Dict[str, Any], optional): 生成的函数可以直接引用的名称，如异常类和辅助函数
+        """
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = dict(namespace or {})
+
+    def const(self, value: Any) -> str:
+        """
+        登记常量并返回其在生成代码中的名称
+
+        参数:
+            value (Any): 常量值
+
+        返回:
+            str: 常量名称
+        """
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def emit(self, indent: int, line: str) -> None:
+        """
+        添加一行源码
+
+        参数:
+            indent (int): 缩进层级
+            line (str): 源码
+        """
+        self.lines.append("    " * indent + line)
+
+    def emit_raise(self, indent: int, condition: str, exception: str, message: str, *args: str) -> None:
+        """
+        生成条件成立时抛出异常的语句
+
+        参数:
+            indent (int): 缩进层级
+            condition (str): 条件表达式
+            exception (str): 异常类在生成代码中的名称
+            message (str): 错误信息，有args时作为%格式化模板
+            *args: 格式化参数表达式
+        """
+        self.emit(indent, f"if {condition}:")
+        if args:
+            self.emit(indent + 1, f"raise {exception}({self.const(message)} % ({', '.join(args)},))")
+        else:
+            self.emit(indent + 1, f"raise {exception}({self.const(message)})")
+
+    def build(self, name: str) -> Callable:
+        """
+        编译生成的源码并返回其中定义的函数
+
+        参数:
+            name (str): 函数名称
+
+        返回:
+            Callable: 生成的函数
+        """
+        source = "\n".join(self.lines)
+        exec(compile(source, f"<validator {name}>", "exec"), self.namespace)
+        return self.namespace[name]
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON请求路由工具
+=============
+
+提供使用统一JSON解码器解析请求体的FastAPI请求类和路由类。
+"""
+
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from data_insight.api.utils.json_utils import loads as json_loads
+
+
+class ORJSONRequest(Request):
+    """
+    使用统一JSON解码器解析请求体的请求类
+    """
+
+    async def json(self) -> Any:
+        """
+        解析请求体JSON数据，同一请求内只解析一次
+
+        返回:
+            Any: 解析后的JSON数据
+        """
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            self._json = json_loads(body)
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """
+    将请求包装为ORJSONRequest的路由类
+
+    通过APIRouter的route_class参数启用。
+    """
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request) -> Response:
+            request = ORJSONRequest(request.scope, request.receive)
+            return await original_route_handler(request)
+
+        return custom_route_handler
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON编解码工具
+===========
+
+提供统一的JSON编解码功能，优先使用orjson，不可用时回退到标准库json。
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    # 原生支持numpy数组和非字符串键
+    _DUMPS_OPTION = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    _DUMPS_INDENT_OPTION = _DUMPS_OPTION | orjson.OPT_INDENT_2
+
+
+def json_default(obj: Any) -> Any:
+    """
+    处理编码器不支持的类型
+
+    参数:
+        obj (Any): 需要序列化的对象
+
+    返回:
+        Any: 可序列化的对象
+    """
+    # 处理datetime对象
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+
+    # 处理集合
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+
+    # 处理numpy数组和标量
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+
+    # 处理pandas Series
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+
+    # 处理其他类型
+    return str(obj)
+
+
+# 标准库回退路径共用的紧凑编码器，避免每次序列化都创建编码器实例
+_COMPACT_ENCODER = json.JSONEncoder(ensure_ascii=False, default=json_default, separators=(',', ':'))
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    将对象序列化为UTF-8编码的JSON字节串
+
+    参数:
+        obj (Any): 需要序列化的对象
+        indent (bool, optional): 是否缩进输出，默认为False
+        sort_keys (bool, optional): 是否按键排序，用于生成规范化的输出，默认为False
+
+    返回:
+        bytes: JSON字节串
+    """
+    if ORJSON_AVAILABLE:
+        option = _DUMPS_INDENT_OPTION if indent else _DUMPS_OPTION
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=json_default, option=option)
+
+    if not indent and not sort_keys:
+        return _COMPACT_ENCODER.encode(obj).encode('utf-8')
+
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        default=json_default,
+        indent=2 if indent else None,
+        sort_keys=sort_keys,
+        separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    解析JSON数据
+
+    参数:
+        data (Union[bytes, bytearray, memoryview, str]): JSON数据
+
+    返回:
+        Any: 解析后的对象
+
+    异常:
+        ValueError: 当JSON格式不正确时
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode('utf-8')
+    return json.loads(data)
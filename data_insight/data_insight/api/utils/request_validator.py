@@ -8,9 +8,123 @@
 提供用于验证API请求参数的工具函数。
 """
 
-from typing import Dict, Any, List, Union, Optional
-from werkzeug.exceptions import BadRequest
+import re
 import json
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Union, Optional, Tuple
+from werkzeug.exceptions import BadRequest
+
+from .codegen import CodeBuilder
+
+
+# 简单的邮箱格式
+_EMAIL_RE = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+
+
+# 已编译的请求验证函数: id(spec) -> (spec, 验证函数)
+_COMPILED_VALIDATORS: Dict[int, Tuple[Dict[str, Dict[str, Any]], Callable[[Dict[str, Any]], None]]] = {}
+
+
+def build_validator(spec: Dict[str, Dict[str, Any]]) -> Callable[[Dict[str, Any]], None]:
+    """
+    将字段验证规则编译为单个验证函数
+    
+    规则只在首次编译时遍历一次，必要字段、类型、数值范围和长度检查被展开为
+    一个函数中的顺序语句，编译结果按规则对象缓存。生成的函数先检查全部必要字段，
+    再检查全部字段类型，最后按字段顺序检查数值范围和长度，与先调用
+    validate_request_data、再逐字段调用validate_numeric_range和validate_string_length
+    行为一致。
+    
+    规则格式::
+    
+        {
+            "字段名": {
+                "required": True,         # 是否必要字段
+                "type": str,              # 字段类型
+                "min": 0, "max": 100,     # 数值范围
+                "min_length": 1, "max_length": 50  # 长度范围
+            }
+        }
+    
+    参数:
+        spec (Dict[str, Dict[str, Any]]): 字段验证规则
+        
+    返回:
+        Callable[[Dict[str, Any]], None]: 验证函数，验证失败时抛出BadRequest
+    """
+    cached = _COMPILED_VALIDATORS.get(id(spec))
+    if cached is not None and cached[0] is spec:
+        return cached[1]
+    
+    validate = _compile_validator(spec)
+    _COMPILED_VALIDATORS[id(spec)] = (spec, validate)
+    return validate
+
+
+def _compile_validator(spec: Dict[str, Dict[str, Any]]) -> Callable[[Dict[str, Any]], None]:
+    """
+    生成并编译验证函数
+    
+    参数:
+        spec (Dict[str, Dict[str, Any]]): 字段验证规则
+        
+    返回:
+        Callable[[Dict[str, Any]], None]: 验证函数
+    """
+    builder = CodeBuilder({"BadRequest": BadRequest})
+    builder.emit(0, "def validate(data):")
+    
+    def fail(indent: int, condition: str, message: str, *args: str) -> None:
+        builder.emit_raise(indent, condition, "BadRequest", message, *args)
+    
+    def field_block(field: str) -> None:
+        name = builder.const(field)
+        builder.emit(1, f"if {name} in data:")
+        builder.emit(2, f"value = data[{name}]")
+    
+    # 先检查全部必要字段
+    for field, rules in spec.items():
+        if rules.get("required"):
+            fail(1, f"{builder.const(field)} not in data", f"缺少必要字段: {field}")
+    
+    # 再检查全部字段类型，与validate_request_data一致
+    for field, rules in spec.items():
+        field_type = rules.get("type")
+        if field_type is None:
+            continue
+        
+        field_block(field)
+        type_name = builder.const(field_type)
+        fail(2, f"type(value) is not {type_name} and not isinstance(value, {type_name})",
+             f"字段 '{field}' 类型错误: 期望 {field_type.__name__}，实际为 %s", "type(value).__name__")
+    
+    # 最后按字段顺序检查数值范围和长度，与validate_numeric_range、validate_string_length一致
+    for field, rules in spec.items():
+        min_value, max_value = rules.get("min"), rules.get("max")
+        min_length, max_length = rules.get("min_length"), rules.get("max_length")
+        if min_value is None and max_value is None and min_length is None and max_length is None:
+            continue
+        
+        field_block(field)
+        
+        if min_value is not None or max_value is not None:
+            fail(2, "type(value) is not int and type(value) is not float and not isinstance(value, (int, float))",
+                 f"字段 '{field}' 必须是数值类型")
+            if min_value is not None:
+                fail(2, f"value < {builder.const(min_value)}", f"字段 '{field}' 值不能小于 {min_value}")
+            if max_value is not None:
+                fail(2, f"value > {builder.const(max_value)}", f"字段 '{field}' 值不能大于 {max_value}")
+        
+        if min_length is not None or max_length is not None:
+            fail(2, "type(value) is not str and not isinstance(value, str)",
+                 f"字段 '{field}' 必须是字符串类型")
+            if min_length is not None:
+                fail(2, f"len(value) < {builder.const(min_length)}", f"字段 '{field}' 长度不能小于 {min_length}")
+            if max_length is not None:
+                fail(2, f"len(value) > {builder.const(max_length)}", f"字段 '{field}' 长度不能大于 {max_length}")
+    
+    builder.emit(1, "return None")
+    return builder.build("validate")
 
 
 def validate_request_data(data: Dict[str, Any], required_fields: List[str], field_types: Optional[Dict[str, type]] = None) -> None:
@@ -30,13 +144,15 @@ def validate_request_data(data: Dict[str, Any], required_fields: List[str], fiel
         if field not in data:
             raise BadRequest(f"缺少必要字段: {field}")
     
-    # 验证字段类型
+    # 验证字段类型，类型完全一致时直接通过，只有子类才需要isinstance检查
     if field_types:
         for field, field_type in field_types.items():
-            if field in data and not isinstance(data[field], field_type):
-                actual_type = type(data[field]).__name__
-                expected_type = field_type.__name__
-                raise BadRequest(f"字段 '{field}' 类型错误: 期望 {expected_type}，实际为 {actual_type}")
+            if field not in data:
+                continue
+            value = data[field]
+            value_type = type(value)
+            if value_type is not field_type and not isinstance(value, field_type):
+                raise BadRequest(f"字段 '{field}' 类型错误: 期望 {field_type.__name__}，实际为 {value_type.__name__}")
 
 
 def validate_numeric_range(data: Dict[str, Any], field: str, min_value: Optional[float] = None, max_value: Optional[float] = None) -> None:
@@ -175,8 +291,6 @@ def validate_date_format(data: Dict[str, Any], field: str, format_hint: str = "Y
     if field not in data:
         return
     
-    from datetime import datetime
-    
     value = data[field]
     if not isinstance(value, str):
         raise BadRequest(f"字段 '{field}' 必须是字符串类型")
@@ -201,33 +315,81 @@ def validate_email_format(data: Dict[str, Any], field: str) -> None:
     if field not in data:
         return
     
-    import re
-    
     value = data[field]
     if not isinstance(value, str):
         raise BadRequest(f"字段 '{field}' 必须是字符串类型")
     
-    # 简单的邮箱格式验证
-    email_pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-    if not re.match(email_pattern, value):
+    if not _EMAIL_RE.match(value):
         raise BadRequest(f"字段 '{field}' 的邮箱格式不正确")
 
 
-def validate_request_size(data: Dict[str, Any], max_size_mb: float = 10.0) -> None:
+def validate_request_size(data: Union[Dict[str, Any], bytes, bytearray], max_size_mb: float = 10.0,
+                          content_length: Optional[int] = None) -> None:
     """
     验证请求数据大小是否超过限制
     
+    优先使用请求头中的Content-Length或原始请求体的字节数；只有解析后的请求数据时，
+    遍历一次数据估算其JSON序列化后的字节数，不做实际序列化，超过限制后立即停止遍历。
+    
     参数:
-        data (Dict[str, Any]): 请求数据
+        data (Union[Dict[str, Any], bytes, bytearray]): 请求数据或原始请求体
         max_size_mb (float, optional): 最大允许大小（MB）
+        content_length (int, optional): 请求头中的Content-Length
         
     异常:
         BadRequest: 当请求数据大小超过限制时
     """
-    import sys
+    max_bytes = max_size_mb * 1024 * 1024
+    
+    if content_length is not None:
+        size = content_length
+    elif isinstance(data, (bytes, bytearray)):
+        size = len(data)
+    else:
+        size = _estimate_json_size(data, max_bytes)
     
     # 计算数据大小（MB）
-    data_size = sys.getsizeof(json.dumps(data)) / (1024 * 1024)
+    data_size = size / (1024 * 1024)
     
     if data_size > max_size_mb:
-        raise BadRequest(f"请求数据大小（{data_size:.2f}MB）超过限制（{max_size_mb}MB）") 
\ No newline at end of file
+        raise BadRequest(f"请求数据大小（{data_size:.2f}MB）超过限制（{max_size_mb}MB）")
+
+
+def _estimate_json_size(data: Any, limit: float) -> int:
+    """
+    估算数据序列化为JSON后的字节数
+    
+    字符串按字符数加引号计算，数值按固定宽度计算，容器加上括号和分隔符，
+    累计超过limit时提前返回。
+    
+    参数:
+        data (Any): 请求数据
+        limit (float): 字节数上限
+        
+    返回:
+        int: 估算的字节数
+    """
+    size = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            size += len(value) + 2
+        elif isinstance(value, dict):
+            size += 2 + len(value)
+            for key, item in value.items():
+                size += len(str(key)) + 3
+                stack.append(item)
+        elif isinstance(value, (list, tuple)):
+            size += 2 + len(value)
+            stack.extend(value)
+        elif value is None or isinstance(value, bool):
+            size += 5
+        else:
+            # 数值
+            size += 8
+        
+        if size > limit:
+            break
+    
+    return size
@@ -11,6 +11,55 @@ API响应格式化工具
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import json
+import time
+
+from .json_utils import json_default
+
+
+class _IsoClock:
+    """
+    按秒缓存ISO格式时间戳
+    
+    同一秒内只格式化一次日期和时间部分，每次调用只拼接微秒部分，
+    输出格式与datetime.now().isoformat()一致。
+    """
+    
+    __slots__ = ("_cache",)
+    
+    def __init__(self):
+        """初始化时钟"""
+        # (整秒时间戳, 格式化到秒的字符串)，整体替换元组，读取时无需加锁
+        self._cache = (None, "")
+    
+    def now(self) -> str:
+        """
+        获取当前时间的ISO格式字符串
+        
+        返回:
+            str: ISO格式时间戳
+        """
+        now = time.time()
+        second = int(now)
+        cached_second, prefix = self._cache
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second).isoformat()
+            self._cache = (second, prefix)
+        
+        microsecond = int((now - second) * 1000000)
+        return f"{prefix}.{microsecond:06d}" if microsecond else prefix
+
+
+_now_iso = _IsoClock().now
+
+
+# 各类响应的键顺序模板，格式化时复制后填充
+_SUCCESS_TEMPLATE = {"success": True, "message": None, "status_code": None, "data": None, "timestamp": None}
+_ERROR_TEMPLATE = {"success": False, "message": None, "status_code": None, "timestamp": None}
+_PAGINATED_TEMPLATE = {"success": True, "message": None, "status_code": None, "data": None,
+                       "pagination": None, "timestamp": None}
+_BATCH_TEMPLATE = {"success": True, "message": None, "status_code": None, "batch_info": None,
+                   "results": None, "timestamp": None}
+_EXPORT_TEMPLATE = {"success": True, "message": None, "status_code": None, "file_info": None, "timestamp": None}
 
 
 def format_success_response(
@@ -31,13 +80,11 @@ def format_success_response(
     返回:
         Dict[str, Any]: 格式化后的响应数据
     """
-    response = {
-        "success": True,
-        "message": message,
-        "status_code": status_code,
-        "data": data,
-        "timestamp": datetime.now().isoformat()
-    }
+    response = _SUCCESS_TEMPLATE.copy()
+    response["message"] = message
+    response["status_code"] = status_code
+    response["data"] = data
+    response["timestamp"] = _now_iso()
     
     # 添加元数据
     if metadata:
@@ -66,12 +113,10 @@ def format_error_response(
     返回:
         Dict[str, Any]: 格式化后的响应数据
     """
-    response = {
-        "success": False,
-        "message": message,
-        "status_code": status_code,
-        "timestamp": datetime.now().isoformat()
-    }
+    response = _ERROR_TEMPLATE.copy()
+    response["message"] = message
+    response["status_code"] = status_code
+    response["timestamp"] = _now_iso()
     
     # 添加错误类型
     if error_type:
@@ -126,14 +171,12 @@ def format_paginated_response(
     }
     
     # 构建响应
-    response = {
-        "success": True,
-        "message": message,
-        "status_code": status_code,
-        "data": data,
-        "pagination": pagination,
-        "timestamp": datetime.now().isoformat()
-    }
+    response = _PAGINATED_TEMPLATE.copy()
+    response["message"] = message
+    response["status_code"] = status_code
+    response["data"] = data
+    response["pagination"] = pagination
+    response["timestamp"] = _now_iso()
     
     # 添加元数据
     if metadata:
@@ -164,23 +207,23 @@ def format_batch_response(
     返回:
         Dict[str, Any]: 格式化后的响应数据
     """
-    # 构建批处理信息
+    # 构建批处理信息，成功率保持百分比字符串格式
+    total_count = len(results)
+    success_rate = success_count / total_count * 100 if total_count else 0
     batch_info = {
-        "total_count": len(results),
+        "total_count": total_count,
         "success_count": success_count,
         "failed_count": failed_count,
-        "success_rate": f"{(success_count / len(results) * 100) if results else 0:.2f}%"
+        "success_rate": f"{success_rate:.2f}%"
     }
     
     # 构建响应
-    response = {
-        "success": True,
-        "message": message,
-        "status_code": status_code,
-        "batch_info": batch_info,
-        "results": results,
-        "timestamp": datetime.now().isoformat()
-    }
+    response = _BATCH_TEMPLATE.copy()
+    response["message"] = message
+    response["status_code"] = status_code
+    response["batch_info"] = batch_info
+    response["results"] = results
+    response["timestamp"] = _now_iso()
     
     # 添加元数据
     if metadata:
@@ -221,7 +264,7 @@ def format_export_response(
         "file_name": file_name,
         "file_size": file_size,
         "file_type": file_type,
-        "created_at": datetime.now().isoformat()
+        "created_at": _now_iso()
     }
     
     # 添加过期时间
@@ -229,13 +272,11 @@ def format_export_response(
         file_info["expires_at"] = expires_at
     
     # 构建响应
-    response = {
-        "success": True,
-        "message": message,
-        "status_code": status_code,
-        "file_info": file_info,
-        "timestamp": datetime.now().isoformat()
-    }
+    response = _EXPORT_TEMPLATE.copy()
+    response["message"] = message
+    response["status_code"] = status_code
+    response["file_info"] = file_info
+    response["timestamp"] = _now_iso()
     
     # 添加元数据
     if metadata:
@@ -260,12 +301,10 @@ def format_validation_error(
     返回:
         Dict[str, Any]: 格式化后的响应数据
     """
-    response = {
-        "success": False,
-        "message": message,
-        "status_code": status_code,
-        "timestamp": datetime.now().isoformat()
-    }
+    response = _ERROR_TEMPLATE.copy()
+    response["message"] = message
+    response["status_code"] = status_code
+    response["timestamp"] = _now_iso()
     
     # 添加验证错误详情
     if errors:
@@ -275,7 +314,12 @@ def format_validation_error(
 
 
 class ApiJSONEncoder(json.JSONEncoder):
-    """自定义JSON编码器，用于处理特殊类型的序列化"""
+    """
+    自定义JSON编码器，用于处理特殊类型的序列化
+    
+    Flask应用和接口响应统一使用json_utils中的编解码器，本类保留给仍直接使用
+    标准库json的调用方，特殊类型的处理与json_utils.json_default一致。
+    """
     
     def default(self, obj: Any) -> Any:
         """
@@ -287,20 +331,4 @@ class ApiJSONEncoder(json.JSONEncoder):
         返回:
             Any: 序列化后的对象
         """
-        # 处理datetime对象
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-            
-        # 处理numpy数组
-        if hasattr(obj, 'tolist'):
-            return obj.tolist()
-            
-        # 处理pandas Series
-        if hasattr(obj, 'to_dict'):
-            return obj.to_dict()
-            
-        # 处理其他类型
-        try:
-            return super().default(obj)
-        except TypeError:
-            return str(obj) 
\ No newline at end of file
+        return json_default(obj)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON响应工具
+===========
+
+提供基于统一JSON编解码器的响应构造函数，响应体直接以UTF-8字节输出，
+中文内容不做ASCII转义。
+"""
+
+from typing import Any
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+from fastapi.responses import JSONResponse
+
+from data_insight.api.utils.json_utils import dumps, loads
+
+# JSON响应的MIME类型
+JSON_MIMETYPE = "application/json"
+
+
+def json_response(obj: Any, status: int = 200) -> Response:
+    """
+    构造Flask JSON响应
+
+    参数:
+        obj (Any): 响应数据
+        status (int, optional): HTTP状态码，默认为200
+
+    返回:
+        Response: Flask响应对象
+    """
+    return Response(dumps(obj), status=status, mimetype=JSON_MIMETYPE)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    使用统一JSON编码器渲染的FastAPI响应类
+
+    可直接返回，也可作为APIRouter的default_response_class使用。
+    """
+
+    def render(self, content: Any) -> bytes:
+        """
+        渲染响应体
+
+        参数:
+            content (Any): 响应数据
+
+        返回:
+            bytes: JSON字节串
+        """
+        return dumps(content)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    使用统一JSON编解码器的Flask JSON提供器
+
+    设置为app.json后，jsonify和request.get_json都使用统一编解码器。
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        将对象序列化为JSON字符串
+
+        参数:
+            obj (Any): 需要序列化的对象
+
+        返回:
+            str: JSON字符串
+        """
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """
+        解析JSON数据
+
+        参数:
+            s (Any): JSON字符串或字节串
+
+        返回:
+            Any: 解析后的对象
+        """
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """
+        构造JSON响应，响应体直接使用编码后的字节串
+
+        返回:
+            Response: Flask响应对象
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
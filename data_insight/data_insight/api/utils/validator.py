@@ -5,11 +5,21 @@ API请求验证工具
 提供API请求参数验证功能。
 """
 
-from typing import Dict, Any, List, Optional, Callable, Union, Type
+import re
+from typing import Dict, Any, List, Optional, Callable, Union, Type, Tuple
 from functools import wraps
 from flask import request, jsonify, abort, current_app
 
+from .codegen import CodeBuilder
 from .response_formatter import format_validation_error
+from data_insight.api.validation import load_request_json
+
+
+# 已编译的验证模式: id(schema) -> (schema, 验证函数)
+_COMPILED_SCHEMAS: Dict[int, Tuple[Dict[str, Dict[str, Any]], Callable[[Dict[str, Any]], Dict[str, Any]]]] = {}
+
+# validate_data使用的字段预处理结果: id(field_schema) -> (field_schema, 正则表达式, 枚举值集合)
+_PREPARED_FIELDS: Dict[int, Tuple[Dict[str, Any], Optional["re.Pattern"], Optional[frozenset]]] = {}
 
 
 class ValidationError(Exception):
@@ -62,18 +72,24 @@ class Validator:
         返回:
             callable: 包装后的函数
         """
+        # 在装饰时编译验证模式，请求时只调用编译后的验证函数
+        validate = Validator.compile(schema)
+        
         def decorator(f):
             @wraps(f)
             def wrapper(*args, **kwargs):
-                # 获取请求数据
+                # 获取请求数据，JSON请求体在同一请求内只解析一次，与路由函数共享
                 if request.is_json:
-                    data = request.json
+                    try:
+                        data = load_request_json()
+                    except ValueError:
+                        return jsonify({'error': '请求体不是有效的JSON数据'}), 400
                 else:
                     data = request.form.to_dict()
                 
                 # 验证请求数据
                 try:
-                    Validator.validate_data(data, schema)
+                    validate(data)
                 except ValidationError as e:
                     # 返回验证错误响应
                     return jsonify(format_validation_error(e.errors)), 422
@@ -85,6 +101,28 @@ class Validator:
         
         return decorator
     
+    @staticmethod
+    def compile(schema: Dict[str, Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """
+        将验证模式编译为验证函数
+        
+        模式只在首次编译时遍历一次，正则表达式、枚举值和嵌套模式都会预先处理，
+        编译结果按模式对象缓存。编译后的函数与validate_data行为一致。
+        
+        参数:
+            schema (Dict[str, Dict[str, Any]]): 验证模式
+            
+        返回:
+            Callable[[Dict[str, Any]], Dict[str, Any]]: 验证函数，验证失败时抛出ValidationError
+        """
+        cached = _COMPILED_SCHEMAS.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        
+        validate = _compile_schema(schema)
+        _COMPILED_SCHEMAS[id(schema)] = (schema, validate)
+        return validate
+    
     @staticmethod
     def validate_data(data: Dict[str, Any], schema: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -141,49 +179,30 @@ class Validator:
         异常:
             ValueError: 当验证失败时
         """
-        # 检查类型
+        # 检查类型，按类型名查表得到检查函数，未知类型不检查
         expected_type = field_schema.get("type")
         if expected_type:
-            # 处理特殊类型
-            if expected_type == "array":
-                if not isinstance(value, list):
-                    raise ValueError(f"应该是数组类型")
-            elif expected_type == "object":
-                if not isinstance(value, dict):
-                    raise ValueError(f"应该是对象类型")
-            # 处理基本类型
-            elif expected_type == "string" and not isinstance(value, str):
-                raise ValueError(f"应该是字符串类型")
-            elif expected_type == "number":
-                if not isinstance(value, (int, float)):
-                    try:
-                        value = float(value)
-                    except (ValueError, TypeError):
-                        raise ValueError(f"应该是数字类型")
-            elif expected_type == "integer":
-                if not isinstance(value, int):
-                    try:
-                        value = int(value)
-                    except (ValueError, TypeError):
-                        raise ValueError(f"应该是整数类型")
-            elif expected_type == "boolean":
-                if isinstance(value, bool):
-                    pass
-                elif isinstance(value, str):
-                    if value.lower() in ("true", "1", "yes"):
-                        value = True
-                    elif value.lower() in ("false", "0", "no"):
-                        value = False
-                    else:
-                        raise ValueError(f"应该是布尔类型")
-                elif isinstance(value, (int, float)):
-                    value = bool(value)
-                else:
-                    raise ValueError(f"应该是布尔类型")
+            check = _TYPE_CHECKS.get(expected_type)
+            if check is not None:
+                value = check(value)
+        
+        prepared = _PREPARED_FIELDS.get(id(field_schema))
+        if prepared is None or prepared[0] is not field_schema:
+            prepared = _prepare_field(field_schema)
+        _, pattern, enum_set = prepared
         
-        # 检查枚举值
+        # 检查枚举值，不可哈希的值回退到列表查找
         enum_values = field_schema.get("enum")
-        if enum_values is not None and value not in enum_values:
+        if enum_values is None:
+            in_enum = True
+        elif enum_set is not None:
+            try:
+                in_enum = value in enum_set
+            except TypeError:
+                in_enum = value in enum_values
+        else:
+            in_enum = value in enum_values
+        if not in_enum:
             enum_str = ", ".join([str(v) for v in enum_values])
             raise ValueError(f"值应该是以下之一: {enum_str}")
         
@@ -208,9 +227,7 @@ class Validator:
                 raise ValueError(f"长度不能大于{max_length}")
             
             # 检查正则表达式
-            import re
-            pattern = field_schema.get("pattern")
-            if pattern is not None and not re.match(pattern, value):
+            if pattern is not None and not pattern.match(value):
                 raise ValueError(f"格式不正确")
         
         # 检查数组长度
@@ -252,6 +269,280 @@ class Validator:
         return value
 
 
+def _prepare_field(field_schema: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional["re.Pattern"], Optional[frozenset]]:
+    """
+    预处理字段验证模式中的正则表达式和枚举值
+    
+    正则表达式预先编译，可哈希的枚举值转换为集合，结果按字段模式对象缓存。
+    
+    参数:
+        field_schema (Dict[str, Any]): 字段验证模式
+        
+    返回:
+        Tuple[Dict[str, Any], Optional[re.Pattern], Optional[frozenset]]: (字段验证模式, 正则表达式, 枚举值集合)
+    """
+    pattern = field_schema.get("pattern")
+    if pattern is not None:
+        pattern = re.compile(pattern)
+    
+    enum_set = None
+    enum_values = field_schema.get("enum")
+    if enum_values is not None:
+        try:
+            enum_set = frozenset(enum_values)
+        except TypeError:
+            enum_set = None
+    
+    prepared = (field_schema, pattern, enum_set)
+    _PREPARED_FIELDS[id(field_schema)] = prepared
+    return prepared
+
+
+def _check_array(value: Any) -> Any:
+    """检查数组类型"""
+    if not isinstance(value, list):
+        raise ValueError(f"应该是数组类型")
+    return value
+
+
+def _check_object(value: Any) -> Any:
+    """检查对象类型"""
+    if not isinstance(value, dict):
+        raise ValueError(f"应该是对象类型")
+    return value
+
+
+def _check_string(value: Any) -> Any:
+    """检查字符串类型"""
+    if not isinstance(value, str):
+        raise ValueError(f"应该是字符串类型")
+    return value
+
+
+def _check_number(value: Any) -> Any:
+    """检查数字类型，必要时转换为浮点数"""
+    if not isinstance(value, (int, float)):
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            raise ValueError(f"应该是数字类型")
+    return value
+
+
+def _check_integer(value: Any) -> Any:
+    """检查整数类型，必要时转换为整数"""
+    if not isinstance(value, int):
+        try:
+            value = int(value)
+        except (ValueError, TypeError):
+            raise ValueError(f"应该是整数类型")
+    return value
+
+
+def _check_boolean(value: Any) -> Any:
+    """检查布尔类型，必要时从字符串或数字转换"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.lower()
+        if lowered in ("true", "1", "yes"):
+            return True
+        if lowered in ("false", "0", "no"):
+            return False
+        raise ValueError(f"应该是布尔类型")
+    if isinstance(value, (int, float)):
+        return bool(value)
+    raise ValueError(f"应该是布尔类型")
+
+
+# 类型检查函数表
+_TYPE_CHECKS: Dict[str, Callable[[Any], Any]] = {
+    "array": _check_array,
+    "object": _check_object,
+    "string": _check_string,
+    "number": _check_number,
+    "integer": _check_integer,
+    "boolean": _check_boolean,
+}
+
+
+# 生成的验证函数可以直接引用的名称
+_CODEGEN_NAMESPACE: Dict[str, Any] = {
+    "ValidationError": ValidationError,
+    "_check_number": _check_number,
+    "_check_integer": _check_integer,
+    "_check_boolean": _check_boolean,
+}
+
+
+def _emit_raise(builder: CodeBuilder, indent: int, condition: str, message: str) -> None:
+    """生成条件不满足时抛出ValueError的语句"""
+    builder.emit_raise(indent, condition, "ValueError", message)
+
+
+def _emit_length_checks(builder: CodeBuilder, indent: int, min_length: Any, max_length: Any) -> None:
+    """生成长度检查语句"""
+    if min_length is not None:
+        _emit_raise(builder, indent, f"len(value) < {builder.const(min_length)}", f"长度不能小于{min_length}")
+    if max_length is not None:
+        _emit_raise(builder, indent, f"len(value) > {builder.const(max_length)}", f"长度不能大于{max_length}")
+
+
+def _emit_field(builder: CodeBuilder, indent: int, field_schema: Dict[str, Any]) -> None:
+    """
+    生成单个字段的验证语句
+    
+    生成的语句检查并转换变量value，验证失败时抛出ValueError，检查顺序与validate_data一致。
+    
+    参数:
+        builder (CodeBuilder): 源码生成器
+        indent (int): 缩进层级
+        field_schema (Dict[str, Any]): 字段验证模式
+    """
+    # 检查类型
+    expected_type = field_schema.get("type")
+    if expected_type == "array":
+        _emit_raise(builder, indent, "not isinstance(value, list)", "应该是数组类型")
+    elif expected_type == "object":
+        _emit_raise(builder, indent, "not isinstance(value, dict)", "应该是对象类型")
+    elif expected_type == "string":
+        _emit_raise(builder, indent, "not isinstance(value, str)", "应该是字符串类型")
+    elif expected_type == "number":
+        builder.emit(indent, "if not isinstance(value, (int, float)):")
+        builder.emit(indent + 1, "value = _check_number(value)")
+    elif expected_type == "integer":
+        builder.emit(indent, "if not isinstance(value, int):")
+        builder.emit(indent + 1, "value = _check_integer(value)")
+    elif expected_type == "boolean":
+        builder.emit(indent, "if value is not True and value is not False:")
+        builder.emit(indent + 1, "value = _check_boolean(value)")
+    
+    # 检查枚举值，可哈希的枚举值预先转换为集合
+    enum_values = field_schema.get("enum")
+    if enum_values is not None:
+        enum_message = builder.const(f"值应该是以下之一: {', '.join([str(v) for v in enum_values])}")
+        enum_list = builder.const(enum_values)
+        try:
+            enum_set = builder.const(frozenset(enum_values))
+        except TypeError:
+            enum_set = None
+        if enum_set is not None:
+            builder.emit(indent, "try:")
+            builder.emit(indent + 1, f"in_enum = value in {enum_set}")
+            builder.emit(indent, "except TypeError:")
+            builder.emit(indent + 1, f"in_enum = value in {enum_list}")
+            builder.emit(indent, "if not in_enum:")
+        else:
+            builder.emit(indent, f"if value not in {enum_list}:")
+        builder.emit(indent + 1, f"raise ValueError({enum_message})")
+    
+    # 检查数字范围
+    min_value = field_schema.get("min")
+    max_value = field_schema.get("max")
+    if min_value is not None or max_value is not None:
+        builder.emit(indent, "if isinstance(value, (int, float)):")
+        if min_value is not None:
+            _emit_raise(builder, indent + 1, f"value < {builder.const(min_value)}", f"不能小于{min_value}")
+        if max_value is not None:
+            _emit_raise(builder, indent + 1, f"value > {builder.const(max_value)}", f"不能大于{max_value}")
+    
+    # 检查字符串长度和格式
+    min_length = field_schema.get("minlength")
+    max_length = field_schema.get("maxlength")
+    pattern = field_schema.get("pattern")
+    if min_length is not None or max_length is not None or pattern is not None:
+        builder.emit(indent, "if isinstance(value, str):")
+        _emit_length_checks(builder, indent + 1, min_length, max_length)
+        if pattern is not None:
+            _emit_raise(builder, indent + 1, f"not {builder.const(re.compile(pattern))}.match(value)", "格式不正确")
+    
+    # 检查数组长度和元素
+    items_schema = field_schema.get("items")
+    if min_length is not None or max_length is not None or items_schema:
+        builder.emit(indent, "if isinstance(value, list):")
+        _emit_length_checks(builder, indent + 1, min_length, max_length)
+        if items_schema:
+            check_item = builder.const(_compile_field(items_schema))
+            builder.emit(indent + 1, "for i, item in enumerate(value):")
+            builder.emit(indent + 2, "try:")
+            builder.emit(indent + 3, f"{check_item}(item)")
+            builder.emit(indent + 2, "except ValueError as e:")
+            builder.emit(indent + 3, 'raise ValueError(f"索引{i}的元素无效: {str(e)}")')
+    
+    # 验证嵌套对象
+    properties = field_schema.get("properties")
+    if properties:
+        validate_properties = builder.const(_compile_schema(properties))
+        builder.emit(indent, "if isinstance(value, dict):")
+        builder.emit(indent + 1, "try:")
+        builder.emit(indent + 2, f"{validate_properties}(value)")
+        builder.emit(indent + 1, "except ValidationError as e:")
+        builder.emit(indent + 2, 'raise ValueError(f"子字段验证失败: {str(e)}")')
+    
+    # 自定义验证
+    custom_validator = field_schema.get("custom")
+    if callable(custom_validator):
+        builder.emit(indent, "try:")
+        builder.emit(indent + 1, f"value = {builder.const(custom_validator)}(value)")
+        builder.emit(indent, "except Exception as e:")
+        builder.emit(indent + 1, "raise ValueError(str(e))")
+
+
+def _compile_field(field_schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """
+    编译单个字段的验证模式
+    
+    参数:
+        field_schema (Dict[str, Any]): 字段验证模式
+        
+    返回:
+        Callable[[Any], Any]: 字段验证函数，返回验证后的值，验证失败时抛出ValueError
+    """
+    builder = CodeBuilder(_CODEGEN_NAMESPACE)
+    builder.emit(0, "def check(value):")
+    _emit_field(builder, 1, field_schema)
+    builder.emit(1, "return value")
+    return builder.build("check")
+
+
+def _compile_schema(schema: Dict[str, Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    编译验证模式
+    
+    为每个字段生成直线式的检查代码，请求时不再遍历模式字典。
+    
+    参数:
+        schema (Dict[str, Dict[str, Any]]): 验证模式
+        
+    返回:
+        Callable[[Dict[str, Any]], Dict[str, Any]]: 验证函数
+    """
+    builder = CodeBuilder(_CODEGEN_NAMESPACE)
+    builder.emit(0, "def validate(data):")
+    builder.emit(1, "errors = {}")
+    builder.emit(1, "validated = {}")
+    
+    for field, field_schema in schema.items():
+        name = builder.const(field)
+        builder.emit(1, f"if {name} in data:")
+        builder.emit(2, f"value = data[{name}]")
+        builder.emit(2, "try:")
+        _emit_field(builder, 3, field_schema)
+        builder.emit(3, f"validated[{name}] = value")
+        builder.emit(2, "except ValueError as e:")
+        builder.emit(3, f"errors.setdefault({name}, []).append(str(e))")
+        if field_schema.get("required", False):
+            required_message = builder.const(f"字段'{field}'为必填项")
+            builder.emit(1, "else:")
+            builder.emit(2, f"errors.setdefault({name}, []).append({required_message})")
+    
+    # 如果有错误，抛出异常
+    builder.emit(1, "if errors:")
+    builder.emit(2, "raise ValidationError(errors)")
+    builder.emit(1, "return validated")
+    return builder.build("validate")
+
+
 # 常用验证模式
 COMMON_SCHEMAS = {
     "id": {
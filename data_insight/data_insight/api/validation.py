@@ -6,7 +6,24 @@ API验证模块
 """
 
 import functools
-from flask import request, jsonify
+from flask import request, jsonify, g
+
+from data_insight.api.utils.json_utils import loads as json_loads
+
+def load_request_json():
+    """解析当前请求的JSON数据
+    
+    使用统一的JSON解码器解析请求体，同一请求内只解析一次
+    
+    Returns:
+        Any: 解析后的JSON数据
+        
+    Raises:
+        ValueError: 请求体不是有效的JSON时
+    """
+    if 'json_body' not in g:
+        g.json_body = json_loads(request.get_data())
+    return g.json_body
 
 def validate_request_json(required_fields=None):
     """验证请求JSON数据的装饰器
@@ -29,13 +46,18 @@ def validate_request_json(required_fields=None):
                 }), 400
             
             # 检查请求体是否为空
-            if not request.data:
+            if not request.get_data():
                 return jsonify({
                     'error': '请求体不能为空'
                 }), 400
             
             # 获取JSON数据
-            data = request.json
+            try:
+                data = load_request_json()
+            except ValueError:
+                return jsonify({
+                    'error': '请求体不是有效的JSON数据'
+                }), 400
             
             # 检查必需字段
             if required_fields:
@@ -10,6 +10,7 @@ FastAPI应用程序实例创建与配置。
 
 import os
 import time
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 
@@ -30,6 +31,8 @@ from data_insight.api.routes.export import router as export_router
 from data_insight.api.routes.suggestion import router as suggestion_router
 from data_insight.api.routes.metric_api import router as metric_router
 from data_insight.api.routes.chart_api import router as chart_router
+from data_insight.api.routes._analyzers import get_predictor
+from data_insight.api.utils.async_task import task_manager, shutdown_process_pool
 from data_insight.utils.metrics import increment_request_count, record_request_duration
 from data_insight.web import register_web_views
 from data_insight.services import init_services
@@ -41,6 +44,9 @@ from data_insight.utils.metrics import (
 # 设置日志
 logger = logging.getLogger(__name__)
 
+# 不记录请求指标的路径前缀
+UNINSTRUMENTED_PATH_PREFIXES = ("/metrics", "/health/liveness")
+
 
 def create_app(config: Optional[Dict[str, Any]] = None) -> FastAPI:
     """
@@ -85,6 +91,12 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> FastAPI:
     # 将配置添加到应用状态
     app.state.config = app_config
     
+    # 配置日志
+    logging.basicConfig(
+        level=app_config["LOG_LEVEL"],
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     # 配置CORS
     app.add_middleware(
         CORSMiddleware,
@@ -97,13 +109,14 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> FastAPI:
     # 添加处理时间中间件
     @app.middleware("http")
     async def metrics_middleware(request: Request, call_next):
-        # 排除指标路由本身，避免无限递归
-        if not request.url.path.startswith("/metrics"):
+        # 排除指标路由本身（避免无限递归）和高频的活跃性探针
+        instrumented = not request.url.path.startswith(UNINSTRUMENTED_PATH_PREFIXES)
+        if instrumented:
             start_time = time.time()
             
         response = await call_next(request)
         
-        if not request.url.path.startswith("/metrics"):
+        if instrumented:
             process_time = time.time() - start_time
             response.headers["X-Process-Time"] = str(process_time)
             
@@ -113,8 +126,8 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> FastAPI:
         
         return response
     
-    # 注册健康检查路由
-    app.include_router(health_router, prefix="/health")
+    # 注册健康检查路由（路由器自带/health前缀）
+    app.include_router(health_router)
     
     # 注册API文档路由
     app.include_router(docs_router, prefix="/docs")
@@ -194,6 +207,10 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> FastAPI:
         # 初始化指标
         get_metrics_registry()
         
+        # 预热预测模型，首次拟合的开销不计入请求
+        if await asyncio.get_running_loop().run_in_executor(None, get_predictor().warmup):
+            logger.info("预测模型已预热")
+        
         logger.info("应用启动完成")
     
     # 应用关闭事件
@@ -203,6 +220,8 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> FastAPI:
         logger.info("应用正在关闭...")
         
         # 在这里添加清理资源的代码
+        task_manager.shutdown()
+        shutdown_process_pool()
         
         logger.info("应用已关闭")
     
@@ -27,7 +27,6 @@ from .predictor import Predictor
 from .attribution_analyzer import AttributionAnalyzer
 from .root_cause_analyzer import RootCauseAnalyzer
 from .correlation_analyzer import CorrelationAnalyzer
-from .trend_analyzer import TrendAnalyzer
 from .suggestion_generator import SuggestionGenerator
 from .text_generator import TextGenerator
 
@@ -43,4 +42,26 @@ __all__ = [
     'TrendAnalyzer',
     'SuggestionGenerator',
     'TextGenerator'
-] 
\ No newline at end of file
+] 
+
+
+def __getattr__(name):
+    """
+    按需导入趋势分析器
+    
+    趋势分析器依赖statsmodels的LOWESS平滑和季节性分解模块，
+    首次访问TrendAnalyzer时才导入，导入其他核心模块时不承担这部分开销。
+    
+    参数:
+        name (str): 属性名
+        
+    返回:
+        Any: 属性值
+        
+    异常:
+        AttributeError: 属性不存在时
+    """
+    if name == 'TrendAnalyzer':
+        from .trend_analyzer import TrendAnalyzer
+        return TrendAnalyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
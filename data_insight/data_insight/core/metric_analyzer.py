@@ -109,7 +109,7 @@ class MetricAnalyzer(BaseAnalyzer):
         
         # 异常检测
         is_anomaly, anomaly_degree = detect_anomaly(current_value, historical_values)
-        is_higher_anomaly = current_value > np.mean(historical_values) if historical_values else None
+        is_higher_anomaly = bool(current_value > np.mean(historical_values)) if historical_values else None
         
         # 趋势分析
         if historical_values and len(historical_values) >= 2:
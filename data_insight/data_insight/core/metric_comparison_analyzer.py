@@ -161,6 +161,12 @@ class MetricComparisonAnalyzer(BaseAnalyzer):
             if "historical_values" not in metric or len(metric["historical_values"]) < 2:
                 return correlations  # 返回空列表，表示无法进行相关性分析
         
+        # 所有指标历史值长度一致时，一次性计算相关系数矩阵
+        lengths = {len(metric["historical_values"]) for metric in metrics}
+        if len(lengths) == 1:
+            matrix = np.asarray([metric["historical_values"] for metric in metrics], dtype=np.float64)
+            return self.analyze_correlation_matrix(matrix, [metric["name"] for metric in metrics])
+        
         # 分析指标对之间的相关性
         for i in range(len(metrics)):
             for j in range(i+1, len(metrics)):
@@ -179,8 +185,9 @@ class MetricComparisonAnalyzer(BaseAnalyzer):
                 values1 = values1[-min_length:]
                 values2 = values2[-min_length:]
                 
-                # 计算相关系数
+                # 计算相关系数，转换为Python原生类型便于直接序列化
                 corr_coefficient, p_value = stats.pearsonr(values1, values2)
+                corr_coefficient, p_value = float(corr_coefficient), float(p_value)
                 
                 # 判断相关性显著性
                 is_significant = p_value < 0.05
@@ -208,6 +215,60 @@ class MetricComparisonAnalyzer(BaseAnalyzer):
         
         return correlations
     
+    def analyze_correlation_matrix(self, matrix: np.ndarray, names: List[str]) -> List[Dict[str, Any]]:
+        """
+        基于指标矩阵分析指标之间的相关性
+        
+        通过np.corrcoef一次性计算所有指标对的皮尔逊相关系数，
+        P值由t分布批量计算，结果格式与逐对分析一致。
+        
+        参数:
+            matrix (np.ndarray): 形状为(指标数, 样本数)的二维数组，每行为一个指标的历史值
+            names (List[str]): 与矩阵行对应的指标名称
+            
+        返回:
+            List[Dict[str, Any]]: 相关性分析结果
+        """
+        n_metrics, n_samples = matrix.shape
+        if n_metrics < 2 or n_samples < 2:
+            return []
+        
+        # 相关系数矩阵及其上三角（不含对角线）
+        corr_matrix = np.clip(np.corrcoef(matrix), -1.0, 1.0)
+        rows, cols = np.triu_indices(n_metrics, k=1)
+        coefficients = corr_matrix[rows, cols]
+        
+        # 与stats.pearsonr相同的双侧检验P值
+        df = n_samples - 2
+        if df > 0:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t_values = np.abs(coefficients) * np.sqrt(df / (1.0 - coefficients ** 2))
+            p_values = np.where(np.isnan(coefficients), np.nan, 2 * stats.t.sf(t_values, df))
+        else:
+            p_values = np.where(np.isnan(coefficients), np.nan, 1.0)
+        
+        correlations = []
+        for i, j, corr_coefficient, p_value in zip(rows.tolist(), cols.tolist(),
+                                                   coefficients.tolist(), p_values.tolist()):
+            is_significant = p_value < 0.05
+            direction = "正相关" if corr_coefficient > 0 else "负相关" if corr_coefficient < 0 else "不相关"
+            strength = self._describe_correlation_strength(abs(corr_coefficient))
+            significance = "，且具有统计显著性" if is_significant else "，但不具有统计显著性"
+            
+            correlations.append({
+                "指标1": names[i],
+                "指标2": names[j],
+                "相关系数": corr_coefficient,
+                "P值": p_value,
+                "显著性": is_significant,
+                "相关性类型": "正相关" if corr_coefficient > 0 else "负相关" if corr_coefficient < 0 else "无相关",
+                "相关性强度": strength,
+                "样本数量": n_samples,
+                "描述": f"{names[i]}与{names[j]}呈{direction}({strength}){significance}"
+            })
+        
+        return correlations
+    
     def _analyze_metric_groups(self, metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         将指标分组进行群组分析
@@ -5,14 +5,46 @@
 实现时间序列预测功能，包括趋势预测和异常预测。
 """
 
+import logging
+import warnings
+from dataclasses import dataclass, field
+
 import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
+from scipy.stats import norm
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
 from sklearn.linear_model import LinearRegression
 
 from data_insight.core.base_analyzer import BaseAnalyzer
 from data_insight.utils.data_utils import detect_seasonal_pattern
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ForecastResult:
+    """预测结果模型，预测值和区间上下限按列存储为数组"""
+    
+    pred: np.ndarray  # 预测值
+    lower: np.ndarray  # 预测区间下限
+    upper: np.ndarray  # 预测区间上限
+    periods: List[str] = field(default_factory=list)  # 预测周期
+    
+    def to_cn_dict(self) -> Dict[str, Any]:
+        """
+        转换为中文键的预测结果字典
+        
+        数组不做转换，由JSON编码器直接序列化，仅在构造响应时调用。
+        
+        返回:
+            Dict[str, Any]: 包含预测值、预测区间和预测周期的字典
+        """
+        return {
+            "预测值": self.pred,
+            "预测区间": np.column_stack((self.lower, self.upper)),
+            "预测周期": self.periods
+        }
+
 
 class Predictor(BaseAnalyzer):
     """
@@ -34,13 +66,35 @@ class Predictor(BaseAnalyzer):
         self.confidence_level = 0.95  # 预测置信度
         self.min_history_length = 12  # 最小历史数据长度
     
+    def warmup(self) -> bool:
+        """
+        预热预测模型
+        
+        在服务启动时用一段合成序列完成一次预测，使模型相关模块的延迟导入
+        和首次拟合的初始化开销不落在第一个请求上。预热走与请求相同的forecast入口，
+        包括季节性检测和模型拟合。
+        
+        返回:
+            bool: 预热是否成功，失败原因记录在警告日志中
+        """
+        values = np.linspace(1.0, 2.0, self.min_history_length) + np.resize([0.0, 0.1], self.min_history_length)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                self.forecast(values)
+                self._forecast_anomaly(values, float(values[-1]))
+        except Exception as e:
+            logger.warning(f"预测模型预热失败: {str(e)}")
+            return False
+        return True
+    
     def analyze(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         分析数据并生成预测结果
         
         参数:
             data (Dict[str, Any]): 输入数据，应包含以下字段:
-                - values: 历史值列表
+                - values: 历史值列表或一维数组
                 - time_periods: 时间周期列表
                 - current_value: 当前值
                 - current_period: 当前时间周期
@@ -91,9 +145,9 @@ class Predictor(BaseAnalyzer):
                 "历史数据长度": len(values)
             },
             "预测结果": {
-                "预测值": forecast_result["forecast"],
-                "预测区间": forecast_result["intervals"],
-                "预测周期": forecast_result["periods"],
+                "预测值": forecast_result.pred.tolist(),
+                "预测区间": np.column_stack((forecast_result.lower, forecast_result.upper)).tolist(),
+                "预测周期": forecast_result.periods,
                 "置信度": self.confidence_level,
                 "季节性": {
                     "是否存在": seasonality is not None,
@@ -106,19 +160,38 @@ class Predictor(BaseAnalyzer):
         
         return result
     
-    def _forecast(self, values: List[float], seasonality: Optional[int] = None) -> Dict[str, Any]:
+    def forecast(self, values: Any, periods: Optional[int] = None) -> ForecastResult:
+        """
+        预测历史序列的未来值
+        
+        参数:
+            values (Any): 历史值列表或一维数组
+            periods (Optional[int]): 预测周期数，默认为forecast_periods
+            
+        返回:
+            ForecastResult: 预测结果
+        """
+        values = np.asarray(values, dtype=np.float64)
+        seasonality, _ = detect_seasonal_pattern(values)
+        return self._forecast(values, seasonality, periods)
+    
+    def _forecast(self, values: Any, seasonality: Optional[int] = None,
+                  periods: Optional[int] = None) -> ForecastResult:
         """
         使用Holt-Winters方法进行时间序列预测
         
         参数:
-            values (List[float]): 历史值列表
+            values (Any): 历史值列表或一维数组
             seasonality (Optional[int]): 季节性周期
+            periods (Optional[int]): 预测周期数，默认为forecast_periods
             
         返回:
-            Dict[str, Any]: 预测结果
+            ForecastResult: 预测结果
         """
+        periods = periods or self.forecast_periods
+        
         # 转换为numpy数组
-        data = np.array(values)
+        data = np.asarray(values, dtype=np.float64)
         
         # 创建预测模型
         if seasonality is not None:
@@ -139,22 +212,20 @@ class Predictor(BaseAnalyzer):
         fitted_model = model.fit()
         
         # 生成预测
-        forecast = fitted_model.forecast(self.forecast_periods)
-        
-        # 计算预测区间
-        intervals = fitted_model.get_prediction(
-            start=len(data),
-            end=len(data) + self.forecast_periods - 1
-        ).conf_int(alpha=1-self.confidence_level)
+        forecast = np.asarray(fitted_model.forecast(periods), dtype=np.float64)
         
-        # 生成预测周期
-        periods = [f"T+{i+1}" for i in range(self.forecast_periods)]
+        # 计算预测区间: Holt-Winters拟合结果不提供预测区间，按拟合残差的标准差估计，
+        # 区间宽度随预测步数的平方根增大
+        z = norm.ppf(0.5 + self.confidence_level / 2)
+        sigma = float(np.std(fitted_model.resid, ddof=1)) if data.size > 1 else 0.0
+        margin = z * sigma * np.sqrt(np.arange(1, periods + 1, dtype=np.float64))
         
-        return {
-            "forecast": forecast.tolist(),
-            "intervals": intervals.tolist(),
-            "periods": periods
-        }
+        return ForecastResult(
+            pred=forecast,
+            lower=forecast - margin,
+            upper=forecast + margin,
+            periods=[f"T+{i+1}" for i in range(periods)]
+        )
     
     def _forecast_anomaly(self, values: List[float], current_value: float) -> Dict[str, Any]:
         """
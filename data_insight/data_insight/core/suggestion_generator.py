@@ -155,7 +155,7 @@ class SuggestionGenerator(BaseAnalyzer):
             "建议列表": sorted_suggestions,
             "总体效果": overall_effect,
             "建议数量": len(sorted_suggestions),
-            "高优先级建议数": len([s for s in sorted_suggestions if s["优先级"] == "高"])
+            "高优先级建议数": sum(1 for s in sorted_suggestions if s["优先级"] == "高")
         }
     
     def _generate_metric_suggestions(self, metric_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -90,15 +90,99 @@ class TrendAnalyzer(BaseAnalyzer):
         # 验证输入数据
         self._validate_inputs(values, timestamps)
         
-        # 将时间戳转换为日期对象
+        # 将时间戳转换为日期对象并检测数据频率
+        dates, freq = self._prepare_dates(timestamps)
+        
+        return self._analyze_series(metric_name, values, dates, freq,
+                                    trend_method, seasonality, detect_inflections)
+    
+    def analyze_batch(self,
+                      metric_names: List[str],
+                      values_list: List[List[float]],
+                      timestamps: List[str],
+                      trend_method: str = 'auto',
+                      seasonality: bool = True,
+                      detect_inflections: bool = True) -> List[TrendResult]:
+        """
+        批量分析共享同一组时间戳的多个指标
+        
+        时间戳只验证、解析和检测频率一次，各指标再分别进行趋势分析，
+        结果与逐个调用analyze相同。
+        
+        参数:
+            metric_names (List[str]): 指标名称列表
+            values_list (List[List[float]]): 各指标的值列表，与metric_names一一对应
+            timestamps (List[str]): 所有指标共享的时间戳列表
+            trend_method (str): 趋势分析方法，可选'linear'、'exponential'、'lowess'或'auto'
+            seasonality (bool): 是否分析季节性
+            detect_inflections (bool): 是否检测拐点
+            
+        返回:
+            List[TrendResult]: 与metric_names顺序一致的趋势分析结果列表
+            
+        异常:
+            ValueError: 当输入数据无效时
+        """
+        if len(metric_names) != len(values_list):
+            raise ValueError("指标名称列表和值列表数量必须相同")
+        if not values_list:
+            return []
+        
+        self.logger.info(f"开始批量趋势分析，指标数: {len(metric_names)}, 方法: {trend_method}")
+        
+        # 验证输入数据，时间戳只需验证一次
+        self._validate_inputs(values_list[0], timestamps)
+        for metric_name, values in zip(metric_names, values_list):
+            if len(values) != len(timestamps):
+                raise ValueError(f"指标 {metric_name} 的值列表和时间戳列表长度必须相同")
+        
+        dates, freq = self._prepare_dates(timestamps)
+        
+        return [
+            self._analyze_series(metric_name, values, dates, freq,
+                                 trend_method, seasonality, detect_inflections)
+            for metric_name, values in zip(metric_names, values_list)
+        ]
+    
+    def _prepare_dates(self, timestamps: List[str]) -> Tuple[List[datetime], str]:
+        """
+        解析时间戳并检测数据频率
+        
+        参数:
+            timestamps (List[str]): 时间戳列表
+            
+        返回:
+            Tuple[List[datetime], str]: 日期列表和数据频率
+        """
         dates = [pd.to_datetime(ts) for ts in timestamps]
+        return dates, detect_frequency(dates)
+    
+    def _analyze_series(self,
+                        metric_name: str,
+                        values: List[float],
+                        dates: List[datetime],
+                        freq: str,
+                        trend_method: str,
+                        seasonality: bool,
+                        detect_inflections: bool) -> TrendResult:
+        """
+        基于已解析的日期分析单个指标的趋势
         
+        参数:
+            metric_name (str): 指标名称
+            values (List[float]): 指标值列表
+            dates (List[datetime]): 日期列表
+            freq (str): 数据频率
+            trend_method (str): 趋势分析方法
+            seasonality (bool): 是否分析季节性
+            detect_inflections (bool): 是否检测拐点
+            
+        返回:
+            TrendResult: 趋势分析结果
+        """
         # 创建时间序列数据
         ts_data = pd.Series(values, index=dates)
         
-        # 检测数据频率
-        freq = detect_frequency(dates)
-        
         # 自动选择趋势方法
         if trend_method == 'auto':
             trend_method = self._auto_select_trend_method(values, len(values))
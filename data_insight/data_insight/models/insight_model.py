@@ -8,6 +8,10 @@
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, field
 import json
+import sys
+
+# 趋势模型实例数量多，Python 3.10及以上使用slots减小实例并加快属性访问
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 @dataclass
@@ -301,7 +305,7 @@ class CorrelationResult:
         return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TrendItem:
     """趋势项模型"""
     
@@ -312,7 +316,7 @@ class TrendItem:
     anomaly_degree: float = 0.0  # 异常程度
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TrendPattern:
     """趋势模式模型"""
     
@@ -324,7 +328,7 @@ class TrendPattern:
     description: str = ""  # 模式描述
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TrendInflection:
     """趋势拐点模型"""
     
@@ -335,7 +339,7 @@ class TrendInflection:
     description: str = ""  # 拐点描述
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TrendResult:
     """趋势分析结果模型"""
     
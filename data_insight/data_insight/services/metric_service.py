@@ -5,17 +5,49 @@
 提供指标分析相关的服务功能，作为API和核心分析模块之间的桥梁。
 """
 
+import json
 import logging
+import threading
+import warnings
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Union
-from functools import lru_cache
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from ..core.analysis.metric import MetricAnalyzer
 from ..core.analysis.comparison import ComparisonAnalyzer
+from ..core.metric_comparison_analyzer import MetricComparisonAnalyzer
 from ..core.prediction.time_series import TimeSeriesPredictor
 from ..core.generation.text import TextGenerator
 from ..config import settings
 
 
+class BatchValidationError(ValueError):
+    """
+    批量验证错误
+    
+    一次性记录所有无效的指标。
+    """
+    
+    def __init__(self, errors: Dict[Any, str]):
+        """
+        初始化批量验证错误
+        
+        参数:
+            errors (Dict[Any, str]): 指标标识到错误信息的映射
+        """
+        self.errors = errors
+        self.invalid_ids = list(errors)
+        message = "; ".join(f"{metric_id}: {reason}" for metric_id, reason in errors.items())
+        super().__init__(f"指标数据格式无效: {message}")
+
+
 class MetricService:
     """
     指标服务
@@ -28,14 +60,105 @@ class MetricService:
         self.logger = logging.getLogger("data_insight.services.metric")
         self.metric_analyzer = MetricAnalyzer()
         self.comparison_analyzer = ComparisonAnalyzer()
+        self.correlation_analyzer = MetricComparisonAnalyzer()
         self.predictor = TimeSeriesPredictor()
         self.text_generator = TextGenerator()
         
         # 设置缓存
         self.cache_enabled = True
         self.cache_size = 100
+        self.comparison_cache_size = 50
+        self.prediction_cache_size = 50
+        
+        # 结果缓存: 缓存键 -> 结果，按最近使用顺序排列，服务实例在线程间共享，读写需加锁
+        self._cache_lock = threading.Lock()
+        self._analysis_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._comparison_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._prediction_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+    
+    @staticmethod
+    def _key_default(value: Any) -> Any:
+        """
+        序列化缓存键时转换NumPy类型
+        
+        参数:
+            value (Any): 无法直接序列化的值
+            
+        返回:
+            Any: 可序列化的值
+            
+        异常:
+            TypeError: 值无法无歧义地序列化时
+        """
+        if isinstance(value, (np.ndarray, np.generic)):
+            return value.tolist()
+        raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+    
+    def _make_key(self, metric_data: Any, context: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
+        """
+        根据请求数据生成缓存键
+        
+        按键排序序列化后的字节串直接作为缓存键，只有内容完全相同的请求才会命中，
+        不存在哈希碰撞。
+        
+        参数:
+            metric_data (Any): 指标数据
+            context (Dict[str, Any], optional): 上下文信息
+            
+        返回:
+            Optional[bytes]: 缓存键，数据中含有无法序列化的值时返回None，表示不缓存
+        """
+        payload = [metric_data, context]
+        try:
+            if ORJSON_AVAILABLE:
+                return orjson.dumps(payload, default=self._key_default,
+                                    option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+            return json.dumps(payload, sort_keys=True, default=self._key_default,
+                              separators=(',', ':')).encode('utf-8')
+        except TypeError:
+            return None
+    
+    def _get_cached(self, cache: "OrderedDict[bytes, Dict[str, Any]]",
+                    key: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """
+        从缓存中获取结果
+        
+        参数:
+            cache (OrderedDict): 结果缓存
+            key (bytes, optional): 缓存键
+            
+        返回:
+            Optional[Dict[str, Any]]: 缓存的结果，未命中时返回None
+        """
+        if not self.cache_enabled or key is None:
+            return None
+        
+        with self._cache_lock:
+            result = cache.get(key)
+            if result is not None:
+                cache.move_to_end(key)
+            return result
+    
+    def _set_cached(self, cache: "OrderedDict[bytes, Dict[str, Any]]", key: Optional[bytes],
+                    result: Dict[str, Any], maxsize: int) -> None:
+        """
+        写入缓存，超出容量时淘汰最久未使用的结果
+        
+        参数:
+            cache (OrderedDict): 结果缓存
+            key (bytes, optional): 缓存键
+            result (Dict[str, Any]): 结果
+            maxsize (int): 缓存容量
+        """
+        if not self.cache_enabled or key is None:
+            return
+        
+        with self._cache_lock:
+            cache[key] = result
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
     
-    @lru_cache(maxsize=100)
     def analyze_metric(self, metric_data: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         分析单个指标数据
@@ -48,6 +171,11 @@ class MetricService:
             Dict[str, Any]: 分析结果，包括分析数据和文本解读
         """
         try:
+            cache_key = self._make_key(metric_data, context)
+            cached = self._get_cached(self._analysis_cache, cache_key)
+            if cached is not None:
+                return cached
+            
             self.logger.info(f"开始分析指标: {metric_data.get('name', '未命名指标')}")
             
             # 准备分析数据
@@ -68,6 +196,8 @@ class MetricService:
                 "insight": insight_text
             }
             
+            self._set_cached(self._analysis_cache, cache_key, result, self.cache_size)
+            
             self.logger.info(f"指标分析完成: {metric_data.get('name', '未命名指标')}")
             return result
             
@@ -75,20 +205,44 @@ class MetricService:
             self.logger.error(f"指标分析异常: {str(e)}", exc_info=True)
             raise
     
-    @lru_cache(maxsize=50)
     def compare_metrics(self, metrics_data: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         比较多个指标数据
         
+        已弃用，请直接使用compare_metrics_list传入指标列表。
+        
         参数:
             metrics_data (Dict[str, Any]): 多个指标数据
             context (Dict[str, Any], optional): 上下文信息
             
+        返回:
+            Dict[str, Any]: 对比分析结果，包括分析数据和文本解读
+        """
+        warnings.warn(
+            "compare_metrics已弃用，请使用compare_metrics_list",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        return self.compare_metrics_list(metrics_data.get("metrics", []), context)
+    
+    def compare_metrics_list(self, metrics: List[Dict[str, Any]],
+                             context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        比较多个指标数据
+        
+        参数:
+            metrics (List[Dict[str, Any]]): 指标数据列表
+            context (Dict[str, Any], optional): 上下文信息
+            
         返回:
             Dict[str, Any]: 对比分析结果，包括分析数据和文本解读
         """
         try:
-            metrics = metrics_data.get("metrics", [])
+            cache_key = self._make_key(metrics, context)
+            cached = self._get_cached(self._comparison_cache, cache_key)
+            if cached is not None:
+                return cached
+            
             self.logger.info(f"开始对比分析 {len(metrics)} 个指标")
             
             # 准备分析数据
@@ -109,14 +263,59 @@ class MetricService:
                 "insight": insight_text
             }
             
-            self.logger.info(f"指标对比分析完成")
+            self._set_cached(self._comparison_cache, cache_key, result, self.comparison_cache_size)
+            
+            self.logger.info("指标对比分析完成")
             return result
             
         except Exception as e:
             self.logger.error(f"指标对比分析异常: {str(e)}", exc_info=True)
             raise
     
-    @lru_cache(maxsize=50)
+    def compare_metrics_matrix(self, matrix: np.ndarray, metric_ids: List[Any],
+                               context: Optional[Dict[str, Any]] = None,
+                               names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        基于指标矩阵进行相关性分析
+        
+        参数:
+            matrix (np.ndarray): 形状为(指标数, 样本数)的二维数组，每行为一个指标的历史值
+            metric_ids (List[Any]): 与矩阵行对应的指标标识
+            context (Dict[str, Any], optional): 上下文信息
+            names (List[str], optional): 指标名称，默认使用指标标识
+            
+        返回:
+            Dict[str, Any]: 相关性分析结果，包括分析数据和文本解读
+        """
+        try:
+            names = list(names) if names is not None else [str(metric_id) for metric_id in metric_ids]
+            self.logger.info(f"开始相关性分析 {len(metric_ids)} 个指标")
+            
+            correlations = self.correlation_analyzer.analyze_correlation_matrix(matrix, names)
+            analysis_result = {
+                "基本信息": {
+                    "指标数量": len(metric_ids),
+                    "指标名称列表": names,
+                    "指标标识列表": list(metric_ids),
+                    "样本数量": int(matrix.shape[1])
+                },
+                "相关性分析": correlations,
+                "context": context or {}
+            }
+            
+            # 生成相关性解读文本，文本生成器要求分析结果封装在data字段中
+            insight_text = self.text_generator.generate({"data": analysis_result}, context)
+            
+            self.logger.info("指标相关性分析完成")
+            return {
+                "analysis": analysis_result,
+                "insight": insight_text
+            }
+            
+        except Exception as e:
+            self.logger.error(f"指标相关性分析异常: {str(e)}", exc_info=True)
+            raise
+    
     def predict_metric(self, metric_data: Dict[str, Any], horizon: int = 7, 
                       confidence_level: float = 0.95) -> Dict[str, Any]:
         """
@@ -131,6 +330,11 @@ class MetricService:
             Dict[str, Any]: 预测结果，包括预测值和置信区间
         """
         try:
+            cache_key = self._make_key(metric_data, {"horizon": horizon, "confidence_level": confidence_level})
+            cached = self._get_cached(self._prediction_cache, cache_key)
+            if cached is not None:
+                return cached
+            
             self.logger.info(f"开始预测指标: {metric_data.get('name', '未命名指标')}, 步长: {horizon}")
             
             # 准备预测数据
@@ -155,6 +359,8 @@ class MetricService:
                 "insight": insight_text
             }
             
+            self._set_cached(self._prediction_cache, cache_key, result, self.prediction_cache_size)
+            
             self.logger.info(f"指标预测完成: {metric_data.get('name', '未命名指标')}")
             return result
             
@@ -194,6 +400,13 @@ class MetricService:
         # 如果有历史值，验证是列表类型
         if "historical_values" in metric_data:
             historical_values = metric_data.get("historical_values")
+            
+            # 已转换的数值数组只需检查维度和数据类型
+            if isinstance(historical_values, np.ndarray):
+                if historical_values.ndim != 1 or historical_values.dtype.kind not in "biuf":
+                    raise ValueError("historical_values中所有元素必须是数值类型")
+                return True
+            
             if not isinstance(historical_values, list):
                 raise ValueError("historical_values必须是列表类型")
             
@@ -203,9 +416,70 @@ class MetricService:
         
         return True
     
+    def validate_metrics_batch(self, metrics: List[Dict[str, Any]]) -> bool:
+        """
+        批量验证多个指标数据格式
+        
+        按字段对所有指标统一检查，数值检查在NumPy中完成，
+        验证失败时一次性报告所有无效指标。
+        
+        参数:
+            metrics (List[Dict[str, Any]]): 指标数据列表
+            
+        返回:
+            bool: 数据格式是否有效
+            
+        异常:
+            BatchValidationError: 如果有指标数据格式无效
+        """
+        errors: Dict[int, str] = {}
+        
+        # 检查数据类型和必需字段
+        for field in ("name", "value"):
+            errors.update({
+                i: f"缺少必需字段: {field}" for i, metric in enumerate(metrics)
+                if i not in errors and isinstance(metric, dict) and field not in metric
+            })
+        errors.update({i: "指标数据必须是字典类型" for i, metric in enumerate(metrics) if not isinstance(metric, dict)})
+        
+        # 验证value是有限的数值
+        candidates = [i for i in range(len(metrics)) if i not in errors]
+        errors.update({
+            i: f"指标值必须是数值类型，但实际是{type(metrics[i]['value'])}" for i in candidates
+            if not isinstance(metrics[i]["value"], (int, float))
+        })
+        numeric = np.array([i for i in candidates if i not in errors], dtype=np.intp)
+        if numeric.size:
+            values = np.fromiter((metrics[i]["value"] for i in numeric), dtype=np.float64, count=numeric.size)
+            errors.update({int(i): "指标值必须是有限数值" for i in numeric[~np.isfinite(values)]})
+        
+        # 验证历史值
+        for i, metric in enumerate(metrics):
+            if i in errors or "historical_values" not in metric:
+                continue
+            
+            historical_values = metric["historical_values"]
+            if isinstance(historical_values, list):
+                historical_values = np.asarray(historical_values)
+            elif not isinstance(historical_values, np.ndarray):
+                errors[i] = "historical_values必须是列表类型"
+                continue
+            
+            if historical_values.ndim != 1 or historical_values.dtype.kind not in "biuf":
+                errors[i] = "historical_values中所有元素必须是数值类型"
+        
+        if errors:
+            raise BatchValidationError({
+                metrics[i].get("metric_id", i) if isinstance(metrics[i], dict) else i: errors[i]
+                for i in sorted(errors)
+            })
+        
+        return True
+    
     def invalidate_cache(self):
         """清除缓存"""
-        self.analyze_metric.cache_clear()
-        self.compare_metrics.cache_clear()
-        self.predict_metric.cache_clear()
+        with self._cache_lock:
+            self._analysis_cache.clear()
+            self._comparison_cache.clear()
+            self._prediction_cache.clear()
         self.logger.info("指标服务缓存已清除") 
\ No newline at end of file
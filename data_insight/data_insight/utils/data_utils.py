@@ -114,7 +114,8 @@ def detect_anomaly(
     else:
         anomaly_degree = 0.0
     
-    return is_anomaly, anomaly_degree
+    # 转换为Python原生类型，便于直接序列化
+    return bool(is_anomaly), float(anomaly_degree)
 
 
 def detect_anomaly_enhanced(
@@ -482,6 +483,6 @@ def calculate_trend(values: List[float]) -> Tuple[str, float]:
         trend_type = "强烈下降"
     
     # 计算趋势强度 (标准化斜率的绝对值)
-    trend_strength = abs(normalized_slope)
+    trend_strength = float(abs(normalized_slope))
     
     return trend_type, trend_strength 
\ No newline at end of file
@@ -12,7 +12,7 @@ import time
 import threading
 import os
 import psutil
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Iterator
 import logging
 
 # 设置日志记录器
@@ -207,8 +207,18 @@ class MetricsRegistry:
         返回:
             str: Prometheus格式的指标数据
         """
-        lines = []
+        return b"".join(self.iter_prometheus_bytes()).decode("utf-8")
+    
+    def iter_prometheus_bytes(self) -> Iterator[bytes]:
+        """
+        逐个指标生成Prometheus格式的指标数据
         
+        每次生成一个指标的完整文本（帮助信息、类型信息和所有取值），
+        可直接用于流式响应，避免一次性拼接全部输出。
+        
+        返回:
+            Iterator[bytes]: UTF-8编码的指标数据块
+        """
         # 添加系统基础指标
         self._add_system_metrics()
         
@@ -217,11 +227,13 @@ class MetricsRegistry:
         if "process_uptime_seconds" in self._metrics:
             self.set("process_uptime_seconds", uptime)
         
-        # 转换指标为Prometheus格式
-        for name, metric_data in self._metrics.items():
+        # 复制指标列表，生成过程中其他请求可能更新指标
+        for name, metric_data in list(self._metrics.items()):
             # 添加帮助信息和类型信息
-            lines.append(f"# HELP {name} {self._descriptions.get(name, '')}")
-            lines.append(f"# TYPE {name} {self._metric_types.get(name, 'untyped')}")
+            lines = [
+                f"# HELP {name} {self._descriptions.get(name, '')}",
+                f"# TYPE {name} {self._metric_types.get(name, 'untyped')}"
+            ]
             
             # 添加指标值
             if not self._labels[name]:
@@ -229,7 +241,7 @@ class MetricsRegistry:
                 lines.append(f"{name} {metric_data}")
             else:
                 # 有标签的指标
-                for label_key, value in metric_data.items():
+                for label_key, value in list(metric_data.items()):
                     if not label_key:  # 跳过空标签键
                         continue
                     
@@ -243,8 +255,9 @@ class MetricsRegistry:
                     # 构建标签字符串
                     label_str = ",".join(f'{k}="{v}"' for k, v in label_pairs.items())
                     lines.append(f"{name}{{{label_str}}} {value}")
-        
-        return "\n".join(lines)
+            
+            lines.append("")
+            yield "\n".join(lines).encode("utf-8")
     
     def _add_system_metrics(self) -> None:
         """添加系统基础指标"""
@@ -161,7 +161,8 @@ def api_proxy(endpoint):
             data = request.get_json() if request.is_json else {}
             
             # 记录请求
-            logger.info(f"代理POST请求: {api_url}, 数据: {json.dumps(data, ensure_ascii=False)[:500]}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("代理POST请求: %s, 数据: %s", api_url, json.dumps(data, ensure_ascii=False)[:500])
             
             # 构造新请求的环境
             environ = request.environ.copy()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Gunicorn工作进程
+=============
+
+提供使用uvloop事件循环和httptools HTTP解析器的Uvicorn工作进程类。
+"""
+
+from uvicorn.workers import UvicornWorker
+
+
+class UvloopWorker(UvicornWorker):
+    """
+    固定使用uvloop和httptools的Uvicorn工作进程
+
+    默认的UvicornWorker在依赖缺失时会静默回退到asyncio和h11，
+    该工作进程在依赖缺失时直接启动失败。
+
+    用法:
+        gunicorn data_insight.app:app --worker-class data_insight.workers.UvloopWorker
+    """
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
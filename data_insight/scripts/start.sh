@@ -50,7 +50,7 @@ echo "启动应用服务器..."
 exec gunicorn data_insight.app:app \
     --bind 0.0.0.0:${PORT} \
     --workers ${WORKERS} \
-    --worker-class uvicorn.workers.UvicornWorker \
+    --worker-class data_insight.workers.UvloopWorker \
     --log-level ${LOG_LEVEL} \
     --max-requests ${MAX_REQUESTS} \
     --max-requests-jitter ${MAX_REQUESTS_JITTER} \
@@ -10,6 +10,7 @@ setup(
     include_package_data=True,
     install_requires=[
         "numpy>=1.20.0",
+        "orjson>=3.9.10,<4",
         "pandas>=1.3.0",
         "matplotlib>=3.4.0",
         "seaborn>=0.11.0",
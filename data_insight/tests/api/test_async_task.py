@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+异步任务管理器测试
+===============
+
+测试TaskManager的任务创建和状态查询功能。
+"""
+
+import threading
+import time
+import unittest
+
+from data_insight.api.utils import async_task
+from data_insight.api.utils.async_task import TaskManager
+
+
+def _wait_for(manager, task_id, timeout=5.0):
+    """等待任务结束并返回任务信息和结果"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        info, result = manager.get_task_state(task_id)
+        if info["status"] not in ("pending", "running"):
+            return info, result
+        time.sleep(0.01)
+    raise AssertionError(f"任务 {task_id} 未在{timeout}秒内结束")
+
+
+class TestTaskManager(unittest.TestCase):
+    """测试任务管理器"""
+
+    def setUp(self):
+        """创建任务管理器"""
+        self.manager = TaskManager(max_tasks=10)
+
+    def test_get_task_state_completed(self):
+        """测试已完成任务同时返回信息和结果"""
+        task_id = self.manager.create_task(lambda x: {"value": x * 2}, 21)
+        info, result = _wait_for(self.manager, task_id)
+        self.assertEqual(info["status"], "completed")
+        self.assertEqual(info["task_id"], task_id)
+        self.assertEqual(result, {"value": 42})
+
+    def test_get_task_state_failed(self):
+        """测试失败任务返回错误信息且结果为None"""
+        def fail():
+            raise ValueError("计算失败")
+
+        task_id = self.manager.create_task(fail)
+        info, result = _wait_for(self.manager, task_id)
+        self.assertEqual(info["status"], "failed")
+        self.assertEqual(info["error"], "计算失败")
+        self.assertIsNone(result)
+
+    def test_get_task_state_missing(self):
+        """测试不存在的任务"""
+        self.assertEqual(self.manager.get_task_state("missing"), (None, None))
+
+    def test_forged_task_id(self):
+        """测试篡改后的任务ID无法查询到任务"""
+        task_id = self.manager.create_task(lambda: None)
+        forged = task_id[:-2] + ("AA" if task_id[-2:] != "AA" else "BB")
+        self.assertIsNotNone(self.manager.get_task(task_id))
+        self.assertIsNone(self.manager.get_task(forged))
+
+    def test_max_tasks(self):
+        """测试任务数量限制"""
+        manager = TaskManager(max_tasks=1)
+        manager.create_task(time.sleep, 0.1)
+        with self.assertRaises(RuntimeError):
+            manager.create_task(time.sleep, 0.1)
+
+    def test_queue_full(self):
+        """测试执行队列已满时拒绝新任务"""
+        manager = TaskManager(max_tasks=10, max_workers=1, max_queued=0, admission_timeout=0.01)
+        manager.create_task(time.sleep, 0.2)
+        with self.assertRaises(RuntimeError):
+            manager.create_task(time.sleep, 0.1)
+
+    def test_removed_task_not_reused(self):
+        """测试删除的任务实例不会被新任务复用，持有旧引用的读取方看不到新任务的状态"""
+        manager = TaskManager(max_tasks=1)
+        first_id = manager.create_task(lambda: "first")
+        _wait_for(manager, first_id)
+        first = manager.get_task(first_id)
+        manager._remove_task(first_id)
+
+        second_id = manager.create_task(lambda: "second")
+        _wait_for(manager, second_id)
+
+        self.assertIsNot(manager.get_task(second_id), first)
+        self.assertEqual(first.task_id, first_id)
+        self.assertEqual(first.result, "first")
+        self.assertIsNone(manager.get_task(first_id))
+        self.assertFalse(manager.cancel_task(first_id))
+
+    def test_submit_failure_releases_slot(self):
+        """测试提交失败时归还槽位和执行名额"""
+        manager = TaskManager(max_tasks=1, max_workers=1, max_queued=0, admission_timeout=0.01)
+        manager.shutdown()
+        for _ in range(3):
+            with self.assertRaisesRegex(RuntimeError, "shutdown"):
+                manager.create_task(lambda: None)
+        self.assertEqual(list(manager._free_slots), [0])
+        self.assertEqual(manager.get_all_tasks(), [])
+
+    def test_canceled_running_task_stays_canceled(self):
+        """测试执行期间取消的任务结束后仍为已取消状态"""
+        started, release = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            release.wait(5)
+            return "done"
+
+        task_id = self.manager.create_task(work)
+        self.assertTrue(started.wait(5))
+        self.assertTrue(self.manager.cancel_task(task_id))
+        release.set()
+
+        self.manager.get_task(task_id).future.result(5)
+        info, result = self.manager.get_task_state(task_id)
+        self.assertEqual(info["status"], "canceled")
+        self.assertIsNotNone(info["end_time"])
+        self.assertIsNone(result)
+
+    def test_canceled_queued_task_not_executed(self):
+        """测试排队期间取消的任务不会执行"""
+        manager = TaskManager(max_tasks=10, max_workers=1, max_queued=1)
+        release = threading.Event()
+        calls = []
+        manager.create_task(release.wait, 5)
+        task_id = manager.create_task(calls.append, 1)
+
+        self.assertTrue(manager.cancel_task(task_id))
+        release.set()
+
+        info, _ = _wait_for(manager, task_id)
+        self.assertEqual(info["status"], "canceled")
+        self.assertIsNotNone(info["end_time"])
+        self.assertEqual(calls, [])
+
+    def test_process_task_timeout(self):
+        """测试进程任务超时后取消子进程任务并释放等待的线程"""
+        self.addCleanup(async_task.shutdown_process_pool)
+        manager = TaskManager(max_tasks=10, max_workers=1, max_queued=1)
+
+        task_id = manager.create_process_task(time.sleep, 2, _timeout=0.2)
+        info, result = _wait_for(manager, task_id)
+        self.assertEqual(info["status"], "timeout")
+        self.assertIsNone(result)
+
+        # 等待子进程的线程已释放，后续任务不必等待子进程结束
+        started = time.monotonic()
+        info, result = _wait_for(manager, manager.create_task(lambda: "next"), timeout=1.5)
+        self.assertEqual(result, "next")
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_shutdown_process_pool(self):
+        """测试关闭后重新获取进程池会创建新的进程池"""
+        pool = async_task.get_process_pool()
+        async_task.shutdown_process_pool()
+        self.assertIsNone(async_task._process_pool)
+
+        new_pool = async_task.get_process_pool()
+        self.addCleanup(async_task.shutdown_process_pool)
+        self.assertIsNot(new_pool, pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON导出测试
+==========
+
+测试一次性序列化和流式写入输出相同格式的JSON文件。
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from data_insight.api.routes import export
+
+
+class TestExportToJson(unittest.TestCase):
+    """测试JSON导出"""
+
+    def _export(self, data, stream_min_records):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        with patch.object(export, "JSON_STREAM_MIN_RECORDS", stream_min_records):
+            export.export_to_json(data, path)
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_same_format_with_and_without_streaming(self):
+        """测试小数据量和流式写入的输出完全一致"""
+        data = {"title": "销售额", "data": [{"月份": i, "值": i * 1.5} for i in range(10)]}
+
+        small = self._export(data, stream_min_records=1000)
+        streamed = self._export(data, stream_min_records=1)
+
+        self.assertEqual(small, streamed)
+        self.assertEqual(json.loads(small), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON编解码工具测试
+===============
+
+测试json_utils模块的编解码功能。
+"""
+
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from data_insight.api.utils import json_utils
+from data_insight.api.utils.json_utils import dumps, loads
+
+
+class TestJsonUtils(unittest.TestCase):
+    """测试JSON编解码工具"""
+
+    def test_dumps_returns_utf8_bytes(self):
+        """测试序列化结果为UTF-8字节串且不转义中文"""
+        result = dumps({"指标": "销售额", "值": 1.5})
+        self.assertIsInstance(result, bytes)
+        self.assertIn("销售额".encode("utf-8"), result)
+
+    def test_dumps_special_types(self):
+        """测试datetime和集合的序列化"""
+        result = loads(dumps({"time": datetime(2023, 1, 1), "tags": {"a"}}))
+        self.assertEqual(result["time"], "2023-01-01T00:00:00")
+        self.assertEqual(result["tags"], ["a"])
+
+    def test_round_trip(self):
+        """测试编解码往返"""
+        data = {"values": [1, 2.5, 3], "name": "测试", "nested": {"ok": True}}
+        self.assertEqual(loads(dumps(data)), data)
+        self.assertEqual(loads(dumps(data, indent=True)), data)
+
+    def test_stdlib_fallback(self):
+        """测试orjson不可用时回退到标准库"""
+        data = {"name": "测试", "time": datetime(2023, 1, 1)}
+        with patch.object(json_utils, "ORJSON_AVAILABLE", False):
+            result = dumps(data)
+            self.assertIn("测试".encode("utf-8"), result)
+            self.assertEqual(loads(result)["time"], "2023-01-01T00:00:00")
+
+    def test_loads_invalid_json(self):
+        """测试解析无效JSON时抛出ValueError"""
+        with self.assertRaises(ValueError):
+            loads(b"{invalid")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+指标分析Flask视图测试
+=================
+
+通过Flask测试客户端调用api/app.py注册的指标分析和指标对比视图。
+"""
+
+import unittest
+
+from data_insight.api.app import create_app
+from data_insight.api.routes import metric_api
+
+
+class TestMetricViews(unittest.TestCase):
+    """测试指标分析和指标对比视图"""
+
+    metric = {"name": "销售额", "value": 120, "previous_value": 100, "historical_values": [90, 95, 100, 110, 120]}
+    metrics = {"metrics": [
+        {"name": "A", "value": 120, "previous_value": 100},
+        {"name": "B", "value": 80, "previous_value": 90},
+    ]}
+
+    def setUp(self):
+        """创建测试应用"""
+        metric_api._result_cache.clear()
+        self.addCleanup(metric_api._result_cache.clear)
+        self.client = create_app({"TESTING": True, "API_TOKEN": "secret"}).test_client()
+        self.headers = {"X-API-Token": "secret"}
+
+    def test_analyze(self):
+        """测试指标分析视图"""
+        response = self.client.post("/api/metric/analyze", json=self.metric, headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+
+        body = response.get_json()
+        self.assertTrue(body["success"])
+        self.assertIn("analysis", body["data"])
+        self.assertTrue(body["data"]["insight"])
+        self.assertIn("X-RateLimit-Remaining", response.headers)
+
+    def test_compare(self):
+        """测试指标对比视图"""
+        response = self.client.post("/api/metric/compare", json=self.metrics, headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+
+        body = response.get_json()
+        self.assertTrue(body["success"])
+        self.assertEqual(body["data"]["analysis"]["基本信息"]["指标数量"], 2)
+        self.assertTrue(body["data"]["insight"])
+
+    def test_invalid_token(self):
+        """测试令牌无效时返回401"""
+        response = self.client.post("/api/metric/analyze", json=self.metric, headers={"X-API-Token": "wrong"})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json()["message"], "无效的API令牌")
+
+    def test_validation_error(self):
+        """测试请求数据不符合验证模式时返回422"""
+        response = self.client.post("/api/metric/analyze", json={"name": "销售额"}, headers=self.headers)
+        self.assertEqual(response.status_code, 422)
+
+    def test_rate_limited(self):
+        """测试超出速率限制时返回429"""
+        client = create_app({"TESTING": True, "IP_RATE_LIMIT": 1}).test_client()
+        self.assertEqual(client.post("/api/metric/compare", json=self.metrics).status_code, 200)
+
+        response = client.post("/api/metric/compare", json=self.metrics)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["X-RateLimit-Remaining"], "0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+异常预测接口测试
+=============
+
+测试异常预测的快速路径只在历史值无趋势且能估计近期波动范围时使用，其余情况回退到预测模型。
+"""
+
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from data_insight.api.middlewares.auth import token_required
+from data_insight.api.routes import prediction_api
+from data_insight.core.predictor import ForecastResult
+
+
+class TestAnomalyFastPath(unittest.TestCase):
+    """测试异常预测快速路径"""
+
+    def setUp(self):
+        """创建测试应用"""
+        app = FastAPI()
+        app.include_router(prediction_api.router, prefix="/api/prediction")
+        app.dependency_overrides[token_required] = lambda: True
+        self.client = TestClient(app)
+
+        self.forecast_result = ForecastResult(
+            pred=np.array([0.12]),
+            lower=np.array([0.0]),
+            upper=np.array([0.3]),
+            periods=["T+1"]
+        )
+        p = patch.object(prediction_api.predictor, "forecast", return_value=self.forecast_result)
+        self.forecast = p.start()
+        self.addCleanup(p.stop)
+
+    def _post(self, values, **params):
+        response = self.client.post("/api/prediction/anomaly", json={"values": values, **params})
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()["data"]["异常检测"]
+
+    def test_single_point_window_uses_model(self):
+        """测试回看窗口只有1个点时不使用快速路径"""
+        self.assertIsNone(prediction_api._fast_forecast(np.array([0.5, 0.12, 0.80]), 1.5, 1))
+
+        result = self._post([0.5, 0.12, 0.80], lookback_periods=1)
+
+        self.forecast.assert_called_once()
+        self.assertTrue(result["是否异常"])
+        self.assertAlmostEqual(result["异常程度"], (0.80 - 0.3) / (0.3 - 0.12))
+
+    def test_anomaly_degree_below_and_capped(self):
+        """测试低于下限的异常程度和上限截断"""
+        self.assertAlmostEqual(self._post([0.5, 0.12, -0.06], lookback_periods=1)["异常程度"], 0.5)
+        self.assertEqual(self._post([0.5, 0.12, 50.0], lookback_periods=1)["异常程度"], 5.0)
+
+    def test_constant_window_uses_model(self):
+        """测试回看窗口标准差为0时不使用快速路径"""
+        self.assertIsNone(prediction_api._fast_forecast(np.array([1.0, 1.0, 1.0, 1.4]), 1.5, 3))
+
+        self._post([1.0, 1.0, 1.0, 1.4], lookback_periods=3)
+
+        self.forecast.assert_called_once()
+
+    def test_trending_series_uses_model(self):
+        """测试存在趋势的历史值不使用快速路径"""
+        values = [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0, 110.0, 100.0]
+        self.assertIsNone(prediction_api._fast_forecast(np.array(values), 1.5, 3))
+
+        self._post(values, lookback_periods=3)
+
+        self.forecast.assert_called_once()
+
+    def test_clearly_normal_value_uses_fast_path(self):
+        """测试无趋势且明显正常的值直接使用快速路径"""
+        result = self._post([5.0, 7.0, 4.0, 6.0, 5.0, 7.0, 4.0, 6.0, 5.5], lookback_periods=3)
+
+        self.forecast.assert_not_called()
+        self.assertFalse(result["是否异常"])
+        self.assertAlmostEqual(result["预期值"], 17.0 / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
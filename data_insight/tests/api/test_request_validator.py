@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+请求参数验证测试
+=============
+
+测试build_validator编译后的验证函数与逐项验证函数行为一致。
+"""
+
+import unittest
+
+from werkzeug.exceptions import BadRequest
+
+from data_insight.api.utils.request_validator import (
+    build_validator,
+    validate_numeric_range,
+    validate_request_data,
+    validate_string_length,
+)
+
+
+class TestBuildValidator(unittest.TestCase):
+    """测试请求验证函数编译"""
+
+    def setUp(self):
+        """设置测试规则"""
+        self.spec = {
+            "name": {"required": True, "type": str, "min_length": 1, "max_length": 5},
+            "count": {"type": int, "min": 0, "max": 10},
+        }
+        self.validate = build_validator(self.spec)
+
+    def _validate_sequentially(self, data):
+        """依次调用逐项验证函数"""
+        validate_request_data(data, ["name"], {"name": str, "count": int})
+        validate_string_length(data, "name", 1, 5)
+        validate_numeric_range(data, "count", 0, 10)
+
+    def test_matches_sequential_validation(self):
+        """测试编译结果与逐项验证的错误信息一致"""
+        cases = [
+            {"name": "abc", "count": 3},
+            {"name": "abc"},
+            {"count": 3},
+            {"name": 1},
+            {"name": ""},
+            {"name": "abcdef"},
+            {"name": "abc", "count": "3"},
+            {"name": "abc", "count": -1},
+            {"name": "abc", "count": 11},
+            {"name": "", "count": "3"},
+            {"name": ["a", "b"]},
+        ]
+        for data in cases:
+            with self.subTest(data=data):
+                self._assert_same_error(self.validate, self._validate_sequentially, data)
+
+        # 未指定类型的长度规则同样要求字符串
+        validate = build_validator({"name": {"min_length": 1}})
+
+        def validate_length_only(data):
+            validate_string_length(data, "name", 1)
+
+        for data in ({"name": 5}, {"name": ["a"]}, {"name": ""}, {"name": "a"}):
+            with self.subTest(spec="min_length", data=data):
+                self._assert_same_error(validate, validate_length_only, data)
+
+    def _assert_same_error(self, validate, validate_sequentially, data):
+        """断言编译后的验证函数与逐项验证得到相同的错误信息"""
+        try:
+            validate_sequentially(data)
+            expected = None
+        except BadRequest as e:
+            expected = e.description
+
+        try:
+            validate(data)
+            actual = None
+        except BadRequest as e:
+            actual = e.description
+
+        self.assertEqual(actual, expected)
+
+    def test_cached_per_spec(self):
+        """测试同一规则只编译一次"""
+        self.assertIs(build_validator(self.spec), self.validate)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+趋势分析接口测试
+=============
+
+通过测试客户端调用趋势分析和趋势对比接口，分析器替换为返回固定结果的测试替身。
+"""
+
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from data_insight.api.middlewares.auth import token_required
+from data_insight.api.routes import trend_api
+
+
+def _make_result(metric_name, values, inflection_count=1):
+    """构造与路由读取字段一致的趋势分析结果"""
+    direction = "up" if values[-1] >= values[0] else "down"
+    trend = SimpleNamespace(
+        metric_name=metric_name, direction=direction, slope=1.0, significance=0.01,
+        r_squared=0.9, pattern="linear", method="linear", has_seasonality=False,
+        seasonality_strength=0.0, seasonality_pattern=None
+    )
+    inflections = [
+        SimpleNamespace(date="2024-01-02", index=i, value=1.0, type="peak", strength=0.5)
+        for i in range(inflection_count)
+    ]
+    return SimpleNamespace(trend=trend, inflections=inflections, summary=f"{metric_name}趋势")
+
+
+class _FakeAnalyzer:
+    """返回固定结果的趋势分析器"""
+
+    inflection_count = 1
+
+    def analyze(self, metric_name, values, timestamps, **kwargs):
+        return _make_result(metric_name, values, self.inflection_count)
+
+    def analyze_batch(self, metric_names, values_list, timestamps, **kwargs):
+        return [_make_result(name, values) for name, values in zip(metric_names, values_list)]
+
+
+class TestTrendApi(unittest.TestCase):
+    """测试趋势分析路由"""
+
+    def setUp(self):
+        """创建测试应用"""
+        app = FastAPI()
+        app.include_router(trend_api.router, prefix="/api/trend")
+        app.dependency_overrides[token_required] = lambda: True
+        self.client = TestClient(app)
+
+        self.analyzer = _FakeAnalyzer()
+        self.pool = ThreadPoolExecutor(max_workers=2)
+        patches = [
+            patch.object(trend_api, "get_trend_analyzer", return_value=self.analyzer),
+            patch.object(trend_api, "get_process_pool", return_value=self.pool),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.pool.shutdown)
+        trend_api._trend_cache.clear()
+
+        self.timestamps = ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+
+    def test_analyze(self):
+        """测试单指标趋势分析"""
+        response = self.client.post("/api/trend/analyze", json={
+            "metric_name": "日活", "values": [1, 2, 3, 4], "timestamps": self.timestamps
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["trend"]["metric_name"], "日活")
+        self.assertEqual(data["inflections"][0]["type"], "peak")
+
+    def test_analyze_streamed(self):
+        """测试拐点较多时流式输出的响应与普通响应结构一致"""
+        self.analyzer.inflection_count = trend_api.INFLECTION_STREAM_MIN
+        response = self.client.post("/api/trend/analyze", json={
+            "metric_name": "日活", "values": [1, 2, 3, 4], "timestamps": self.timestamps
+        })
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)["data"]
+        self.assertEqual(len(data["inflections"]), trend_api.INFLECTION_STREAM_MIN)
+        self.assertEqual(data["summary"], "日活趋势")
+
+    def test_analyze_body_too_large(self):
+        """测试请求体超过上限时返回413"""
+        with patch.object(trend_api, "MAX_BODY_BYTES", 10):
+            response = self.client.post("/api/trend/analyze", json={
+                "metric_name": "日活", "values": [1, 2, 3, 4], "timestamps": self.timestamps
+            })
+        self.assertEqual(response.status_code, 413)
+
+    def test_compare(self):
+        """测试多指标趋势对比"""
+        response = self.client.post("/api/trend/compare", json={"metrics": [
+            {"name": "日活", "values": [1, 2, 3, 4], "timestamps": self.timestamps},
+            {"name": "留存", "values": [4, 3, 2, 1], "timestamps": self.timestamps},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        trends = response.json()["data"]["trends"]
+        self.assertEqual([t["metric_name"] for t in trends], ["日活", "留存"])
+        self.assertEqual([t["direction"] for t in trends], ["up", "down"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+请求验证器测试
+===========
+
+测试Validator编译后的验证函数与validate_data行为一致。
+"""
+
+import unittest
+from unittest.mock import patch
+
+from flask import Flask, jsonify
+
+from data_insight.api import validation
+from data_insight.api.utils.validator import Validator, ValidationError, COMMON_SCHEMAS
+
+
+class TestValidatorCompile(unittest.TestCase):
+    """测试验证模式编译"""
+
+    def setUp(self):
+        """设置测试模式"""
+        self.schema = {
+            "name": {"type": "string", "required": True, "minlength": 1, "maxlength": 10},
+            "value": {"type": "number", "required": True, "min": 0},
+            "order": {"type": "string", "enum": ["asc", "desc"]},
+            "code": {"type": "string", "pattern": r"^[a-z]+$"},
+            "enabled": {"type": "boolean"},
+            "values": {"type": "array", "items": {"type": "number"}, "minlength": 2},
+            "meta": {"type": "object", "properties": {"id": {"type": "integer", "required": True}}},
+        }
+
+    def assert_same_result(self, data):
+        """断言编译后的验证函数与validate_data结果一致"""
+        validate = Validator.compile(self.schema)
+        try:
+            expected = Validator.validate_data(data, self.schema)
+        except ValidationError as e:
+            with self.assertRaises(ValidationError) as context:
+                validate(data)
+            self.assertEqual(context.exception.errors, e.errors)
+        else:
+            self.assertEqual(validate(data), expected)
+
+    def test_compile_is_cached(self):
+        """测试同一模式只编译一次"""
+        self.assertIs(Validator.compile(self.schema), Validator.compile(self.schema))
+
+    def test_valid_data(self):
+        """测试有效数据"""
+        self.assert_same_result({
+            "name": "销售额",
+            "value": "12.5",
+            "order": "asc",
+            "code": "abc",
+            "enabled": "yes",
+            "values": [1, 2, 3],
+            "meta": {"id": "7"},
+        })
+
+    def test_invalid_data(self):
+        """测试无效数据的错误信息"""
+        self.assert_same_result({"value": -1})
+        self.assert_same_result({"name": "", "value": "x"})
+        self.assert_same_result({"name": "a", "value": 1, "order": "up", "code": "A1"})
+        self.assert_same_result({"name": "a", "value": 1, "values": [1, "x"]})
+        self.assert_same_result({"name": "a", "value": 1, "values": [1]})
+        self.assert_same_result({"name": "a", "value": 1, "meta": {}})
+        self.assert_same_result({"name": "a", "value": 1, "enabled": "maybe"})
+
+    def test_unhashable_enum_and_custom(self):
+        """测试不可哈希的枚举值和自定义验证函数"""
+        self.schema = {
+            "pair": {"type": "array", "enum": [[1, 2], [3, 4]]},
+            "level": {"type": "integer", "custom": lambda v: v * 10},
+        }
+        self.assert_same_result({"pair": [1, 2], "level": "3"})
+        self.assert_same_result({"pair": [2, 1], "level": "x"})
+
+    def test_common_schemas(self):
+        """测试常用验证模式"""
+        validate = Validator.compile(COMMON_SCHEMAS)
+        self.assertEqual(validate({"id": "1", "sort": "name", "order": "desc"}),
+                         {"id": "1", "sort": "name", "order": "desc"})
+        with self.assertRaises(ValidationError):
+            validate({"id": "1", "sort": "name;drop"})
+
+
+class TestValidateRequest(unittest.TestCase):
+    """测试请求验证装饰器"""
+
+    def setUp(self):
+        """创建使用验证装饰器的测试应用"""
+        app = Flask(__name__)
+
+        @app.route("/echo", methods=["POST"])
+        @Validator.validate_request({"name": {"type": "string", "required": True}})
+        def echo():
+            return jsonify(validation.load_request_json())
+
+        self.client = app.test_client()
+
+    def test_body_parsed_once(self):
+        """测试验证装饰器和路由函数共享同一次解析结果"""
+        with patch.object(validation, "json_loads", wraps=validation.json_loads) as loads:
+            response = self.client.post("/echo", json={"name": "销售额"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"name": "销售额"})
+        self.assertEqual(loads.call_count, 1)
+
+    def test_invalid_data(self):
+        """测试验证失败和无效JSON"""
+        self.assertEqual(self.client.post("/echo", json={"name": 1}).status_code, 422)
+        response = self.client.post("/echo", data="{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -155,7 +155,43 @@ class APIIntegrationTest(unittest.TestCase):
         
         # 验证服务是否被正确调用
         mock_analyze.assert_called_once()
-    
+
+    @patch('data_insight.services.metric_service.MetricService.analyze_metric')
+    def test_metric_analyze_uses_validated_data(self, mock_analyze):
+        """测试指标分析API向服务传递校验转换后的数据"""
+        mock_analyze.return_value = {"analysis": {}, "insight": ""}
+
+        payload = {"metric_data": {
+            "name": "月度销售额", "value": "12", "target_value": 150, "metric_id": "sales", "owner": "华东区"
+        }}
+        response = self.client.post(
+            '/api/metric/analyze',
+            data=json.dumps(payload),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        # 数值转换后传递，目标值、指标标识和未声明的字段都被保留
+        metric_data = mock_analyze.call_args[0][0]
+        self.assertEqual(metric_data, {
+            "name": "月度销售额", "value": 12.0, "target_value": 150, "metric_id": "sales", "owner": "华东区"
+        })
+        self.assertIsInstance(metric_data["value"], float)
+
+    def test_metric_analyze_target_value(self):
+        """测试指标分析结果包含目标达成情况"""
+        payload = {"metric_data": {"name": "月度销售额", "value": 120, "target_value": 150}}
+        response = self.client.post(
+            '/api/metric/analyze',
+            data=json.dumps(payload),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+
+        analysis = json.dumps(json.loads(response.data)["analysis"], ensure_ascii=False)
+        self.assertIn("目标值", analysis)
+        self.assertIn("目标达成率", analysis)
+
     @patch('data_insight.services.metric_service.MetricService.predict_metric')
     def test_metric_predict(self, mock_predict):
         """测试指标预测API"""
@@ -185,7 +221,7 @@ class APIIntegrationTest(unittest.TestCase):
         # 验证服务是否被正确调用
         mock_predict.assert_called_once()
     
-    @patch('data_insight.services.metric_service.MetricService.compare_metrics')
+    @patch('data_insight.services.metric_service.MetricService.compare_metrics_list')
     def test_metric_compare(self, mock_compare):
         """测试指标对比API"""
         # 模拟服务返回结果
@@ -213,7 +249,7 @@ class APIIntegrationTest(unittest.TestCase):
         # 验证服务是否被正确调用
         mock_compare.assert_called_once()
     
-    @patch('data_insight.services.metric_service.MetricService.compare_metrics')
+    @patch('data_insight.services.metric_service.MetricService.compare_metrics_matrix')
     def test_metric_correlation(self, mock_correlation):
         """测试指标相关性API"""
         # 模拟服务返回结果
@@ -242,6 +278,25 @@ class APIIntegrationTest(unittest.TestCase):
         # 验证服务是否被正确调用
         mock_correlation.assert_called_once()
     
+    def test_metric_correlation_unequal_lengths(self):
+        """测试历史值长度不同时相关性分析的响应结构与长度一致时相同"""
+        unequal_data = json.loads(json.dumps(self.metrics_correlation_data))
+        unequal_data["metrics"][1]["historical_values"] = unequal_data["metrics"][1]["historical_values"][2:]
+        
+        responses = [
+            self.client.post(
+                '/api/metric/correlation',
+                data=json.dumps(payload),
+                content_type='application/json'
+            )
+            for payload in (self.metrics_correlation_data, unequal_data)
+        ]
+        
+        equal, unequal = [json.loads(response.data) for response in responses]
+        self.assertEqual([r.status_code for r in responses], [200, 200])
+        self.assertEqual(set(equal['analysis']), set(unequal['analysis']))
+        self.assertEqual(unequal['analysis']['基本信息']['样本数量'], 5)
+    
     @patch('data_insight.services.chart_service.ChartService.analyze_chart')
     def test_chart_analyze(self, mock_analyze):
         """测试图表分析API"""
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+指标服务缓存测试
+=============
+
+测试指标服务结果缓存的缓存键和并发访问。
+"""
+
+import threading
+import unittest
+
+import numpy as np
+
+from data_insight.services.metric_service import MetricService
+
+
+class TestMetricServiceCache(unittest.TestCase):
+    """测试指标服务结果缓存"""
+
+    def setUp(self):
+        """创建服务实例"""
+        self.service = MetricService()
+
+    def test_key_is_exact_content(self):
+        """测试只有内容完全相同的请求得到相同的缓存键"""
+        key = self.service._make_key({"name": "a", "value": 1}, {"x": 1})
+        self.assertEqual(key, self.service._make_key({"value": 1, "name": "a"}, {"x": 1}))
+        self.assertNotEqual(key, self.service._make_key({"name": "a", "value": 2}, {"x": 1}))
+
+    def test_numpy_values_are_not_truncated(self):
+        """测试NumPy数组按完整内容生成缓存键"""
+        first = np.arange(2000, dtype=np.float64)
+        second = first.copy()
+        second[1000] = -1
+        self.assertNotEqual(self.service._make_key({"values": first}), self.service._make_key({"values": second}))
+
+    def test_unserializable_data_is_not_cached(self):
+        """测试含有无法序列化的值时不使用缓存"""
+        key = self.service._make_key({"value": object()})
+        self.assertIsNone(key)
+
+        cache = self.service._analysis_cache
+        self.service._set_cached(cache, key, {"analysis": {}}, 10)
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(self.service._get_cached(cache, key))
+
+    def test_concurrent_access(self):
+        """测试多线程同时读写缓存时容量保持不变"""
+        cache = self.service._analysis_cache
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(500):
+                    key = self.service._make_key({"value": offset * 1000 + i % 20})
+                    if self.service._get_cached(cache, key) is None:
+                        self.service._set_cached(cache, key, {"value": i}, 10)
+            except Exception as e:  # pragma: no cover - 失败时由断言报告
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@
 
 import pytest
 import numpy as np
+from unittest.mock import patch
 from data_insight.core.predictor import Predictor
 
 
@@ -39,6 +40,25 @@ class TestPredictor:
         # 验证异常消息包含缺少的字段
         assert "current_value" in str(excinfo.value)
     
+    def test_warmup(self):
+        """测试预热成功时返回True"""
+        assert self.predictor.warmup() is True
+    
+    def test_warmup_failure(self):
+        """测试预热失败时返回False且不抛出异常"""
+        with patch.object(Predictor, "forecast", side_effect=RuntimeError("拟合失败")):
+            assert self.predictor.warmup() is False
+    
+    def test_forecast_interval(self):
+        """测试预测区间包含预测值且随预测步数变宽"""
+        values = [100, 104, 99, 107, 103, 110, 106, 113, 109, 116, 112, 119]
+        result = self.predictor.forecast(values)
+        
+        assert len(result.pred) == 3
+        assert np.all(result.lower <= result.pred) and np.all(result.pred <= result.upper)
+        widths = result.upper - result.lower
+        assert widths[0] > 0 and np.all(np.diff(widths) > 0)
+    
     def test_insufficient_data(self):
         """测试数据不足的情况"""
         # 准备数据不足的测试数据
@@ -159,6 +159,21 @@ class TestMetricsRegistry(unittest.TestCase):
         self.assertIn("# HELP test_gauge 测试仪表盘", prometheus_output)
         self.assertIn("# TYPE test_gauge gauge", prometheus_output)
         self.assertIn('test_gauge{label="value"} 20', prometheus_output)
+    
+    def test_iter_prometheus_bytes(self):
+        """测试按指标分块输出Prometheus格式数据"""
+        # 注册指标
+        self.registry.register("test_counter", "测试计数器", MetricType.COUNTER)
+        self.registry.register("test_gauge", "测试仪表盘", MetricType.GAUGE, ["label"])
+        self.registry.set("test_counter", 10)
+        self.registry.set("test_gauge", 20, {"label": "value"})
+        
+        # 每个指标输出一个以换行结尾的字节块
+        chunks = list(self.registry.iter_prometheus_bytes())
+        self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+        self.assertTrue(all(chunk.endswith(b"\n") for chunk in chunks))
+        self.assertIn("test_counter 10\n".encode("utf-8"), b"".join(chunks))
+        self.assertEqual(b"".join(chunks).decode("utf-8"), self.registry.get_prometheus_metrics())
 
 
 class TestMetricHelpers(unittest.TestCase):
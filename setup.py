@@ -6,11 +6,13 @@ setup(
     packages=find_packages(),
     install_requires=[
         "fastapi",
+        "pydantic>=2.0",
         "uvicorn",
         "flask",
         "flask-cors",
         "pandas",
         "numpy",
+        "orjson>=3.9.10,<4",
         "scipy",
         "scikit-learn",
         "matplotlib",